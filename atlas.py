@@ -0,0 +1,240 @@
+# =========================================================
+# FILE: atlas.py
+# MO TA:
+# Load anh cho game qua 1 "texture atlas" cache san:
+# - Lan dau: decode PNG, scale, to mau xo -> xep vao 1 atlas
+#   va ghi ra file RGBA tho trong CACHE_DIR
+# - Cac lan sau: mmap file cache + pygame.image.frombuffer,
+#   khong decode / scale lai
+# File cache tu build lai khi doi IMG_FILES, FRUIT_FILES,
+# BG_CONFIG, kich thuoc sprite hoac noi dung file PNG
+#
+# Build truoc (vd. khi dong goi): python atlas.py
+# =========================================================
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import time
+
+import pygame
+from settings import *
+from layout import ui, world_size
+
+ATLAS_MAGIC = b"FCATLAS1"
+ATLAS_FILE = "atlas.bin"
+ATLAS_PADDING = 1
+ATLAS_WIDTH = 2 * RENDER_WIDTH + ATLAS_PADDING  # 2 background moi hang
+
+# Giu mmap song khi atlas dung truc tiep buffer (khong co man hinh)
+_atlas_buffers = []
+
+# =========================================================
+# HAM TAO ANH PLACEHOLDER
+# Dung khi thieu hoac loi file anh
+# =========================================================
+def create_placeholder(color, text, size=(40, 40)):
+    """
+    Tao anh tron don gian co chu o giua
+    Dung khi khong load duoc asset that
+    """
+    surf = pygame.Surface(size, pygame.SRCALPHA)
+    pygame.draw.circle(
+        surf, color,
+        (size[0] // 2, size[1] // 2),
+        size[0] // 2
+    )
+    if not pygame.font.get_init(): pygame.font.init()
+    font = pygame.font.SysFont(None, 20)
+    txt = font.render(text, True, (255, 255, 255))
+    surf.blit(txt, txt.get_rect(center=(size[0] // 2, size[1] // 2)))
+    return surf
+
+# =========================================================
+# HAM LOAD ANH AN TOAN
+# Neu loi hoac thieu file -> dung placeholder
+# =========================================================
+def safe_load_image(folder, filename, size, fallback_color=(200, 200, 200)):
+    """
+    Load anh tu thu muc asset
+    Neu that bai thi tra ve anh placeholder
+    """
+    path = get_path(folder, filename)
+    try:
+        img = pygame.image.load(path)
+        if pygame.display.get_surface(): img = img.convert_alpha()
+        img = pygame.transform.scale(img, size)
+        return img
+    except (pygame.error, FileNotFoundError):
+        return create_placeholder(fallback_color, "?", size)
+
+# =========================================================
+# DANH SACH SPRITE CAN LOAD
+# (ten, file, kich thuoc, mau du phong, mau nhuom)
+# Icon giao dien theo UI_SCALE; sprite gameplay = kich thuoc va cham x WORLD_SCALE
+# =========================================================
+def sprite_manifest():
+    items = [
+        ("bomb", IMG_FILES["bomb"], world_size(40, 40), (0, 0, 0), None),
+        ("heart", IMG_FILES["heart"], (ui(25), ui(25)), (255, 0, 0), None),
+        ("return", IMG_FILES["return"], (ui(30), ui(30)), (200, 200, 200), None),
+        ("volume", IMG_FILES["volume"], (ui(30), ui(30)), (200, 200, 200), None),
+        ("mute", IMG_FILES["mute"], (ui(30), ui(30)), (200, 200, 200), None),
+        ("logo", IMG_FILES["logo"], (ui(100), ui(100)), (200, 200, 200), None),
+        ("boss", "boss_monkey.png", world_size(80, 80), (100, 0, 0), None),
+        ("item_magnet", "item_magnet.png", world_size(40, 40), (200, 200, 200), None),
+        ("item_freeze", "item_freeze.png", world_size(40, 40), (200, 200, 200), None),
+        ("item_poison", "item_poison.png", world_size(40, 40), (200, 200, 200), None),
+        ("item_tnt", "item_tnt.png", world_size(40, 40), (200, 200, 200), None),
+    ]
+    for i, color in enumerate(PLAYER_COLORS):
+        items.append((f"bucket_p{i + 1}", IMG_FILES["bucket"], world_size(50, 50), (200, 200, 200), color))
+    for f_name in FRUIT_FILES:
+        items.append((f_name, f_name, world_size(40, 40), (200, 200, 200), None))
+    for i, (filename, fallback_color) in enumerate(BG_CONFIG):
+        items.append((f"bg_{i}", filename, (RENDER_WIDTH, RENDER_HEIGHT), fallback_color, None))
+    return items
+
+def manifest_hash(manifest):
+    """
+    Hash cau hinh + noi dung file anh -> doi bat ky thu gi la build lai
+    """
+    h = hashlib.sha1(ATLAS_MAGIC)
+    h.update(repr((manifest, ATLAS_WIDTH, ATLAS_PADDING)).encode())
+    for filename in sorted({m[1] for m in manifest}):
+        try:
+            with open(get_path("imgs", filename), "rb") as f:
+                h.update(f.read())
+        except OSError:
+            h.update(b"missing:" + filename.encode())
+    return h.hexdigest()
+
+# =========================================================
+# BUILD ATLAS
+# =========================================================
+def pack_shelves(sizes):
+    """
+    Xep hinh chu nhat theo tung hang (shelf packing)
+    sizes: {ten: (w, h)} -> ({ten: (x, y, w, h)}, (rong, cao))
+    """
+    width = max([ATLAS_WIDTH] + [w for w, h in sizes.values()])
+    rects = {}
+    x = y = shelf_h = 0
+    for name, (w, h) in sorted(sizes.items(), key=lambda kv: -kv[1][1]):
+        if x + w > width:
+            x = 0; y += shelf_h + ATLAS_PADDING; shelf_h = 0
+        rects[name] = (x, y, w, h)
+        x += w + ATLAS_PADDING
+        shelf_h = max(shelf_h, h)
+    return rects, (width, y + shelf_h)
+
+def build_atlas(manifest):
+    """
+    Decode + scale + nhuom mau tat ca sprite roi xep vao 1 Surface RGBA
+    """
+    images = {}
+    for name, filename, size, fallback_color, tint in manifest:
+        img = safe_load_image("imgs", filename, size, fallback_color)
+        if tint is not None:
+            img = img.copy()
+            img.fill(tint, special_flags=pygame.BLEND_RGBA_MULT)
+        images[name] = img
+
+    rects, atlas_size = pack_shelves({n: img.get_size() for n, img in images.items()})
+    atlas = pygame.Surface(atlas_size, pygame.SRCALPHA, 32)
+    for name, img in images.items():
+        atlas.blit(img, rects[name][:2])
+    return atlas, rects
+
+def save_atlas(path, key, atlas, rects):
+    """
+    File = MAGIC | do dai header (u32) | header JSON | pixel RGBA tho
+    Ghi ra file tam roi doi ten -> nhieu process chay song song van an toan
+    """
+    header = json.dumps({
+        "hash": key,
+        "size": atlas.get_size(),
+        "rects": rects,
+    }).encode()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(ATLAS_MAGIC)
+        f.write(struct.pack("<I", len(header)))
+        f.write(header)
+        f.write(pygame.image.tobytes(atlas, "RGBA"))
+    os.replace(tmp, path)
+
+def load_cached_atlas(path, key):
+    """
+    mmap file cache; tra ve (atlas, rects) hoac None neu khong dung hash
+    """
+    try:
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+
+    try:
+        if mm[:len(ATLAS_MAGIC)] != ATLAS_MAGIC: raise ValueError
+        start = len(ATLAS_MAGIC) + 4
+        (header_len,) = struct.unpack("<I", mm[len(ATLAS_MAGIC):start])
+        header = json.loads(mm[start:start + header_len])
+        if header["hash"] != key: raise ValueError
+
+        w, h = header["size"]
+        offset = start + header_len
+        pixels = memoryview(mm)[offset:offset + w * h * 4]
+        atlas = pygame.image.frombuffer(pixels, (w, h), "RGBA")
+    except (ValueError, KeyError, struct.error, pygame.error):
+        mm.close()
+        return None
+
+    if pygame.display.get_surface():
+        # Doi sang dinh dang man hinh 1 lan -> blit nhanh, bo mmap
+        atlas = atlas.convert_alpha()
+        del pixels
+        mm.close()
+    else:
+        _atlas_buffers.append(mm)
+    return atlas, header["rects"]
+
+# =========================================================
+# API CHINH
+# =========================================================
+def load_sprites(use_cache=True, stats=None):
+    """
+    Tra ve {ten sprite: Surface} (subsurface cua atlas)
+    stats (dict) neu co se nhan: "cache_hit", "seconds"
+    """
+    t0 = time.perf_counter()
+    manifest = sprite_manifest()
+    key = manifest_hash(manifest)
+    path = os.path.join(CACHE_DIR, ATLAS_FILE)
+
+    cached = load_cached_atlas(path, key) if use_cache else None
+    if cached:
+        atlas, rects = cached
+    else:
+        atlas, rects = build_atlas(manifest)
+        try:
+            save_atlas(path, key, atlas, rects)
+        except OSError:
+            pass  # Khong ghi duoc cache (vd. thu muc chi doc) -> van chay
+        if pygame.display.get_surface():
+            atlas = atlas.convert_alpha()
+
+    if stats is not None:
+        stats["cache_hit"] = bool(cached)
+        stats["seconds"] = time.perf_counter() - t0
+    return {name: atlas.subsurface(r) for name, r in rects.items()}
+
+if __name__ == "__main__":
+    stats = {}
+    sprites = load_sprites(use_cache=False, stats=stats)
+    print(f"Built {len(sprites)} sprites in {stats['seconds'] * 1000:.1f} ms "
+          f"-> {os.path.join(CACHE_DIR, ATLAS_FILE)}")
+    load_sprites(stats=stats)
+    print(f"Cached load: {stats['seconds'] * 1000:.1f} ms")
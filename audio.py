@@ -0,0 +1,230 @@
+# =========================================================
+# FILE: audio.py
+# MO TA:
+# Am thanh cua game:
+# - Hieu ung am thanh decode 1 lan roi cache PCM tho vao
+#   CACHE_DIR (giong atlas.py) -> lan sau khong decode MP3
+# - Moi nhom (SOUND_CHANNELS) co pool kenh mixer danh rieng:
+#   het kenh thi cuop kenh phat lau nhat, khong de mixer
+#   tu bo tieng / nghen khi nam cham, TNT no hang loat
+# - Cung 1 am thanh trong SOUND_MIN_GAP_MS chi phat 1 lan
+# - NullAudio: cung API, khong lam gi (headless, khong co loa)
+#
+# Build cache truoc: python audio.py
+# =========================================================
+
+import hashlib
+import json
+import os
+import struct
+import time
+
+import pygame
+from settings import *
+from startup import timed, init_mixer
+
+PCM_MAGIC = b"FCPCM001"
+PCM_FILE = "sounds.bin"
+
+# ten am thanh -> nhom kenh
+SOUND_GROUPS = {name: group for name, (_, group) in SOUND_FILES.items()}
+
+# =========================================================
+# CACHE PCM
+# =========================================================
+def pcm_hash(mixer_format):
+    """
+    Hash dinh dang mixer + cau hinh + noi dung file -> doi gi cung decode lai
+    """
+    h = hashlib.sha1(PCM_MAGIC)
+    h.update(repr((mixer_format, sorted(SOUND_FILES.items()))).encode())
+    for filename in sorted({f for f, _ in SOUND_FILES.values()}):
+        try:
+            with open(get_path("sounds", filename), "rb") as f:
+                h.update(f.read())
+        except OSError:
+            h.update(b"missing:" + filename.encode())
+    return h.hexdigest()
+
+def decode_sounds():
+    """
+    Decode file am thanh -> {ten: PCM bytes}; thieu / loi file -> bo qua
+    """
+    raw = {}
+    for name, (filename, _) in SOUND_FILES.items():
+        try:
+            raw[name] = pygame.mixer.Sound(get_path("sounds", filename)).get_raw()
+        except (pygame.error, FileNotFoundError):
+            pass
+    return raw
+
+def save_pcm(path, key, raw):
+    """
+    File = MAGIC | do dai header (u32) | header JSON | PCM noi tiep nhau
+    """
+    header = json.dumps({
+        "hash": key,
+        "sounds": [[name, len(data)] for name, data in raw.items()],
+    }).encode()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(PCM_MAGIC)
+        f.write(struct.pack("<I", len(header)))
+        f.write(header)
+        for data in raw.values():
+            f.write(data)
+    os.replace(tmp, path)
+
+def load_cached_pcm(path, key):
+    """
+    Tra ve {ten: PCM} hoac None neu khong co / khong dung hash
+    """
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+
+    try:
+        if data[:len(PCM_MAGIC)] != PCM_MAGIC: raise ValueError
+        start = len(PCM_MAGIC) + 4
+        (header_len,) = struct.unpack("<I", data[len(PCM_MAGIC):start])
+        header = json.loads(data[start:start + header_len])
+        if header["hash"] != key: raise ValueError
+    except (ValueError, KeyError, struct.error):
+        return None
+
+    view = memoryview(data)
+    offset = start + header_len
+    raw = {}
+    for name, size in header["sounds"]:
+        raw[name] = view[offset:offset + size]
+        offset += size
+    if offset > len(data): return None
+    return raw
+
+def load_sounds(use_cache=True, stats=None):
+    """
+    Mixer phai da khoi tao; tra ve {ten: pygame.mixer.Sound}
+    stats (dict) neu co se nhan: "cache_hit", "seconds"
+    """
+    t0 = time.perf_counter()
+    key = pcm_hash(pygame.mixer.get_init())
+    path = os.path.join(CACHE_DIR, PCM_FILE)
+
+    raw = load_cached_pcm(path, key) if use_cache else None
+    cached = raw is not None
+    if not cached:
+        raw = decode_sounds()
+        try:
+            save_pcm(path, key, raw)
+        except OSError:
+            pass  # Khong ghi duoc cache -> van chay
+    sounds = {name: pygame.mixer.Sound(buffer=data) for name, data in raw.items()}
+
+    if stats is not None:
+        stats["cache_hit"] = cached
+        stats["seconds"] = time.perf_counter() - t0
+    return sounds
+
+# =========================================================
+# BACKEND
+# =========================================================
+class NullAudio:
+    """
+    Khong phat gi; dung khi headless hoac khong mo duoc thiet bi am thanh
+    """
+    music_loaded = False
+
+    def play(self, name):
+        return False
+
+    def play_music(self):
+        pass
+
+    def stop_music(self):
+        pass
+
+class AudioEngine:
+    def __init__(self, sounds, music_loaded=False, clock=time.perf_counter):
+        self.sounds = sounds
+        self.music_loaded = music_loaded
+        self.clock = clock
+
+        # Giu rieng cac kenh cua pool: Sound.play() tu do khong lay duoc
+        total = sum(SOUND_CHANNELS.values())
+        if pygame.mixer.get_num_channels() < total:
+            pygame.mixer.set_num_channels(total)
+        pygame.mixer.set_reserved(total)
+
+        self.pools = {}     # nhom -> [Channel]
+        self.started = {}   # nhom -> [thoi diem bat dau (ms) cua tung kenh]
+        first = 0
+        for group, n in SOUND_CHANNELS.items():
+            self.pools[group] = [pygame.mixer.Channel(first + i) for i in range(n)]
+            self.started[group] = [0.0] * n
+            first += n
+
+        self.last_played = {}   # ten -> thoi diem phat gan nhat (ms)
+        self.stats = {"played": 0, "stolen": 0, "limited": 0}
+
+    def play(self, name):
+        """
+        Phat am thanh qua pool cua nhom no; tra ve False neu bi bo qua
+        """
+        sound = self.sounds.get(name)
+        if sound is None: return False
+
+        now = self.clock() * 1000
+        last = self.last_played.get(name)
+        if last is not None and now - last < SOUND_MIN_GAP_MS:
+            self.stats["limited"] += 1
+            return False
+        self.last_played[name] = now
+
+        group = SOUND_GROUPS[name]
+        pool, started = self.pools[group], self.started[group]
+        for i, channel in enumerate(pool):
+            if not channel.get_busy(): break
+        else:
+            # Het kenh -> cuop kenh phat lau nhat (Channel.play dung tieng cu)
+            i = min(range(len(pool)), key=started.__getitem__)
+            self.stats["stolen"] += 1
+        pool[i].play(sound)
+        started[i] = now
+        self.stats["played"] += 1
+        return True
+
+    def play_music(self):
+        if self.music_loaded: pygame.mixer.music.play(-1)
+
+    def stop_music(self):
+        if self.music_loaded: pygame.mixer.music.stop()
+
+def open_audio(enabled=True, use_cache=True):
+    """
+    AudioEngine neu mo duoc mixer, khong thi NullAudio
+    """
+    if not enabled or not init_mixer(AUDIO_FREQUENCY, AUDIO_BUFFER):
+        return NullAudio()
+
+    with timed("sounds"):
+        try:
+            # Nhac nen stream tu file trong luong mixer, khong can cache
+            pygame.mixer.music.load(get_path("sounds", MUSIC_FILE))
+            music_loaded = True
+        except pygame.error:
+            music_loaded = False
+        sounds = load_sounds(use_cache)
+    return AudioEngine(sounds, music_loaded)
+
+if __name__ == "__main__":
+    if not init_mixer(AUDIO_FREQUENCY, AUDIO_BUFFER):
+        raise SystemExit("No audio device")
+    stats = {}
+    sounds = load_sounds(use_cache=False, stats=stats)
+    print(f"Decoded {len(sounds)} sounds in {stats['seconds'] * 1000:.1f} ms "
+          f"-> {os.path.join(CACHE_DIR, PCM_FILE)}")
+    load_sounds(stats=stats)
+    print(f"Cached load: {stats['seconds'] * 1000:.1f} ms")
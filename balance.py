@@ -0,0 +1,231 @@
+# =========================================================
+# FILE: balance.py
+# MO TA:
+# Mo phong hang nghin van (co seed) voi bot tren tat ca core
+# de danh gia can bang game ma khong can nguoi choi that:
+# thoi gian song, level dat duoc, ti le thang theo slot,
+# ti le bat / truot theo mua
+#
+# python balance.py --games 2000 --players 2
+# python balance.py --set MAX_LIVES=4 --out report.json
+# python balance.py --set 'SPAWN_ODDS=[("bomb", 0.3)]' --out games.csv
+# =========================================================
+
+import argparse
+import ast
+import csv
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# Worker khong can cua so / am thanh
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import settings
+from settings import *
+from players import MAX_PLAYERS, input_bits, chase_bot
+
+SEASONS = ("spring", "summer", "autumn", "winter")
+MAX_MINUTES = 10
+
+# =========================================================
+# BOT
+# BOTS[ten](rng) -> policy(game, slot) -> input bits cua slot do
+# =========================================================
+def idle_bot(rng):
+    return lambda game, slot: 0
+
+def random_bot(rng):
+    dirs = {}
+    def policy(game, slot):
+        # Giu 1 huong vai tick roi doi -> giong nguoi hon bam ngau nhien moi tick
+        if game.tick_count % 15 == 0 or slot not in dirs:
+            dirs[slot] = rng.choice(input_bits(slot) + (0,))
+        return dirs[slot]
+    return policy
+
+BOTS = {"chase": lambda rng: chase_bot, "random": random_bot, "idle": idle_bot}
+
+# =========================================================
+# WORKER
+# =========================================================
+_game = None
+
+def parse_overrides(items):
+    """
+    ["TEN=GIA_TRI", ...] -> {ten: gia tri}; ten phai co trong settings.py
+    """
+    overrides = {}
+    for item in items:
+        name, sep, value = item.partition("=")
+        name = name.strip()
+        if not sep or not hasattr(settings, name):
+            raise ValueError(f"unknown setting: {name}")
+        try:
+            overrides[name] = ast.literal_eval(value)
+        except (ValueError, SyntaxError):
+            raise ValueError(f"bad value for {name}: {value}") from None
+    return overrides
+
+def init_worker(overrides):
+    """
+    Ghi de hang so can bang trong moi process (game.py dung 'from settings import *'
+    nen phai ghi de ca ban sao trong module game)
+    """
+    global _game
+    import game
+    for name, value in overrides.items():
+        setattr(settings, name, value)
+        setattr(game, name, value)
+    _game = game.Game(headless=True)
+
+def play_game(job):
+    """
+    1 van tu dau den game over (hoac het gio) -> dict ket qua
+    """
+    seed, players, bot, max_ticks = job
+    game = _game
+    policy = BOTS[bot](random.Random(seed))
+    game.reset_game(players, seed=seed)
+
+    def inputs(g):
+        bits = 0
+        for slot in range(players): bits |= policy(g, slot)
+        return bits
+
+    game.simulate(inputs, max_ticks=max_ticks)
+    pl = game.players
+    return {
+        "seed": seed,
+        "players": players,
+        "seconds": game.tick_count / FPS,
+        "finished": game.game_over,
+        "level": game.level,
+        "winner": game.winner() if players > 1 else -1,
+        "scores": list(pl.score[:players]),
+        "caught": list(game.caught),
+        "missed": list(game.missed),
+    }
+
+# =========================================================
+# TONG HOP
+# =========================================================
+def percentile(sorted_values, q):
+    if not sorted_values: return 0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+def summarize(results, players):
+    n = len(results)
+    seconds = sorted(r["seconds"] for r in results)
+    levels = sorted(r["level"] for r in results)
+    level_counts = {}
+    for lv in levels: level_counts[lv] = level_counts.get(lv, 0) + 1
+
+    summary = {
+        "games": n,
+        "finished": sum(r["finished"] for r in results),
+        "survival_seconds": {
+            "mean": sum(seconds) / n,
+            "p10": percentile(seconds, 0.10),
+            "p50": percentile(seconds, 0.50),
+            "p90": percentile(seconds, 0.90),
+        },
+        "level": {
+            "mean": sum(levels) / n,
+            "max": levels[-1],
+            "distribution": level_counts,
+        },
+        "seasons": {},
+    }
+    if players > 1:
+        wins = [0] * players; draws = 0
+        for r in results:
+            if r["winner"] < 0: draws += 1
+            else: wins[r["winner"]] += 1
+        summary["win_rate"] = {f"p{i + 1}": wins[i] / n for i in range(players)}
+        summary["win_rate"]["draw"] = draws / n
+
+    for s, name in enumerate(SEASONS):
+        caught = sum(r["caught"][s] for r in results)
+        missed = sum(r["missed"][s] for r in results)
+        total = caught + missed
+        summary["seasons"][name] = {
+            "caught": caught,
+            "missed": missed,
+            "catch_rate": caught / total if total else None,
+        }
+    return summary
+
+def print_summary(summary, elapsed):
+    s = summary["survival_seconds"]
+    print(f"{summary['games']} games in {elapsed:.1f} s "
+          f"({summary['finished']} finished before the time limit)")
+    print(f"survival s: mean {s['mean']:.1f}  p10 {s['p10']:.1f}  "
+          f"p50 {s['p50']:.1f}  p90 {s['p90']:.1f}")
+    print(f"level:      mean {summary['level']['mean']:.2f}  max {summary['level']['max']}")
+    if "win_rate" in summary:
+        print("win rate:   " + "  ".join(f"{k} {v:.1%}" for k, v in summary["win_rate"].items()))
+    for name, st in summary["seasons"].items():
+        rate = "-" if st["catch_rate"] is None else f"{st['catch_rate']:.1%}"
+        print(f"  {name:<7} caught {st['caught']:>8}  missed {st['missed']:>8}  catch rate {rate}")
+
+def write_csv(path, results, players):
+    fields = ["seed", "players", "seconds", "finished", "level", "winner"]
+    fields += [f"p{i + 1}_score" for i in range(players)]
+    fields += [f"{k}_{s}" for k in ("caught", "missed") for s in SEASONS]
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(fields)
+        for r in results:
+            writer.writerow([r["seed"], r["players"], r["seconds"], int(r["finished"]),
+                             r["level"], r["winner"]] + r["scores"] + r["caught"] + r["missed"])
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fruit Catcher balance simulator")
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--players", type=int, default=1)
+    parser.add_argument("--bot", choices=sorted(BOTS), default="chase")
+    parser.add_argument("--seed", type=int, default=0, help="seed van dau, cac van sau +1")
+    parser.add_argument("--max-minutes", type=float, default=MAX_MINUTES,
+                        help="gioi han thoi gian moi van (phut game)")
+    parser.add_argument("--set", action="append", default=[], metavar="NAME=VALUE",
+                        help="ghi de hang so trong settings.py (lap lai duoc)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--out", help="file .json (tong hop) hoac .csv (tung van)")
+    args = parser.parse_args(argv)
+    if not 1 <= args.players <= MAX_PLAYERS:
+        parser.error(f"--players must be between 1 and {MAX_PLAYERS}")
+    try:
+        overrides = parse_overrides(args.set)
+    except ValueError as e:
+        parser.error(str(e))
+
+    max_ticks = int(args.max_minutes * 60 * FPS)
+    jobs = [(args.seed + i, args.players, args.bot, max_ticks) for i in range(args.games)]
+    t0 = time.perf_counter()
+    with ProcessPoolExecutor(args.workers, initializer=init_worker, initargs=(overrides,)) as pool:
+        chunk = max(1, len(jobs) // (args.workers * 8))
+        results = list(pool.map(play_game, jobs, chunksize=chunk))
+    elapsed = time.perf_counter() - t0
+
+    summary = summarize(results, args.players)
+    print_summary(summary, elapsed)
+
+    if args.out:
+        if args.out.endswith(".csv"):
+            write_csv(args.out, results, args.players)
+        else:
+            report = {"players": args.players, "bot": args.bot, "seed": args.seed,
+                      "max_minutes": args.max_minutes, "overrides": overrides,
+                      "summary": summary}
+            with open(args.out, "w") as f:
+                json.dump(report, f, indent=2)
+        print(f"Report written to {args.out}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
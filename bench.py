@@ -0,0 +1,222 @@
+# =========================================================
+# FILE: bench.py
+# MO TA:
+# Benchmark cac pha cua 1 tick game theo kich ban co dinh
+# In mean / p95 / p99 (micro giay) cho tung pha va so sanh
+# voi baseline da luu (vuot nguong tolerance -> bao loi)
+#
+# python bench.py                      # chay tat ca kich ban
+# python bench.py --save-baseline      # luu ket qua lam baseline
+# python bench.py --tolerance 0.2      # cho phep cham hon 20%
+# =========================================================
+
+import argparse
+import json
+import os
+import sys
+
+# Benchmark khong can cua so that (doi driver bang bien moi truong)
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from settings import *
+from entities import SPRITE_FRUIT_BASE
+
+BASELINE_FILE = os.path.join(BASE_DIR, "bench_baseline.json")
+FAR_FUTURE = 1e12
+# Chenh lech tuyet doi nho hon muc nay (us) coi nhu nhieu do
+MIN_DELTA_US = 2.0
+
+# =========================================================
+# KICH BAN
+# setup(game): dat trang thai ban dau
+# hold(game): chay truoc moi tick (ngoai phan do) de giu kich ban
+# =========================================================
+def pin_level(game, level):
+    game.level = level
+    pl = game.players
+    for i in range(pl.count): pl.score[i] = (level - 1) * 10
+    game.fruit_speed = game.spawns.speed(level)
+    game.fruit_interval = game.spawns.interval(level)
+
+def keep_alive(game):
+    pl = game.players
+    for i in range(pl.count):
+        pl.lives[i] = 3; pl.dead[i] = 0
+    game.game_over = False
+
+def top_up_fruits(game, count):
+    store = game.created_fruits
+    rng = game.fx_rng
+    while len(store) < count:
+        i = rng.randrange(len(FRUIT_FILES))
+        store.add(float(rng.randint(0, SCREEN_WIDTH - 40)), rng.uniform(-40, 300),
+                  game.fruit_data[i]["kind"], SPRITE_FRUIT_BASE + i)
+
+def setup_1p_spring(game):
+    game.reset_game(1, seed=1)
+
+def hold_1p_spring(game):
+    keep_alive(game); pin_level(game, 1)
+
+def setup_2p_magnets(game):
+    game.reset_game(2, seed=2)
+
+def hold_2p_magnets(game):
+    keep_alive(game); pin_level(game, 2)
+    pl = game.players
+    for i in range(pl.count):
+        if not pl.magnet[i]: game.start_effect("magnet", i, FAR_FUTURE)
+    top_up_fruits(game, 30)
+
+def setup_autumn_storm(game):
+    game.reset_game(2, seed=3)
+
+def hold_autumn_storm(game):
+    keep_alive(game); pin_level(game, 3)
+    top_up_fruits(game, 300)
+
+def setup_boss_freeze(game):
+    game.reset_game(2, seed=4)
+
+def hold_boss_freeze(game):
+    keep_alive(game); pin_level(game, 40)
+    game.boss_active = True
+    game.boss_hp = 1000
+    if not game.freeze_active: game.start_effect("freeze", None, FAR_FUTURE)
+
+def setup_8p_party(game):
+    game.reset_game(8, seed=5)
+
+def hold_8p_party(game):
+    keep_alive(game); pin_level(game, 3)
+    top_up_fruits(game, 100)
+
+SCENARIOS = {
+    "1p_spring_l1": (setup_1p_spring, hold_1p_spring),
+    "2p_magnets": (setup_2p_magnets, hold_2p_magnets),
+    "autumn_storm": (setup_autumn_storm, hold_autumn_storm),
+    "boss_l40_freeze": (setup_boss_freeze, hold_boss_freeze),
+    "8p_party": (setup_8p_party, hold_8p_party),
+}
+
+def scripted_inputs(tick):
+    """
+    P1 / P2 doi huong moi 45 / 30 tick, thinh thoang dung yen
+    """
+    p1 = (INPUT_P1_LEFT, INPUT_P1_RIGHT, 0)[(tick // 45) % 3]
+    p2 = (INPUT_P2_RIGHT, INPUT_P2_LEFT, 0)[(tick // 30) % 3]
+    # Slot 2+ (neu co): lap lai mau cua P1 / P2 xen ke
+    return (p1 | p2) * 0x1111
+
+# =========================================================
+# DO THOI GIAN
+# =========================================================
+def timed_tick(game, inputs, samples):
+    """
+    Chay Game.step() that, lay thoi gian tung pha tu cac lap("sim:*") cua step
+    (+ HUD ve rieng) qua FrameProfiler -> benchmark luon khop voi game (ns)
+    """
+    prof = game.profiler
+    prof.begin_frame()
+    game.step(inputs)
+    game.display_hud()
+    game.queue.flush(game.screen)
+    prof.lap("draw:hud")
+    for name, ns in prof.frame.items():
+        samples.setdefault(name, []).append(ns)
+
+def percentile(sorted_values, q):
+    if not sorted_values: return 0.0
+    idx = min(len(sorted_values) - 1, int(round(q * (len(sorted_values) - 1))))
+    return sorted_values[idx]
+
+def summarize(values_ns):
+    values = sorted(v / 1000 for v in values_ns)
+    return {
+        "mean": sum(values) / len(values),
+        "p95": percentile(values, 0.95),
+        "p99": percentile(values, 0.99),
+    }
+
+def run_scenario(game, name, ticks, warmup):
+    setup, hold = SCENARIOS[name]
+    setup(game)
+    game.fx_rng.seed(0)
+    samples = {}
+    for tick in range(warmup + ticks):
+        hold(game)
+        timed_tick(game, scripted_inputs(tick), samples)
+        if tick == warmup - 1:
+            samples = {}
+    return {p: summarize(v) for p, v in samples.items()}
+
+def compare(results, baseline, tolerance, min_delta=MIN_DELTA_US):
+    """
+    Tra ve danh sach pha cham hon baseline qua tolerance (theo mean)
+    va cham hon it nhat min_delta us
+    """
+    regressions = []
+    for scenario, phases in results.items():
+        for phase, stats in phases.items():
+            base = baseline.get(scenario, {}).get(phase)
+            if not base or base["mean"] <= 0: continue
+            ratio = stats["mean"] / base["mean"]
+            if ratio > 1 + tolerance and stats["mean"] - base["mean"] >= min_delta:
+                regressions.append((scenario, phase, base["mean"], stats["mean"], ratio))
+    return regressions
+
+def print_results(results):
+    for scenario, phases in results.items():
+        print(f"\n[{scenario}]")
+        print(f"  {'phase':<26}{'mean us':>10}{'p95 us':>10}{'p99 us':>10}")
+        for phase, s in phases.items():
+            print(f"  {phase:<26}{s['mean']:10.1f}{s['p95']:10.1f}{s['p99']:10.1f}")
+        total = sum(s["mean"] for s in phases.values())
+        print(f"  {'total (mean)':<26}{total:10.1f}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fruit Catcher per-tick benchmark")
+    parser.add_argument("scenarios", nargs="*",
+                        help="mac dinh: tat ca (" + ", ".join(SCENARIOS) + ")")
+    parser.add_argument("--ticks", type=int, default=3000)
+    parser.add_argument("--warmup", type=int, default=300)
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.15,
+                        help="ti le cham hon baseline cho phep (0.15 = 15%%)")
+    args = parser.parse_args(argv)
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown: parser.error("unknown scenario: " + ", ".join(sorted(unknown)))
+
+    from game import Game
+    from profiler import FrameProfiler
+    game = Game()
+    game.profiler = FrameProfiler(enabled=True)
+    results = {name: run_scenario(game, name, args.ticks, args.warmup)
+               for name in (args.scenarios or SCENARIOS)}
+    print_results(results)
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nBaseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("\nNo baseline found (run with --save-baseline).")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.tolerance)
+    if not regressions:
+        print(f"\nOK: no phase slower than baseline by more than {args.tolerance:.0%}")
+        return 0
+    print("\nREGRESSIONS:")
+    for scenario, phase, base, now, ratio in regressions:
+        print(f"  {scenario}/{phase}: {base:.1f} -> {now:.1f} us ({ratio - 1:+.0%})")
+    return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+# =========================================================
+# FILE: dirty_rects.py
+# MO TA:
+# Ve lai theo "dirty rect": chi phuc hoi nen o nhung vung
+# co vat the o frame truoc, va chi day len man hinh
+# nhung vung thay doi (frame truoc + frame nay)
+# =========================================================
+
+import pygame
+
+# Vung ban vuot qua ti le nay -> update ca man hinh cho nhanh
+FULL_UPDATE_RATIO = 0.6
+
+def merge_rects(rects):
+    """
+    Gop cac rect chong nhau thanh 1 rect bao ngoai
+    """
+    merged = []
+    for r in rects:
+        r = pygame.Rect(r)
+        idx = r.collidelist(merged)
+        while idx != -1:
+            r.union_ip(merged.pop(idx))
+            idx = r.collidelist(merged)
+        merged.append(r)
+    return merged
+
+# =========================================================
+# CLASS DIRTY RECT RENDERER
+# =========================================================
+class DirtyRectRenderer:
+    """
+    Quy trinh moi frame:
+    1. begin_frame(bg): phuc hoi nen o cac rect cua frame truoc
+    2. mark(rect): ghi lai vung vua ve trong frame nay
+    3. present(): display.update() voi danh sach rect da gop
+    Tat (enabled=False) thi luon ve / update toan man hinh
+    """
+    def __init__(self, screen, enabled=False):
+        self.screen = screen
+        self.enabled = enabled
+        self.screen_rect = screen.get_rect()
+        self.screen_area = self.screen_rect.width * self.screen_rect.height
+        self.background = None
+        self.full_redraw = True
+        self.prev_rects = []
+        self.dirty = []
+
+    def invalidate(self):
+        """
+        Bat buoc frame sau ve lai toan bo (doi man, menu, game over...)
+        """
+        self.full_redraw = True
+
+    def begin_frame(self, background):
+        """
+        Tra ve True neu caller phai tu ve toan bo nen
+        """
+        self.dirty = []
+        if not self.enabled or self.full_redraw or background is not self.background:
+            self.background = background
+            self.full_redraw = True
+            return True
+
+        for r in self.prev_rects:
+            self.screen.blit(background, r, r)
+        return False
+
+    def mark(self, rect):
+        if self.enabled: self.dirty.append(rect)
+
+    def mark_all(self, rects):
+        if self.enabled: self.dirty.extend(rects)
+
+    def present(self):
+        if self.full_redraw:
+            pygame.display.update()
+            self.full_redraw = False
+        else:
+            clip = self.screen_rect.clip
+            rects = merge_rects([clip(r) for r in self.prev_rects + self.dirty])
+            area = sum(r.width * r.height for r in rects)
+            if area > self.screen_area * FULL_UPDATE_RATIO:
+                pygame.display.update()
+            else:
+                pygame.display.update(rects)
+        self.prev_rects = self.dirty
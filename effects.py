@@ -0,0 +1,66 @@
+# =========================================================
+# FILE: effects.py
+# MO TA:
+# Lich hieu ung co thoi han (khien, nam cham, choang, dong bang...)
+# tren dong ho mo phong cua game (Game.ticks, ms):
+# - Moi hieu ung = 1 key (vd. ("shield", 0) hoac ("freeze", None))
+# - Thoi diem het han nam trong 1 heap -> moi tick chi nhin dinh heap,
+#   het han O(log n), khong phai duyet tung hieu ung
+# - Nhat lai hieu ung dang chay: lam moi (mac dinh) hoac cong don
+# =========================================================
+
+from heapq import heappush, heappop
+
+class EffectScheduler:
+    def __init__(self):
+        self.heap = []      # (het han, so thu tu, key); ban ghi cu bi bo qua khi lay ra
+        self.ends = {}      # key -> thoi diem het han hien tai
+        self.stacks = {}    # key -> so lan cong don
+        self.seq = 0
+
+    def clear(self):
+        self.heap.clear()
+        self.ends.clear()
+        self.stacks.clear()
+
+    def start(self, key, now, duration, stack=False):
+        """
+        Bat / lam moi hieu ung; stack=True -> cong them duration vao thoi gian con lai
+        Tra ve thoi diem het han
+        """
+        end = self.ends.get(key)
+        if stack and end is not None:
+            end = max(end, now) + duration
+            self.stacks[key] += 1
+        else:
+            end = now + duration
+            self.stacks[key] = 1
+        self.ends[key] = end
+        self.seq += 1
+        heappush(self.heap, (end, self.seq, key))
+        return end
+
+    def cancel(self, key):
+        self.stacks.pop(key, None)
+        return self.ends.pop(key, None) is not None
+
+    def active(self, key):
+        return key in self.ends
+
+    def remaining(self, key, now):
+        end = self.ends.get(key)
+        return 0 if end is None else max(0, end - now)
+
+    def expire(self, now):
+        """
+        Lay ra cac key het han (het han < now), theo thu tu het han
+        """
+        heap = self.heap
+        expired = []
+        while heap and heap[0][0] < now:
+            end, _, key = heappop(heap)
+            if self.ends.get(key) == end:
+                del self.ends[key]
+                del self.stacks[key]
+                expired.append(key)
+        return expired
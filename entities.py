@@ -0,0 +1,115 @@
+# =========================================================
+# FILE: entities.py
+# MO TA:
+# Kho luu tru vat roi (trai cay, bom, item) dang
+# "structure of arrays": moi thuoc tinh la 1 array rieng
+# =========================================================
+
+from array import array
+
+# =========================================================
+# LOAI VAT ROI (type id)
+# Thu tu trong tuple = id luu trong FruitStore.kind
+# =========================================================
+ITEM_TYPES = (
+    "normal", "heal", "shield",
+    "bomb", "boss_bomb",
+    "magnet", "freeze", "poison", "tnt",
+)
+TYPE_ID = {name: i for i, name in enumerate(ITEM_TYPES)}
+
+# Nam cham khong hut cac loai nay
+MAGNET_IMMUNE = frozenset(TYPE_ID[t] for t in ("bomb", "boss_bomb", "poison"))
+# Roi mat o che do 1 nguoi KHONG bi tru mang
+HARMLESS_MISS = frozenset(TYPE_ID[t] for t in ("bomb", "boss_bomb", "poison", "tnt"))
+
+# =========================================================
+# SPRITE ID
+# Chi so vao Game.sprites (trai cay dung SPRITE_FRUIT_BASE + i)
+# =========================================================
+SPRITE_BOMB = 0
+SPRITE_MAGNET = 1
+SPRITE_FREEZE = 2
+SPRITE_POISON = 3
+SPRITE_TNT = 4
+SPRITE_HEART = 5
+SPRITE_FRUIT_BASE = 6
+
+# Sprite co dinh cua cac loai khong phai trai cay
+ITEM_SPRITES = {
+    "bomb": SPRITE_BOMB,
+    "boss_bomb": SPRITE_BOMB,
+    "magnet": SPRITE_MAGNET,
+    "freeze": SPRITE_FREEZE,
+    "poison": SPRITE_POISON,
+    "tnt": SPRITE_TNT,
+}
+
+# =========================================================
+# CLASS FRUIT STORE
+# =========================================================
+class FruitStore:
+    """
+    Danh sach vat roi luu bang cac array song song
+    x, y: toa do (float) | kind: type id | sprite: sprite id
+    phase: pha goc xoay (chi de ve, xem sprite_cache.py)
+    prev_x, prev_y: toa do o tick truoc (de ve noi suy giua 2 tick)
+    Xoa bang swap-remove O(1) -> thu tu phan tu KHONG duoc giu
+    """
+    def __init__(self):
+        self.x = array("d")
+        self.y = array("d")
+        self.kind = array("B")
+        self.sprite = array("H")
+        self.phase = array("B")
+        self.prev_x = array("d")
+        self.prev_y = array("d")
+
+    def __len__(self):
+        return len(self.x)
+
+    def add(self, x, y, kind, sprite, phase=0):
+        self.x.append(x)
+        self.y.append(y)
+        self.kind.append(kind)
+        self.sprite.append(sprite)
+        self.phase.append(phase)
+        self.prev_x.append(x)
+        self.prev_y.append(y)
+
+    def remove(self, i):
+        """
+        Doi phan tu cuoi vao vi tri i roi cat bo phan tu cuoi
+        """
+        last = len(self.x) - 1
+        if i != last:
+            self.x[i] = self.x[last]
+            self.y[i] = self.y[last]
+            self.kind[i] = self.kind[last]
+            self.sprite[i] = self.sprite[last]
+            self.phase[i] = self.phase[last]
+            self.prev_x[i] = self.prev_x[last]
+            self.prev_y[i] = self.prev_y[last]
+        del self.x[last]
+        del self.y[last]
+        del self.kind[last]
+        del self.sprite[last]
+        del self.phase[last]
+        del self.prev_x[last]
+        del self.prev_y[last]
+
+    def clear(self):
+        del self.x[:]
+        del self.y[:]
+        del self.kind[:]
+        del self.sprite[:]
+        del self.phase[:]
+        del self.prev_x[:]
+        del self.prev_y[:]
+
+    def save_positions(self):
+        """
+        Goi dau moi tick: ghi nho vi tri hien tai lam prev_x / prev_y
+        """
+        self.prev_x[:] = self.x
+        self.prev_y[:] = self.y
@@ -8,51 +8,32 @@
 import pygame
 import random
 import os
+import sys
 import math
+import time
 from settings import *
-
-# =========================================================
-# KHOI TAO PYGAME
-# =========================================================
-pygame.init()
-pygame.mixer.init()
-
-# =========================================================
-# HAM TAO ANH PLACEHOLDER
-# Dung khi thieu hoac loi file anh
-# =========================================================
-def create_placeholder(color, text, size=(40, 40)):
-    """
-    Tao anh tron don gian co chu o giua
-    Dung khi khong load duoc asset that
-    """
-    surf = pygame.Surface(size, pygame.SRCALPHA)
-    pygame.draw.circle(
-        surf, color,
-        (size[0] // 2, size[1] // 2),
-        size[0] // 2
-    )
-    font = pygame.font.SysFont(None, 20)
-    txt = font.render(text, True, (255, 255, 255))
-    surf.blit(txt, txt.get_rect(center=(size[0] // 2, size[1] // 2)))
-    return surf
-
-# =========================================================
-# HAM LOAD ANH AN TOAN
-# Neu loi hoac thieu file -> dung placeholder
-# =========================================================
-def safe_load_image(folder, filename, size, fallback_color=(200, 200, 200)):
-    """
-    Load anh tu thu muc asset
-    Neu that bai thi tra ve anh placeholder
-    """
-    path = get_path(folder, filename)
-    try:
-        img = pygame.image.load(path).convert_alpha()
-        img = pygame.transform.scale(img, size)
-        return img
-    except (pygame.error, FileNotFoundError):
-        return create_placeholder(fallback_color, "?", size)
+from entities import *
+from particles import ParticlePool
+from text_cache import render_text
+from dirty_rects import DirtyRectRenderer
+from atlas import load_sprites
+from startup import timed, init_display, get_font, startup_report
+from replay import Recorder
+from profiler import FrameProfiler
+from players import *
+from effects import EffectScheduler
+from pacing import FramePacer, create_window
+from audio import open_audio
+from layout import *
+from scores import open_scores, game_records, today
+from snapshot import save_state, load_state, SnapshotRing
+from spawns import SpawnEngine
+from render_queue import *
+from input_state import InputState
+from sprite_cache import *
+
+# Import game.py KHONG khoi tao pygame:
+# display / mixer / font chi khoi tao khi can (xem startup.py)
 
 # =========================================================
 # CLASS FLOATING TEXT
@@ -64,40 +45,18 @@ class FloatingText(pygame.sprite.Sprite):
     """
     def __init__(self, text, x, y, color, font):
         super().__init__()
-        self.image = font.render(text, True, color)
+        self.image = render_text(font, text, color)
         self.rect = self.image.get_rect(center=(x, y))
+        self.prev_y = self.rect.y   # y tick truoc -> ve noi suy (pos)
         self.life = 60
         self.velocity = -1
 
-    def update(self):
-        self.rect.y += self.velocity
-        self.life -= 1
-        if self.life <= 0:
-            self.kill()
-
-# =========================================================
-# CLASS PARTICLE
-# Hieu ung hat no khi bat vat pham
-# =========================================================
-class Particle(pygame.sprite.Sprite):
-    """
-    Hieu ung hat vo nho bay ra ngau nhien
-    """
-    def __init__(self, x, y, color):
-        super().__init__()
-        size = random.randint(4, 8)
-        self.image = pygame.Surface((size, size))
-        self.image.fill(color)
-        self.rect = self.image.get_rect(center=(x, y))
-        self.vel_x = random.uniform(-4, 4)
-        self.vel_y = random.uniform(-4, 4)
-        self.life = random.randint(20, 40)
-        self.gravity = 0.2
+    def pos(self, alpha=1.0):
+        return self.rect.x, round(self.prev_y + (self.rect.y - self.prev_y) * alpha)
 
     def update(self):
-        self.vel_y += self.gravity
-        self.rect.x += self.vel_x
-        self.rect.y += self.vel_y
+        self.prev_y = self.rect.y
+        self.rect.y += self.velocity
         self.life -= 1
         if self.life <= 0:
             self.kill()
@@ -107,217 +66,243 @@ class Particle(pygame.sprite.Sprite):
 # Quan ly toan bo game
 # =========================================================
 class Game:
-    def __init__(self):
-        # Tao cua so game
-        self.screen = pygame.display.set_mode(
-            (SCREEN_WIDTH, SCREEN_HEIGHT)
-        )
-        pygame.display.set_caption(GAME_CAPTION)
-
-        self.clock = pygame.time.Clock()
-        self.font = pygame.font.SysFont(None, 28)
-        self.header_font = pygame.font.SysFont(None, 60)
-
-        # Load tai nguyen
+    def __init__(self, headless=False, dirty_rects=USE_DIRTY_RECTS, rewind_seconds=REWIND_SECONDS):
+        # headless = chi chay logic: khong cua so, khong am thanh,
+        # khong gioi han FPS (dung cho mo phong hang loat)
+        self.headless = headless
+
+        if headless:
+            self.screen = None
+            self.renderer = None
+            self.pacer = None
+        else:
+            # Tao cua so game
+            init_display()
+            with timed("window"):
+                self.screen = create_window((RENDER_WIDTH, RENDER_HEIGHT), GAME_CAPTION)
+                pygame.display.set_caption(GAME_CAPTION)
+            self.renderer = DirtyRectRenderer(self.screen, dirty_rects)
+            self.pacer = FramePacer()
+        # Lenh ve gameplay gom theo lop, ve 1 lan cuoi draw() (xem render_queue.py)
+        self.queue = RenderQueue()
+        self.input = InputState()
+
+        # Load tai nguyen (am thanh load lazy, xem load_sounds)
         self.load_resources()
 
         # Bien quan ly chung
-        self.highest_score = 0
+        # Bang xep hang (scores.py); headless / khong mo duoc DB -> chi nho trong RAM
+        self.scores = None if headless else open_scores()
+        self.highest_score = self.scores.best(1) if self.scores else 0
         self.floating_texts = pygame.sprite.Group()
-        self.particles = pygame.sprite.Group()
+        self.particles = ParticlePool(scale=WORLD_SCALE)
+        self.squashes = []      # (sprite, x, y, tick bat duoc): hieu ung bep, chi de ve
 
         self.return_to_menu = True
         self.is_mute = False
         self.screen_shake = 0
 
+        # RNG hieu ung (hat no, rung man hinh): KHONG anh huong ket qua
+        self.fx_rng = random.Random()
+        # Do thoi gian tung pha (F3 bat/tat overlay)
+        self.profiler = FrameProfiler()
+        # Ghi replay: thu muc luu file (None = khong ghi)
+        self.record_dir = None
+        self.recorder = None
+
+        # Slot -> ham bot (game, slot) -> input bits, vd. {2: chase_bot}
+        self.bots = {}
+        # So nguoi choi cua nut "nhieu nguoi" o man hinh chinh
+        self.multi_players = 2
+        self.players = PlayerTable()
+        self.effects = EffectScheduler()
+        # Bang sinh + duong cong do kho bien dich tu settings (spawns.py)
+        self.spawns = SpawnEngine()
+        # Snapshot moi tick cua rewind_seconds giay cuoi (tua lai), headless thi tat
+        self.history = None
+        if not headless and rewind_seconds:
+            n = int(rewind_seconds * FPS)
+            self.history = SnapshotRing(n, n * REWIND_SNAPSHOT_BYTES)
+        self.save_point = None
+
         self.game_mode = 1
         self.reset_game(1)
 
+    # =====================================================
+    # FONT (tao lazy: SysFont tim font he thong rat cham)
+    # =====================================================
+    @property
+    def font(self):
+        return get_font(ui(28))
+
+    @property
+    def header_font(self):
+        return get_font(ui(60))
+
+    # =====================================================
+    # LOAD AM THANH (lazy: lan dau can phat tieng, xem audio.py)
+    # =====================================================
+    def load_sounds(self):
+        if self.audio is None:
+            self.audio = open_audio(enabled=not self.headless)
+
     # =====================================================
     # LOAD TAT CA TAI NGUYEN
     # =====================================================
     def load_resources(self):
         # -------------------------
-        # 1. AM THANH
+        # 1. AM THANH (chua load, xem load_sounds)
         # -------------------------
-        self.music_loaded = False
-        self.bomb_sound = None
-        self.score_sound = None
-        self.lost_life_sound = None
-
-        try:
-            pygame.mixer.music.load(
-                get_path("sounds", "game_song.mp3")
-            )
-            self.music_loaded = True
-        except:
-            pass
-
-        def load_snd(name):
-            p = get_path("sounds", name)
-            return pygame.mixer.Sound(p) if os.path.exists(p) else None
-
-        self.bomb_sound = load_snd("bomb.mp3")
-        self.score_sound = load_snd("coin.mp3")
-        self.lost_life_sound = load_snd("lost_life.mp3")
+        self.audio = None
 
         # -------------------------
-        # 2. HINH ANH
+        # 2. HINH ANH (lay tu texture atlas, xem atlas.py)
+        # Headless: khong co man hinh -> khong load anh (img = None)
         # -------------------------
-        base_bucket = safe_load_image(
-            "imgs", IMG_FILES["bucket"], (50, 50)
-        )
-
-        self.bucket_p1_img = base_bucket.copy()
-        self.bucket_p1_img.fill(
-            COLOR_P1 if "COLOR_P1" in globals() else (255, 0, 0),
-            special_flags=pygame.BLEND_RGBA_MULT
-        )
-
-        self.bucket_p2_img = base_bucket.copy()
-        self.bucket_p2_img.fill(
-            COLOR_P2 if "COLOR_P2" in globals() else (0, 255, 255),
-            special_flags=pygame.BLEND_RGBA_MULT
-        )
-
-        self.bomb_img = safe_load_image(
-            "imgs", IMG_FILES["bomb"], (40, 40), (0, 0, 0)
-        )
-        self.heart_img = safe_load_image(
-            "imgs", IMG_FILES["heart"], (25, 25), (255, 0, 0)
-        )
-        self.return_img = safe_load_image(
-            "imgs", IMG_FILES["return"], (30, 30)
-        )
-        self.volume_img = safe_load_image(
-            "imgs", IMG_FILES["volume"], (30, 30)
-        )
-        self.mute_img = safe_load_image(
-            "imgs", IMG_FILES["mute"], (30, 30)
-        )
-        self.logo_img = safe_load_image(
-            "imgs", IMG_FILES["logo"], (100, 100)
-        )
-
-        self.boss_img = safe_load_image(
-            "imgs", "boss_monkey.png", (80, 80), (100, 0, 0)
-        )
+        if self.headless:
+            sprites = {}
+        else:
+            with timed("sprites"):
+                sprites = load_sprites()
+        img = sprites.get
+
+        self.bucket_imgs = [img(f"bucket_p{i + 1}") for i in range(MAX_PLAYERS)]
+
+        self.bomb_img = img("bomb")
+        self.heart_img = img("heart")
+        self.return_img = img("return")
+        self.volume_img = img("volume")
+        self.mute_img = img("mute")
+        self.logo_img = img("logo")
+
+        self.boss_img = img("boss")
 
         # -------------------------
         # 3. TRAI CAY VA ITEM
         # -------------------------
         self.fruit_data = []
-        for f_name in FRUIT_FILES:
-            img = safe_load_image("imgs", f_name, (40, 40))
-            f_type = "normal"
-            if "banana" in f_name:
-                f_type = "heal"
-            elif "apple" in f_name:
-                f_type = "shield"
+        for i, f_name in enumerate(FRUIT_FILES):
+            f_type = FRUIT_TYPES.get(f_name, "normal")
             self.fruit_data.append({
-                "img": img,
-                "type": f_type
+                "img": img(f_name),
+                "type": f_type,
+                "kind": TYPE_ID[f_type],
+                "sprite": SPRITE_FRUIT_BASE + i
             })
 
-        self.item_magnet_img = safe_load_image(
-            "imgs", "item_magnet.png", (40, 40)
-        )
-        self.item_freeze_img = safe_load_image(
-            "imgs", "item_freeze.png", (40, 40)
-        )
-        self.item_poison_img = safe_load_image(
-            "imgs", "item_poison.png", (40, 40)
-        )
-        self.item_tnt_img = safe_load_image(
-            "imgs", "item_tnt.png", (40, 40)
-        )
+        self.item_magnet_img = img("item_magnet")
+        self.item_freeze_img = img("item_freeze")
+        self.item_poison_img = img("item_poison")
+        self.item_tnt_img = img("item_tnt")
+
+        # Bang sprite theo thu tu SPRITE_* (xem entities.py)
+        self.sprites = [
+            self.bomb_img, self.item_magnet_img, self.item_freeze_img,
+            self.item_poison_img, self.item_tnt_img, self.heart_img,
+        ] + [f["img"] for f in self.fruit_data]
+        # Khung xoay / phong to cua sprite, tinh lazy (xem sprite_cache.py)
+        self.sprite_variants = SpriteVariantCache(self.sprites)
 
         # -------------------------
         # 4. BACKGROUND
         # -------------------------
-        self.backgrounds = []
-        for filename, fallback_color in BG_CONFIG:
-            bg = safe_load_image(
-                "imgs", filename,
-                (SCREEN_WIDTH, SCREEN_HEIGHT),
-                fallback_color
-            )
-            self.backgrounds.append(bg)
+        self.backgrounds = [img(f"bg_{i}") for i in range(len(BG_CONFIG))]
 
     # =====================================================
     # RESET TRANG THAI GAME
     # =====================================================
-    def reset_game(self, mode=1):
+    def reset_game(self, mode=1, seed=None):
+        # mode = so nguoi choi (1 .. MAX_PLAYERS)
         self.game_mode = mode
-        self.created_fruits = []
+        # RNG gameplay rieng: cung seed + cung input -> cung ket qua
+        self.seed = seed if seed is not None else random.randrange(1 << 32)
+        self.rng = random.Random(self.seed)
+        self.created_fruits = FruitStore()
         self.last_fruit_time = 0
+        # Dong ho mo phong (ms): tang TICK_MS moi lan step()
+        self.ticks = 0
+        self.tick_count = 0
         self.floating_texts.empty()
-        self.particles.empty()
+        self.particles.clear()
+        self.squashes.clear()
         self.screen_shake = 0
-
-        # -------- PLAYER 1 --------
-        self.p1_score = 0
-        self.p1_lives = 3
-        self.p1_x = SCREEN_WIDTH // 2
-        self.p1_dead = False
-        self.p1_shield = False
-        self.p1_magnet = False
-        self.p1_confused = False
-        self.p1_velocity = 0
-
-        # -------- PLAYER 2 --------
-        self.p2_score = 0
-        self.p2_lives = 3
-        self.p2_x = SCREEN_WIDTH // 2 - 100
-        self.p2_dead = (mode == 1)
-        self.p2_shield = False
-        self.p2_magnet = False
-        self.p2_confused = False
-        self.p2_velocity = 0
+        if self.renderer: self.renderer.invalidate()
+        if self.record_dir: self.recorder = Recorder(mode, self.seed)
+        if self.history is not None: self.history.clear()
+        self.save_point = None
+        self.scores_saved = False
+
+        # -------- NGUOI CHOI (xem players.py) --------
+        self.players.reset(mode, START_LIVES)
+        self.effects.clear()
+        # Thong ke theo mua (0..3): so vat tot bat duoc / de roi
+        self.caught = [0] * 4
+        self.missed = [0] * 4
 
         self.game_over = False
+        # Tam dung: khong step -> dong ho mo phong va moi hieu ung dung lai
+        self.paused = False
         self.level = 1
 
-        self.base_speed = 3.0
-        self.base_interval = 1000
+        self.base_speed = BASE_FRUIT_SPEED
+        self.base_interval = BASE_FRUIT_INTERVAL
         self.fruit_speed = self.base_speed
         self.fruit_interval = self.base_interval
-        self.max_lives = 5
+        self.max_lives = MAX_LIVES
 
         self.freeze_active = False
         self.boss_active = False
         self.boss_hp = 0
         self.boss_x = SCREEN_WIDTH // 2
+        self.prev_boss_x = self.boss_x
         self.boss_dir = 1
 
     # =====================================================
     def spawn_particles(self, x, y, color, count=10):
-        for _ in range(count):
-            p = Particle(x, y, color)
-            self.particles.add(p)
+        if self.headless: return
+        self.particles.spawn(x, y, color, count, self.fx_rng)
+
+    def add_squash(self, sprite, x, y):
+        if self.headless: return
+        self.squashes.append((sprite, x, y, self.tick_count))
+
+    def update_squashes(self):
+        if self.squashes:
+            tick = self.tick_count
+            self.squashes = [s for s in self.squashes if tick - s[3] < SQUASH_TICKS]
+
+    def add_text(self, text, x, y, color, big=False):
+        # Chu noi chi de hien thi -> bo qua khi headless
+        # x, y: toa do san choi (nhu vat roi), doi sang px ve 1 lan luc tao
+        if self.headless: return
+        font = self.header_font if big else self.font
+        self.floating_texts.add(FloatingText(text, world_px(x), world_px(y), color, font))
+
+    def play_sound(self, name):
+        if self.headless: return
+        if self.audio is None: self.load_sounds()
+        self.audio.play(name)
 
     def trigger_shake(self, intensity=10):
         self.screen_shake = intensity
 
     def level_up(self):
-        highest_current = max(self.p1_score, self.p2_score)
+        highest_current = max(self.players.score[:self.players.count])
         new_level = (highest_current // 10) + 1
         
         if new_level > self.level:
             self.level = new_level
-            increase_factor = 1.10
-            self.fruit_speed = self.base_speed * (increase_factor ** (self.level - 1))
-            if self.fruit_speed > 20: self.fruit_speed = 20
-            self.fruit_interval = max(self.base_interval * (0.95 ** (self.level - 1)), 250)
+            self.fruit_speed = self.spawns.speed(self.level)
+            self.fruit_interval = self.spawns.interval(self.level)
 
-            self.floating_texts.add(FloatingText(f"LEVEL {self.level}!", SCREEN_WIDTH//2, 200, WHITE, self.header_font))
+            self.add_text(f"LEVEL {self.level}!", WORLD_CENTER_X, wy(0.40), WHITE, big=True)
 
             # --- BOSS LOGIC MỚI: Mỗi 4 Level (Chu kỳ 4 mùa) ---
             if self.level % 4 == 0:
                 self.boss_active = True
                 # Boss trâu hơn theo cấp độ (Máu cơ bản 30 + 5 mỗi level)
                 self.boss_hp = 30 + (self.level * 5)
-                self.floating_texts.add(FloatingText("BOSS FIGHT!", SCREEN_WIDTH//2, 250, RED, self.header_font))
+                self.add_text("BOSS FIGHT!", WORLD_CENTER_X, wy(0.50), RED, big=True)
             else:
                 self.boss_active = False
 
@@ -328,456 +313,777 @@ class Game:
     def get_season(self):
         return (self.level - 1) % 4 
 
-    def move_buckets(self):
-        keys = pygame.key.get_pressed()
-        speed = 8 
-        season = self.get_season()
-        
-        # --- P1 ---
-        if not self.p1_dead:
-            move_dir = 0
-            k_left = keys[pygame.K_RIGHT] if self.p1_confused else keys[pygame.K_LEFT]
-            k_right = keys[pygame.K_LEFT] if self.p1_confused else keys[pygame.K_RIGHT]
-
-            if k_left: move_dir = -1
-            elif k_right: move_dir = 1
-            
-            if season == 3: # Winter
-                accel = 0.5; friction = 0.9
-                if move_dir != 0: self.p1_velocity += move_dir * accel
-                else: self.p1_velocity *= friction
-                self.p1_velocity = max(-10, min(10, self.p1_velocity))
-                self.p1_x += self.p1_velocity
-            else:
-                self.p1_x += move_dir * speed
-
-            self.p1_x = max(0, min(SCREEN_WIDTH - 50, self.p1_x))
-
-        # --- P2 ---
-        if self.game_mode == 2 and not self.p2_dead:
-            move_dir = 0
-            k_a = keys[pygame.K_d] if self.p2_confused else keys[pygame.K_a]
-            k_d = keys[pygame.K_a] if self.p2_confused else keys[pygame.K_d]
+    def bot_inputs(self):
+        inputs = 0
+        for slot, bot in self.bots.items():
+            if slot < self.players.count: inputs |= bot(self, slot)
+        return inputs
 
-            if k_a: move_dir = -1
-            elif k_d: move_dir = 1
-
-            if season == 3: # Winter
-                accel = 0.5; friction = 0.9
-                if move_dir != 0: self.p2_velocity += move_dir * accel
-                else: self.p2_velocity *= friction
-                self.p2_velocity = max(-10, min(10, self.p2_velocity))
-                self.p2_x += self.p2_velocity
-            else:
-                self.p2_x += move_dir * speed
-
-            self.p2_x = max(0, min(SCREEN_WIDTH - 50, self.p2_x))
+    def move_buckets(self, inputs):
+        winter = self.get_season() == 3
+        pl = self.players
+        xs, vel, confused, dead = pl.x, pl.velocity, pl.confused, pl.dead
+        
+        for i in range(pl.count):
+            if dead[i]: continue
+            xs[i], vel[i] = step_bucket(xs[i], vel[i], inputs >> (2 * i) & 3, confused[i], winter)
 
-    def handle_catch(self, player_id, item_type, x, y):
-        is_p1 = (player_id == 1)
+    def handle_catch(self, slot, item_type, x, y):
+        is_p1 = (slot == 0)
+        pl = self.players
         
         if item_type == "bomb" or item_type == "boss_bomb":
-            has_shield = self.p1_shield if is_p1 else self.p2_shield
-            if has_shield:
-                self.floating_texts.add(FloatingText("Blocked!", x, y, CYAN if is_p1 else MAGENTA, self.font))
+            if pl.shield[slot]:
+                self.add_text("Blocked!", x, y, CYAN if is_p1 else MAGENTA)
                 self.spawn_particles(x, y, (200, 200, 255)) 
-                if self.score_sound: self.score_sound.play()
+                self.play_sound("score")
             else:
-                if self.bomb_sound: self.bomb_sound.play()
-                self.floating_texts.add(FloatingText("-1 Heart", x, y, RED, self.font))
+                self.play_sound("bomb")
+                self.add_text("-1 Heart", x, y, RED)
                 self.trigger_shake(15) 
                 self.spawn_particles(x, y, (255, 50, 50), 20)
-                if is_p1: self.p1_lives -= 1
-                else: self.p2_lives -= 1
+                pl.lives[slot] -= 1
         else:
-            if self.score_sound: self.score_sound.play()
-            if is_p1: self.p1_score += 1
-            else: self.p2_score += 1
+            self.play_sound("score")
+            pl.score[slot] += 1
             self.level_up()
             self.spawn_particles(x, y, (255, 255, 0))
 
             if item_type == "heal":
-                lives = self.p1_lives if is_p1 else self.p2_lives
-                if lives < self.max_lives:
-                    self.floating_texts.add(FloatingText("+1 Heart", x, y, (255,100,200), self.font))
-                    if is_p1: self.p1_lives += 1
-                    else: self.p2_lives += 1
+                if pl.lives[slot] < self.max_lives:
+                    self.add_text("+1 Heart", x, y, (255,100,200))
+                    pl.lives[slot] += 1
                 else:
-                    self.floating_texts.add(FloatingText("Full HP", x, y, WHITE, self.font))
+                    self.add_text("Full HP", x, y, WHITE)
 
             elif item_type == "shield":
-                duration = 4000 
-                self.floating_texts.add(FloatingText("Shield ON!", x, y, CYAN if is_p1 else MAGENTA, self.font))
-                if is_p1: self.p1_shield = True; self.p1_shield_time = pygame.time.get_ticks() + duration
-                else: self.p2_shield = True; self.p2_shield_time = pygame.time.get_ticks() + duration
+                self.add_text("Shield ON!", x, y, CYAN if is_p1 else MAGENTA)
+                self.start_effect("shield", slot)
             
             elif item_type == "magnet":
-                duration = 5000
-                self.floating_texts.add(FloatingText("Magnet!", x, y, (128, 0, 128), self.font))
-                if is_p1: self.p1_magnet = True; self.p1_magnet_time = pygame.time.get_ticks() + duration
-                else: self.p2_magnet = True; self.p2_magnet_time = pygame.time.get_ticks() + duration
+                self.add_text("Magnet!", x, y, (128, 0, 128))
+                self.start_effect("magnet", slot)
 
             elif item_type == "freeze":
-                duration = 5000
-                self.floating_texts.add(FloatingText("Freeze!", x, y, (0, 191, 255), self.font))
-                self.freeze_active = True
-                self.freeze_end_time = pygame.time.get_ticks() + duration
+                self.add_text("Freeze!", x, y, (0, 191, 255))
+                self.start_effect("freeze")
 
             elif item_type == "poison":
-                duration = 3000
-                self.floating_texts.add(FloatingText("Confused!", x, y, (0, 100, 0), self.font))
-                target_p1 = not is_p1 if self.game_mode == 2 else True 
+                self.add_text("Confused!", x, y, (0, 100, 0))
+                # 1 nguoi: tu dinh doc | nhieu nguoi: doi thu bi choang
+                if self.game_mode == 1: targets = [0]
+                else: targets = [i for i in range(pl.count) if i != slot]
                 
-                if target_p1: 
-                    self.p1_confused = True; self.p1_confused_time = pygame.time.get_ticks() + duration
-                    if self.game_mode == 2: self.floating_texts.add(FloatingText("P1 Dizzy!", self.p1_x, 400, (0,255,0), self.font))
-                else: 
-                    self.p2_confused = True; self.p2_confused_time = pygame.time.get_ticks() + duration
-                    self.floating_texts.add(FloatingText("P2 Dizzy!", self.p2_x, 400, (0,255,0), self.font))
+                for t in targets:
+                    self.start_effect("confused", t)
+                    if self.game_mode > 1: self.add_text(f"P{t + 1} Dizzy!", pl.x[t], wy(0.80), (0,255,0))
 
             elif item_type == "tnt":
-                self.floating_texts.add(FloatingText("BOOM!", SCREEN_WIDTH//2, SCREEN_HEIGHT//2, (255, 165, 0), self.header_font))
+                self.add_text("BOOM!", WORLD_CENTER_X, wy(0.50), (255, 165, 0), big=True)
                 self.trigger_shake(20)
                 self.created_fruits.clear()
                 self.spawn_particles(x, y, (255, 100, 0), 30)
 
             else:
                 color = (255,255,0) if is_p1 else (0,255,255)
-                self.floating_texts.add(FloatingText("+1", x, y, color, self.font))
+                self.add_text("+1", x, y, color)
 
     def create_and_check_fruits(self):
-        now = pygame.time.get_ticks()
+        now = self.ticks
         season = self.get_season()
 
         current_speed_mult = 1.0
-        if self.freeze_active:
-            if now < self.freeze_end_time: current_speed_mult = 0.2 
-            else: self.freeze_active = False
+        if self.freeze_active: current_speed_mult = 0.2 
 
         if season == 1: current_speed_mult *= 1.3
 
         spawn_rate = self.fruit_interval
-        if self.boss_active: spawn_rate = 400 
+        if self.boss_active: spawn_rate = BOSS_SPAWN_INTERVAL
 
         if now - self.last_fruit_time >= spawn_rate:
-            is_bomb = False; chosen_img = None; chosen_type = "normal"
-            roll = random.random()
-            
+            # Bang alias bien dich san (spawns.py): 1 so ngau nhien / lan sinh
             if self.boss_active:
-                # --- BOSS BOMBS INCREASE LOGIC ---
-                # Tỉ lệ bom gốc là 55%. Mỗi lần gặp boss (mỗi 4 level), tăng thêm 5%
-                # Min 90% (Để còn 10% cơ hội rơi vật phẩm cứu trợ)
-                bomb_chance = min(0.90, 0.55 + (self.level // 4) * 0.05)
-                
-                if roll < bomb_chance: 
-                    is_bomb = True; chosen_type = "boss_bomb"; chosen_img = self.bomb_img
-                else:
-                    # Vật phẩm hỗ trợ
-                    chosen_type = "heal"; chosen_img = self.heart_img 
-                    for f in self.fruit_data: 
-                        if f["type"] == "heal": chosen_img = f["img"]; break
+                kind, sprite = self.spawns.pick_boss(self.rng, self.level)
                 start_x = self.boss_x
             else:
-                if roll < 0.02: chosen_type = "magnet"; chosen_img = self.item_magnet_img
-                elif roll < 0.04: chosen_type = "freeze"; chosen_img = self.item_freeze_img
-                elif roll < 0.06: chosen_type = "tnt"; chosen_img = self.item_tnt_img
-                elif roll < 0.08: chosen_type = "poison"; chosen_img = self.item_poison_img
-                elif roll < 0.25: is_bomb = True; chosen_type = "bomb"; chosen_img = self.bomb_img
-                else:
-                    data = random.choice(self.fruit_data)
-                    chosen_img = data["img"]; chosen_type = data["type"]
-                start_x = random.randint(0, SCREEN_WIDTH - 40)
-
-            fruit = {
-                "x": float(start_x),
-                "y": -40.0 if not self.boss_active else 50.0, 
-                "img": chosen_img,
-                "type": chosen_type
-            }
-            self.created_fruits.append(fruit)
+                kind, sprite = self.spawns.pick(self.rng, season)
+                start_x = self.rng.randint(0, SCREEN_WIDTH - 40)
+
+            self.created_fruits.add(
+                float(start_x),
+                -40.0 if not self.boss_active else 50.0,
+                kind,
+                sprite,
+                # Pha goc xoay: chi de ve, khong rut tu self.rng (giu nguyen chuoi ngau nhien)
+                self.tick_count * 13 % SPIN_ANGLES
+            )
             self.last_fruit_time = now
-        
-        rect_p1 = pygame.Rect(self.p1_x, 450, 50, 50)
-        rect_p2 = pygame.Rect(self.p2_x, 450, 50, 50)
 
-        for f in self.created_fruits[:]:
-            if not self.created_fruits and f not in self.created_fruits: break
-
-            magnet_p1 = self.p1_magnet and not self.p1_dead
-            magnet_p2 = self.p2_magnet and self.game_mode == 2 and not self.p2_dead
-            
-            if (magnet_p1 or magnet_p2) and f["type"] not in ["bomb", "boss_bomb", "poison"]:
-                target_x = self.p1_x
-                if magnet_p2:
-                    if not magnet_p1: target_x = self.p2_x
-                    else: 
-                        if abs(f["x"] - self.p2_x) < abs(f["x"] - self.p1_x): target_x = self.p2_x
-                f["x"] += (target_x - f["x"]) * 0.05 
-
-            if season == 2 and not self.boss_active:
-                f["x"] += math.sin(f["y"] * 0.02) * 2 
-
-            f["y"] += self.fruit_speed * current_speed_mult
-            
-            self.screen.blit(f["img"], (int(f["x"]), int(f["y"])))
-            f_rect = pygame.Rect(int(f["x"]), int(f["y"]), 40, 40)
-            caught = False
-            
-            if not self.p1_dead and rect_p1.colliderect(f_rect):
-                self.handle_catch(1, f["type"], f["x"], f["y"])
-                caught = True
-            elif self.game_mode == 2 and not self.p2_dead and rect_p2.colliderect(f_rect):
-                self.handle_catch(2, f["type"], f["x"], f["y"])
-                caught = True
-
-            if caught:
-                if f in self.created_fruits: self.created_fruits.remove(f)
+        store = self.created_fruits
+        xs, ys, kinds = store.x, store.y, store.kind
+        n = len(store)
+
+        # -------- 1. Nam cham (hut ve xo gan nhat) --------
+        magnets = MagnetTargets(self.players) if 1 in self.players.magnet else None
+
+        if magnets:
+            nearest_x = magnets.nearest_x
+            for i in range(n):
+                if kinds[i] in MAGNET_IMMUNE: continue
+                fx = xs[i]
+                xs[i] = fx + (nearest_x(fx) - fx) * 0.05
+
+        # -------- 2. Gio mua thu (truoc khi roi, dung y cu) --------
+        if season == 2 and not self.boss_active:
+            sin = math.sin
+            for i in range(n):
+                xs[i] += sin(ys[i] * 0.02) * 2
+
+        # -------- 3. Roi --------
+        dy = self.fruit_speed * current_speed_mult
+        for i in range(n):
+            ys[i] += dy
+
+        # -------- 4. Va cham voi xo + roi khoi man hinh --------
+        # Duyet nguoc de swap-remove khong lam sot phan tu
+        # Xo nam o y = BUCKET_Y (cao BUCKET_H), vat roi cao FRUIT_W:
+        # chi vat co BUCKET_Y - FRUIT_W < int(y) < BUCKET_Y + BUCKET_H moi co the cham xo
+        catcher = None     # chi sap xep xo khi co vat dau tien vao vung xo
+        catch_top, catch_bottom = BUCKET_Y - FRUIT_W, BUCKET_Y + BUCKET_H
+
+        for i in range(n - 1, -1, -1):
+            if i >= len(store): break   # TNT da xoa sach vat roi
+
+            fy = ys[i]
+            iy = int(fy)
+            if catch_top < iy < catch_bottom:
+                if catcher is None: catcher = CatchSweep(self.players).catcher
+                slot = catcher(int(xs[i]))
+                if slot >= 0:
+                    fx = xs[i]; kind = kinds[i]
+                    self.add_squash(store.sprite[i], fx, fy)
+                    store.remove(i)
+                    if kind not in HARMLESS_MISS: self.caught[season] += 1
+                    self.handle_catch(slot, ITEM_TYPES[kind], fx, fy)
+                    continue
+
+            if fy > SCREEN_HEIGHT:
+                fx = xs[i]; kind = kinds[i]
+                store.remove(i)
+                if kind not in HARMLESS_MISS: self.missed[season] += 1
+                if self.game_mode == 1 and kind not in HARMLESS_MISS:
+                    self.play_sound("lost_life")
+                    self.players.lives[0] -= 1
+                    self.add_text("Miss!", fx, SCREEN_HEIGHT - 20, RED)
+
+    def draw_fruits(self, alpha=1.0):
+        store = self.created_fruits
+        sprites = self.sprites
+        xs, ys, sprite_ids = store.x, store.y, store.sprite
+        px, py, kinds, phases = store.prev_x, store.prev_y, store.kind, store.phase
+        cmds = self.queue.layer(LAYER_FRUITS)
+        append = cmds.append
+        # Khung hoat hinh lay tu cache (sprite_cache.py), khong transform moi frame
+        variant = self.sprite_variants.get
+        tick = self.tick_count
+        k = WORLD_SCALE     # toa do san choi -> px ve
+        pulse = PULSE_STEPS[tick % PULSE_TICKS]
+        for i in range(len(store)):
+            x = int((px[i] + (xs[i] - px[i]) * alpha) * k)
+            y = int((py[i] + (ys[i] - py[i]) * alpha) * k)
+            anim = ANIM[kinds[i]]
+            if anim == ANIM_SPIN:
+                img, dx, dy = variant(sprite_ids[i], spin_angle(phases[i], tick))
+            elif anim == ANIM_PULSE:
+                img, dx, dy = variant(sprite_ids[i], 0, pulse)
+            else:
+                append((sprites[sprite_ids[i]], (x, y)))
                 continue
+            append((img, (x + dx, y + dy)))
 
-            if f["y"] > SCREEN_HEIGHT:
-                if f in self.created_fruits: self.created_fruits.remove(f)
-                if self.game_mode == 1:
-                    is_bad = f["type"] in ["bomb", "boss_bomb", "poison", "tnt"]
-                    if not is_bad:
-                        if self.lost_life_sound: self.lost_life_sound.play()
-                        self.p1_lives -= 1
-                        self.floating_texts.add(FloatingText("Miss!", f["x"], 480, RED, self.font))
+        for sprite, x, y, start in self.squashes:
+            img, dx, dy = variant(sprite, 0, *squash_scale(tick - start))
+            # Giu day khung o day sprite goc (bep xuong mieng xo)
+            append((img, (int(x * k) + dx, int(y * k) + 2 * dy)))
 
     def update_boss(self):
         if not self.boss_active: return
         self.boss_x += 3 * self.boss_dir
         if self.boss_x > SCREEN_WIDTH - 80 or self.boss_x < 0: self.boss_dir *= -1
-        self.screen.blit(self.boss_img, (self.boss_x, 10))
         self.boss_hp -= 0.05
         if self.boss_hp <= 0:
             self.boss_active = False
             self.spawn_particles(self.boss_x + 40, 50, (255, 255, 255), 50)
-            self.floating_texts.add(FloatingText("BOSS DEFEATED!", SCREEN_WIDTH//2, 250, (255, 215, 0), self.header_font))
+            self.add_text("BOSS DEFEATED!", WORLD_CENTER_X, wy(0.50), (255, 215, 0), big=True)
+
+    def draw_boss(self, alpha=1.0):
+        if not self.boss_active: return
+        x = self.prev_boss_x + (self.boss_x - self.prev_boss_x) * alpha
+        self.queue.add(LAYER_BOSS, self.boss_img, (world_px(x), world_px(10)))
+
+    # =====================================================
+    # HIEU UNG CO THOI HAN
+    # Hieu ung cua nguoi choi: co trong PlayerTable (pl.shield[slot]...)
+    # Hieu ung chung (slot None): thuoc tinh Game.<ten>_active
+    # =====================================================
+    def set_effect_flag(self, name, slot, value):
+        if slot is None: setattr(self, f"{name}_active", bool(value))
+        else: getattr(self.players, name)[slot] = value
+
+    def start_effect(self, name, slot=None, duration=None, stack=False):
+        """
+        Bat hieu ung (lam moi neu dang chay, hoac cong don voi stack=True)
+        duration mac dinh lay tu EFFECT_DURATIONS
+        """
+        if duration is None: duration = EFFECT_DURATIONS[name]
+        self.set_effect_flag(name, slot, 1)
+        return self.effects.start((name, slot), self.ticks, duration, stack)
+
+    def winner(self):
+        """
+        Slot thang cuoc (-1 = hoa)
+        Co nguoi chet -> chi xet nguoi con song; sau do so diem
+        """
+        pl = self.players
+        slots = range(pl.count)
+        survivors = [i for i in slots if not pl.dead[i]]
+        if survivors and len(survivors) < pl.count: slots = survivors
+        best = max(pl.score[i] for i in slots)
+        leaders = [i for i in slots if pl.score[i] == best]
+        return leaders[0] if len(leaders) == 1 else -1
 
     def check_status(self):
-        if self.p1_lives <= 0: self.p1_dead = True
-        if self.p2_lives <= 0: self.p2_dead = True
-        
-        now = pygame.time.get_ticks()
+        pl = self.players
+        now = self.ticks
+        lives, dead = pl.lives, pl.dead
         
-        if self.p1_shield and now > self.p1_shield_time: self.p1_shield = False
-        if self.p2_shield and now > self.p2_shield_time: self.p2_shield = False
-        if self.p1_magnet and now > self.p1_magnet_time: self.p1_magnet = False
-        if self.p2_magnet and now > self.p2_magnet_time: self.p2_magnet = False
-        if self.p1_confused and now > self.p1_confused_time: self.p1_confused = False
-        if self.p2_confused and now > self.p2_confused_time: self.p2_confused = False
+        for i in range(pl.count):
+            if lives[i] <= 0: dead[i] = 1
 
-        if self.game_mode == 1:
-            if self.p1_dead: self.game_over = True
-        else:
-            if self.p1_dead or self.p2_dead:
-                self.game_over = True
+        # Hieu ung het han: chi lay tu dinh heap (effects.py)
+        for name, slot in self.effects.expire(now):
+            self.set_effect_flag(name, slot, 0)
+
+        # 1 nguoi: het mang la thua | nhieu nguoi: 1 nguoi het mang la ket thuc
+        if 1 in dead[:pl.count]:
+            self.game_over = True
+
+    # =====================================================
+    # TUA LAI / DIEM LUU (snapshot.py)
+    # =====================================================
+    def restore_state(self, data):
+        """
+        Quay ve 1 snapshot; replay dang ghi va lich su bi cat theo
+        """
+        load_state(self, data)
+        rec = self.recorder
+        if rec and (rec.seed != self.seed or rec.mode != self.game_mode
+                    or len(rec.inputs) < self.tick_count):
+            self.recorder = None    # snapshot cua van khac -> khong ghi tiep duoc
+        elif rec:
+            del rec.inputs[self.tick_count:]
+        if self.history is not None: self.history.truncate(self.tick_count)
+        self.floating_texts.empty()
+        self.particles.clear()
+        self.squashes.clear()
+        if self.renderer: self.renderer.invalidate()
+
+    def rewind(self, seconds=REWIND_SECONDS):
+        """
+        Tua lai ~seconds giay (toi da nhung gi con trong history)
+        """
+        if not self.history: return False
+        i = self.history.find(self.tick_count - int(seconds * FPS))
+        self.restore_state(self.history.get(i)[1])
+        return True
+
+    def handle_rewind_key(self, key):
+        # Backspace: tua lai (xem lai luc chet) | F5: luu diem | F9: ve diem luu
+        if key == pygame.K_F5:
+            self.save_point = save_state(self)
+            return
+        if key == pygame.K_BACKSPACE: restored = self.rewind()
+        elif self.save_point: self.restore_state(self.save_point); restored = True
+        else: restored = False
+        # Dung lai de nguoi choi kip nhin, bam P de choi tiep
+        if restored: self.paused = True
+
+    # =====================================================
+    # 1 TICK LOGIC (DUNG CHUNG CHO GAME THUONG VA HEADLESS)
+    # =====================================================
+    def step(self, inputs=0):
+        """
+        Chay 1 tick logic, khong ve va khong doi frame
+        inputs: bitmask INPUT_* cua ca 2 nguoi choi
+        Tra ve True neu game da ket thuc
+        """
+        if self.game_over: return True
+
+        # Vi tri truoc tick -> draw(alpha) noi suy giua 2 tick
+        self.created_fruits.save_positions()
+        self.players.prev_x[:] = self.players.x
+        self.prev_boss_x = self.boss_x
+
+        self.ticks += TICK_MS
+        self.tick_count += 1
+        lap = self.profiler.lap if self.profiler.active else None
+
+        self.update_boss()
+        if self.screen_shake > 0: self.screen_shake -= 1
+        # Ten pha "sim:*" (khac "draw:*" cua draw()) -> profiler tach rieng mo phong / ve
+        if lap: lap("sim:boss")
+
+        self.move_buckets(inputs)
+        if lap: lap("sim:buckets")
+        self.create_and_check_fruits()
+        if lap: lap("sim:fruits")
+        self.check_status()
+        if lap: lap("sim:status")
+
+        self.particles.update()
+        self.update_squashes()
+        if lap: lap("sim:particles")
+        self.floating_texts.update()
+        if lap: lap("sim:texts")
+
+        if self.history is not None:
+            self.history.push(self.tick_count, save_state(self))
+            if lap: lap("sim:snapshot")
+        return self.game_over
+
+    def simulate(self, policy=None, max_ticks=FPS * 60 * 10):
+        """
+        Chay 1 van headless den khi game over (hoac het max_ticks)
+        policy(game) -> bitmask input, None = dung yen
+        """
+        while self.tick_count < max_ticks:
+            inputs = policy(self) if policy else 0
+            if self.step(inputs): break
+        return self.game_over
+
+    # =====================================================
+    # VE 1 FRAME TU TRANG THAI HIEN TAI
+    # =====================================================
+    def draw_buckets(self, alpha=1.0):
+        pl = self.players
+        add = self.queue.add
+        for i in pl.alive():
+            x = pl.prev_x[i] + (pl.x[i] - pl.prev_x[i]) * alpha
+            shake_x = x + (self.fx_rng.randint(-5,5) if self.screen_shake>0 else 0)
+            shake_y = BUCKET_Y + (self.fx_rng.randint(-5,5) if self.screen_shake>0 else 0)
+            cx, cy = world_px(shake_x + 25), world_px(shake_y + 25)
+            add(LAYER_BUCKETS, self.bucket_imgs[i], (world_px(shake_x), world_px(shake_y)))
+            if pl.shield[i]:
+                # Vong khien dung mau cua nguoi choi ke tiep cho de phan biet
+                shield_color = PLAYER_COLORS[(i + 1) % max(2, pl.count)]
+                r = world_px(40)
+                add(LAYER_BUCKETS, ring_image(shield_color, r, 3), (cx - r, cy - r))
+            if pl.magnet[i]:
+                 r = world_px(45)
+                 add(LAYER_BUCKETS, ring_image((128, 0, 128), r, 1), (cx - r, cy - r))
+
+    def blit(self, img, pos):
+        # Ve ngay len man hinh va ghi lai vung bi ve (dirty rect)
+        # Ngoai draw() (tam dung...); trong draw() dung self.queue
+        rect = self.screen.blit(img, pos)
+        self.renderer.mark(rect)
+        return rect
+
+    def hud_blit(self, img, pos):
+        self.queue.add(LAYER_HUD, img, pos)
+
+    def draw(self, alpha=1.0):
+        """
+        Ve trang thai hien tai; alpha < 1 -> vi tri noi suy giua tick truoc
+        va tick hien tai (alpha = phan tick da troi qua, xem run())
+        """
+        lap = self.profiler.lap
+        bg = self.backgrounds[self.get_season()]
+        if self.renderer.begin_frame(bg):
+            self.draw_background()
+        lap("draw:background")
+        self.draw_boss(alpha)
+        lap("draw:boss")
+        self.draw_buckets(alpha)
+        lap("draw:buckets")
+        self.draw_fruits(alpha)
+        lap("draw:fruits")
+        self.queue.layer(LAYER_PARTICLES).extend(self.particles.commands(alpha))
+        lap("draw:particles")
+        self.queue.layer(LAYER_TEXT).extend((t.image, t.pos(alpha)) for t in self.floating_texts)
+        lap("draw:texts")
+        rtm_rect = self.display_hud()
+        lap("draw:hud")
+        self.renderer.mark_all(self.queue.flush(self.screen, self.renderer.enabled))
+        lap("draw:flush")
+        return rtm_rect
+
+    def draw_paused(self):
+        txt = render_text(self.header_font, "PAUSED", WHITE)
+        self.blit(txt, txt.get_rect(center=(CENTER_X, sy(0.50))))
+
+    def draw_profiler(self):
+        rect = self.profiler.draw_overlay(self.screen, get_font(ui(20)))
+        if rect: self.renderer.mark(rect)
+
+    def draw_hearts(self, lives, x, step):
+        # Hang tim: step > 0 ve sang phai, < 0 ve sang trai
+        for i in range(lives):
+            self.hud_blit(self.heart_img, (x + i * step, ui(40)))
 
     def display_hud(self):
+        pl = self.players
+        margin = ui(10)
         if self.game_mode == 1:
-            score_txt = f"Score: {self.p1_score} | Level: {self.level}"
-            self.screen.blit(self.font.render(score_txt, True, BLACK), (12,12))
-            self.screen.blit(self.font.render(score_txt, True, WHITE), (10,10))
-            for i in range(self.p1_lives):
-                self.screen.blit(self.heart_img, (10 + i*30, 40))
-        else:
-            c2 = COLOR_P2 if 'COLOR_P2' in globals() else CYAN
-            p2_txt = f"P2 (WASD): {self.p2_score}"
-            self.screen.blit(self.font.render(p2_txt, True, BLACK), (12, 12))
-            self.screen.blit(self.font.render(p2_txt, True, c2), (10, 10))
-            if not self.p2_dead:
-                for i in range(self.p2_lives):
-                    self.screen.blit(self.heart_img, (10 + i*30, 40))
+            score_txt = f"Score: {pl.score[0]} | Level: {self.level}"
+            self.hud_blit(render_text(self.font, score_txt, BLACK), (margin + 2, margin + 2))
+            self.hud_blit(render_text(self.font, score_txt, WHITE), (margin, margin))
+            self.draw_hearts(pl.lives[0], margin, ui(30))
+        elif self.game_mode == 2:
+            c2 = PLAYER_COLORS[1]
+            p2_txt = f"P2 (WASD): {pl.score[1]}"
+            self.hud_blit(render_text(self.font, p2_txt, BLACK), (margin + 2, margin + 2))
+            self.hud_blit(render_text(self.font, p2_txt, c2), (margin, margin))
+            if not pl.dead[1]:
+                self.draw_hearts(pl.lives[1], margin, ui(30))
             else:
-                self.screen.blit(self.font.render("DEAD", True, RED), (10, 40))
-
-            c1 = COLOR_P1 if 'COLOR_P1' in globals() else (255, 255, 0)
-            p1_txt = f"P1 (Arrows): {self.p1_score}"
-            txt_surf = self.font.render(p1_txt, True, c1)
-            w = txt_surf.get_width()
-            self.screen.blit(self.font.render(p1_txt, True, BLACK), (SCREEN_WIDTH - w - 48, 12))
-            self.screen.blit(txt_surf, (SCREEN_WIDTH - w - 50, 10))
-            if not self.p1_dead:
-                for i in range(self.p1_lives):
-                    self.screen.blit(self.heart_img, (SCREEN_WIDTH - 40 - i*30, 40))
+                self.hud_blit(render_text(self.font, "DEAD", RED), (margin, ui(40)))
+
+            c1 = PLAYER_COLORS[0]
+            p1_txt = f"P1 (Arrows): {pl.score[0]}"
+            txt_surf = render_text(self.font, p1_txt, c1)
+            right = RENDER_WIDTH - txt_surf.get_width() - ui(50)
+            self.hud_blit(render_text(self.font, p1_txt, BLACK), (right + 2, margin + 2))
+            self.hud_blit(txt_surf, (right, margin))
+            if not pl.dead[0]:
+                self.draw_hearts(pl.lives[0], RENDER_WIDTH - ui(40), -ui(30))
             else:
-                 self.screen.blit(self.font.render("DEAD", True, RED), (SCREEN_WIDTH - 80, 40))
+                 self.hud_blit(render_text(self.font, "DEAD", RED), (RENDER_WIDTH - ui(80), ui(40)))
 
-            lvl = self.font.render(f"LVL {self.level}", True, WHITE)
-            self.screen.blit(lvl, (SCREEN_WIDTH//2 - 20, 10))
+            lvl = render_text(self.font, f"LVL {self.level}", WHITE)
+            self.hud_blit(lvl, (CENTER_X - ui(20), margin))
+        else:
+            # > 2 nguoi: moi nguoi 1 cot "Pn: diem" + so mang (chu nho)
+            col_w = (RENDER_WIDTH - ui(60)) // pl.count
+            small = get_font(ui(22))
+            for i in range(pl.count):
+                x = margin + i * col_w
+                txt = f"P{i + 1}: {pl.score[i]}"
+                self.hud_blit(render_text(small, txt, BLACK), (x + 1, margin + 1))
+                self.hud_blit(render_text(small, txt, PLAYER_COLORS[i]), (x, margin))
+                status = "DEAD" if pl.dead[i] else f"x{pl.lives[i]}"
+                self.hud_blit(render_text(small, status, RED if pl.dead[i] else WHITE), (x, ui(30)))
+
+            lvl = render_text(self.font, f"LVL {self.level}", WHITE)
+            self.hud_blit(lvl, (CENTER_X - ui(20), ui(60)))
         
         if self.freeze_active:
-             self.screen.blit(self.item_freeze_img, (SCREEN_WIDTH//2 - 20, 40))
+             img = self.item_freeze_img
+             self.hud_blit(img, (CENTER_X - img.get_width() // 2, ui(40)))
 
-        self.screen.blit(self.return_img, (660, 10))
-        return pygame.Rect(660, 10, 30, 30)
+        self.hud_blit(self.return_img, RETURN_RECT)
+        return RETURN_RECT
 
-    def display_game_over(self):
-        s = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    def blit_centered(self, surf, y):
+        # Can giua theo chieu ngang, y = mep tren
+        self.screen.blit(surf, (CENTER_X - surf.get_width() // 2, y))
+
+    def display_game_over(self, hovered=None):
+        s = pygame.Surface((RENDER_WIDTH, RENDER_HEIGHT))
         s.set_alpha(200); s.fill(BLACK)
         self.screen.blit(s, (0,0))
 
-        self.screen.blit(self.header_font.render("GAME OVER", True, WHITE), (220, 50))
+        self.blit_centered(render_text(self.header_font, "GAME OVER", WHITE), sy(0.10))
         
         if self.game_mode == 1:
-            score_txt = f"Score: {self.p1_score}"
-            if self.p1_score > self.highest_score: self.highest_score = self.p1_score
+            score_txt = f"Score: {self.players.score[0]}"
             high_txt = f"High Score: {self.highest_score}"
             
-            self.screen.blit(self.font.render(score_txt, True, WHITE), (300, 150))
-            self.screen.blit(self.font.render(high_txt, True, WHITE), (280, 200))
+            self.blit_centered(render_text(self.font, score_txt, WHITE), sy(0.30))
+            self.blit_centered(render_text(self.font, high_txt, WHITE), sy(0.40))
         else:
-            p1_res = f"Player 1: {self.p1_score}"
-            p2_res = f"Player 2: {self.p2_score}"
-            c1 = COLOR_P1 if 'COLOR_P1' in globals() else (255, 255, 0)
-            c2 = COLOR_P2 if 'COLOR_P2' in globals() else CYAN
-
-            if self.p1_dead and not self.p2_dead:
-                winner = "PLAYER 2 WINS!"; win_col = c2
-            elif self.p2_dead and not self.p1_dead:
-                winner = "PLAYER 1 WINS!"; win_col = c1
+            pl = self.players
+            slot = self.winner()
+            if slot >= 0:
+                winner = f"PLAYER {slot + 1} WINS!"; win_col = PLAYER_COLORS[slot]
             else:
-                if self.p1_score > self.p2_score: winner = "PLAYER 1 WINS!"; win_col = c1
-                elif self.p2_score > self.p1_score: winner = "PLAYER 2 WINS!"; win_col = c2
-                else: winner = "DRAW!"; win_col = WHITE
+                winner = "DRAW!"; win_col = WHITE
                 
-            self.screen.blit(self.header_font.render(winner, True, win_col), (180, 130))
-            self.screen.blit(self.font.render(p1_res, True, c1), (200, 200))
-            self.screen.blit(self.font.render(p2_res, True, c2), (400, 200))
-
-        res_rect = pygame.Rect(300, 300, 100, 50)
-        pygame.draw.rect(self.screen, BLUE_BTN, res_rect)
-        self.screen.blit(self.font.render("Restart", True, WHITE), (315, 315))
-        
-        quit_rect = pygame.Rect(300, 370, 100, 50)
-        pygame.draw.rect(self.screen, BLUE_BTN, quit_rect)
-        self.screen.blit(self.font.render("Quit", True, WHITE), (328, 385))
+            self.blit_centered(render_text(self.header_font, winner, win_col), sy(0.26))
+            if pl.count == 2:
+                self.screen.blit(render_text(self.font, f"Player 1: {pl.score[0]}", PLAYER_COLORS[0]), (CENTER_X - ui(150), sy(0.40)))
+                self.screen.blit(render_text(self.font, f"Player 2: {pl.score[1]}", PLAYER_COLORS[1]), (CENTER_X + ui(50), sy(0.40)))
+            else:
+                col_w = RENDER_WIDTH // pl.count
+                for i in range(pl.count):
+                    res = render_text(get_font(ui(22)), f"P{i + 1}: {pl.score[i]}", PLAYER_COLORS[i])
+                    self.screen.blit(res, (i * col_w + ui(10), sy(0.40)))
+
+        res_rect, quit_rect, rtm_rect = self.game_over_rects()
+        self.draw_button(res_rect, BLUE_BTN, "Restart", hovered == 0)
+        self.draw_button(quit_rect, BLUE_BTN, "Quit", hovered == 1)
         
-        self.screen.blit(self.return_img, (660, 10))
-        return res_rect, quit_rect, pygame.Rect(660, 10, 30, 30)
+        self.screen.blit(self.return_img, rtm_rect)
+        return res_rect, quit_rect, rtm_rect
+
+    @staticmethod
+    def game_over_rects():
+        # Restart, Quit, ve menu
+        return GAME_OVER_BUTTONS + (RETURN_RECT,)
+
+    def draw_button(self, rect, color, text, hovered=False, border_radius=0):
+        if hovered: color = tuple(min(255, c + 40) for c in color)
+        pygame.draw.rect(self.screen, color, rect, border_radius=border_radius)
+        txt = render_text(self.font, text, WHITE)
+        self.screen.blit(txt, txt.get_rect(center=rect.center))
+
+    def leaderboards(self):
+        """
+        [(tieu de, cac dong)] top hom nay cua 1P va che do nhieu nguoi
+        Doc DB 1 lan khi vao man hinh chinh, khong doc moi lan ve
+        """
+        if not self.scores: return []
+        day = today()
+        boards = []
+        for mode in (1, self.multi_players):
+            lines = []
+            for rank, (score, slot, _, _) in enumerate(self.scores.top(mode, day=day), 1):
+                lines.append(f"{rank}. {score}" if mode == 1 else f"{rank}. P{slot + 1}  {score}")
+            boards.append((f"TOP {mode}P TODAY", lines))
+        return boards
+
+    def draw_leaderboards(self, boards):
+        small = get_font(ui(22))
+        for (title, lines), (x, y) in zip(boards, LEADERBOARD_POS):
+            for i, (text, color) in enumerate([(title, YELLOW)] + [(l, WHITE) for l in lines or ["-"]]):
+                ty = y + i * ui(22)
+                self.screen.blit(render_text(small, text, BLACK), (x + 1, ty + 1))
+                self.screen.blit(render_text(small, text, color), (x, ty))
 
+    # =====================================================
+    # MAN HINH TINH: chi ve lai khi co thay doi, con lai ngu
+    # trong FramePacer.events() (xem pacing.py)
+    # =====================================================
     def show_start_screen(self):
-        while True:
-            self.draw_background()
-            self.screen.blit(self.logo_img, (10, SCREEN_HEIGHT - 110))
-            title = self.header_font.render("FRUIT CATCHER", True, WHITE)
-            self.screen.blit(title, (SCREEN_WIDTH//2 - 150, 80))
-
-            btn_1p = pygame.Rect(250, 200, 200, 50)
-            pygame.draw.rect(self.screen, BLUE_BTN, btn_1p, border_radius=10)
-            self.screen.blit(self.font.render("1 Player", True, WHITE), (305, 215))
-
-            btn_2p = pygame.Rect(250, 270, 200, 50)
-            pygame.draw.rect(self.screen, (255, 140, 0), btn_2p, border_radius=10)
-            self.screen.blit(self.font.render("2 Players", True, WHITE), (300, 285))
-
-            btn_rules = pygame.Rect(250, 340, 200, 50)
-            pygame.draw.rect(self.screen, (100, 100, 100), btn_rules, border_radius=10)
-            self.screen.blit(self.font.render("Rules", True, WHITE), (320, 355))
-
-            vol_rect = pygame.Rect(650, 10, 30, 30)
-            if not self.is_mute: self.screen.blit(self.volume_img, (650, 10))
-            else: self.screen.blit(self.mute_img, (650, 10))
+        pacer = self.pacer
+        btn_1p, btn_2p, btn_rules = MENU_BUTTONS
+        vol_rect = VOLUME_RECT
+        boards = self.leaderboards()
+        pacer.invalidate()
 
-            for event in pygame.event.get():
+        while True:
+            hovered = pacer.track_hover((btn_1p, btn_2p, btn_rules))
+            if pacer.dirty:
+                self.draw_background()
+                self.screen.blit(self.logo_img, (ui(10), RENDER_HEIGHT - ui(110)))
+                title = render_text(self.header_font, "FRUIT CATCHER", WHITE)
+                self.blit_centered(title, sy(0.16))
+
+                self.draw_button(btn_1p, BLUE_BTN, "1 Player", hovered == 0, 10)
+                label = f"{self.multi_players} Players"
+                self.draw_button(btn_2p, (255, 140, 0), label, hovered == 1, 10)
+                self.draw_button(btn_rules, (100, 100, 100), "Rules", hovered == 2, 10)
+                self.draw_leaderboards(boards)
+
+                if not self.is_mute: self.screen.blit(self.volume_img, vol_rect)
+                else: self.screen.blit(self.mute_img, vol_rect)
+                pygame.display.update()
+                pacer.drawn()
+
+            for event in pacer.events():
                 if event.type == pygame.QUIT: pygame.quit(); quit()
                 if event.type == pygame.MOUSEBUTTONDOWN:
                     if btn_1p.collidepoint(event.pos): return 1
-                    if btn_2p.collidepoint(event.pos): return 2
-                    if btn_rules.collidepoint(event.pos): self.show_rules_screen()
+                    if btn_2p.collidepoint(event.pos): return self.multi_players
+                    if btn_rules.collidepoint(event.pos):
+                        self.show_rules_screen()
+                        boards = self.leaderboards()
+                        pacer.invalidate()
                     if vol_rect.collidepoint(event.pos):
                         self.is_mute = not self.is_mute
-                        if self.is_mute: pygame.mixer.music.stop()
-                        elif self.music_loaded: pygame.mixer.music.play(-1)
-            pygame.display.update()
+                        pacer.invalidate()
+                        if self.is_mute: self.audio.stop_music()
+                        else: self.audio.play_music()
+            pacer.tick()
 
     def show_rules_screen(self):
+        pacer = self.pacer
+        back_rect = RULES_BACK_RECT
+        pacer.invalidate()
+
         while True:
-            self.draw_background()
-            s = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-            s.set_alpha(180); s.fill(BLACK)
-            self.screen.blit(s, (0,0))
-            self.screen.blit(self.header_font.render("Rules", True, WHITE), (270, 30))
-            
-            for i, rule in enumerate(RULES_TEXT):
-                self.screen.blit(self.font.render(rule, True, WHITE), (50, 100 + i*35))
+            hovered = pacer.track_hover((back_rect,))
+            if pacer.dirty:
+                self.draw_background()
+                s = pygame.Surface((RENDER_WIDTH, RENDER_HEIGHT))
+                s.set_alpha(180); s.fill(BLACK)
+                self.screen.blit(s, (0,0))
+                self.blit_centered(render_text(self.header_font, "Rules", WHITE), sy(0.06))
                 
-            back_rect = pygame.Rect(300, 420, 100, 50)
-            pygame.draw.rect(self.screen, BLUE_BTN, back_rect)
-            self.screen.blit(self.font.render("Back", True, WHITE), (322, 432))
+                for i, rule in enumerate(RULES_TEXT):
+                    self.screen.blit(render_text(self.font, rule, WHITE), (ui(50), sy(0.20) + i * ui(35)))
+                    
+                self.draw_button(back_rect, BLUE_BTN, "Back", hovered == 0)
+                pygame.display.update()
+                pacer.drawn()
             
-            for event in pygame.event.get():
+            for event in pacer.events():
                 if event.type == pygame.QUIT: pygame.quit(); quit()
                 if event.type == pygame.MOUSEBUTTONDOWN:
                     if back_rect.collidepoint(event.pos): return
-            pygame.display.update()
+            pacer.tick()
+
+    def save_recording(self):
+        if not self.recorder: return
+        name = time.strftime("replay_%Y%m%d_%H%M%S") + f"_{self.seed}.fcr"
+        self.recorder.save(os.path.join(self.record_dir, name), self)
+        self.recorder = None
+
+    def save_scores(self):
+        """
+        Goi 1 lan khi van ket thuc; ghi DB o luong nen (scores.py)
+        """
+        if self.scores_saved: return   # van da tua lai sau khi ket thuc
+        self.scores_saved = True
+        score = self.players.score[0]
+        if self.game_mode == 1 and score > self.highest_score:
+            self.highest_score = score
+        if self.scores: self.scores.submit(game_records(self))
+
+    def playing(self):
+        return not (self.game_over or self.paused or self.return_to_menu)
+
+    def handle_events(self, events):
+        """
+        Xu ly event cua vong lap game (phim nguoi choi -> self.input)
+        """
+        self.input.pump(events)
+        pacer = self.pacer
+        for event in events:
+            if event.type == pygame.QUIT:
+                pygame.quit(); quit()
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                self.profiler.toggle()
+                self.renderer.invalidate()
+                pacer.invalidate()
+            if event.type == pygame.KEYDOWN and event.key in (pygame.K_p, pygame.K_ESCAPE):
+                if not self.game_over: self.paused = not self.paused
+                pacer.invalidate()
+            if event.type == pygame.KEYDOWN and event.key in (pygame.K_BACKSPACE, pygame.K_F5, pygame.K_F9):
+                self.handle_rewind_key(event.key)
+                pacer.invalidate()
+            if event.type == pygame.WINDOWFOCUSLOST:
+                self.input.clear()  # KEYUP luc mat focus se khong toi
+                if not self.game_over and not self.paused:
+                    self.paused = True
+                    pacer.invalidate()
+            if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                if self.game_over:
+                    res, qui, rtm = self.game_over_rects()
+                    if res.collidepoint(event.pos): self.reset_game(self.game_mode)
+                    if qui.collidepoint(event.pos): pygame.quit(); quit()
+                    if rtm.collidepoint(event.pos): self.return_to_menu = True
+                elif not self.paused and RETURN_RECT.collidepoint(event.pos):
+                    self.save_recording()
+                    self.return_to_menu = True
 
     def run(self):
-        if not self.is_mute and self.music_loaded:
-            pygame.mixer.music.play(-1)
+        self.load_sounds()
+        if not self.is_mute: self.audio.play_music()
         
+        prof = self.profiler
+        pacer = self.pacer
+        # Fixed timestep: thoi gian that don vao lag, moi TICK_MS chay 1 step
+        lag = 0.0
+        last_time = None
         while True:
+            frame_drawn = False
+            idle = False    # man hinh tinh -> ngu cho event thay vi chay 60 FPS
+            prof.begin_frame()
             if self.return_to_menu:
                 selected_mode = self.show_start_screen() 
                 self.reset_game(selected_mode)
                 self.return_to_menu = False
+                self.input.clear()  # event phim luc o menu da bi menu lay mat
+                last_time = None
             
-            elif not self.game_over:
-                self.draw_background()
-                self.update_boss()
-
-                if not self.p1_dead:
-                    shake_x = self.p1_x + (random.randint(-5,5) if self.screen_shake>0 else 0)
-                    shake_y = 450 + (random.randint(-5,5) if self.screen_shake>0 else 0)
-                    self.screen.blit(self.bucket_p1_img, (shake_x, shake_y))
-                    if self.p1_shield:
-                        c1_shield = COLOR_P2 if 'COLOR_P2' in globals() else CYAN
-                        pygame.draw.circle(self.screen, c1_shield, (int(shake_x + 25), int(shake_y + 25)), 40, 3)
-                    if self.p1_magnet:
-                         pygame.draw.circle(self.screen, (128, 0, 128), (int(shake_x + 25), int(shake_y + 25)), 45, 1)
-
-                if self.game_mode == 2 and not self.p2_dead:
-                    shake_x = self.p2_x + (random.randint(-5,5) if self.screen_shake>0 else 0)
-                    shake_y = 450 + (random.randint(-5,5) if self.screen_shake>0 else 0)
-                    self.screen.blit(self.bucket_p2_img, (shake_x, shake_y))
-                    if self.p2_shield:
-                        c2_shield = COLOR_P1 if 'COLOR_P1' in globals() else MAGENTA
-                        pygame.draw.circle(self.screen, c2_shield, (int(shake_x + 25), int(shake_y + 25)), 40, 3)
-                    if self.p2_magnet:
-                         pygame.draw.circle(self.screen, (128, 0, 128), (int(shake_x + 25), int(shake_y + 25)), 45, 1)
-                
-                if self.screen_shake > 0: self.screen_shake -= 1
-
-                self.move_buckets()
-                self.create_and_check_fruits()
-                self.check_status()
-                
-                self.particles.update()
-                self.particles.draw(self.screen)
-                self.floating_texts.update()
-                self.floating_texts.draw(self.screen)
-                
-                rtm_rect = self.display_hud()
-                
-                if pygame.mouse.get_pressed()[0]:
-                    if rtm_rect.collidepoint(pygame.mouse.get_pos()):
-                        self.return_to_menu = True
+            elif not self.game_over and not self.paused:
+                now = time.perf_counter()
+                if last_time is not None: lag += (now - last_time) * 1000
+                last_time = now
+                lag = min(lag, TICK_MS * MAX_STEPS_PER_FRAME)
+
+                # Rut event o dau moi tick: phim nhan giua 2 tick vao ngay tick ke
+                self.handle_events(pygame.event.get())
+                prof.lap("input")
+                first = True
+                while lag >= TICK_MS and self.playing():
+                    if not first:
+                        self.handle_events(pygame.event.get())
+                        if not self.playing(): break
+                    first = False
+                    lag -= TICK_MS
+                    inputs = self.input.tick_inputs() | self.bot_inputs()
+                    if self.recorder: self.recorder.record(inputs)
+                    if self.step(inputs):
+                        self.save_recording()
+                        self.save_scores()
+                prof.lap("sim:loop")
+                self.draw(lag / TICK_MS if not self.game_over else 1.0)
+                self.draw_profiler()
+                pacer.invalidate()  # lan dung / game over tiep theo phai ve lai
+                # Day frame len ngay sau khi ve (ngu cho FPS sau) -> input moi nhat
+                # len man hinh som nhat co the
+                self.renderer.present()
+                prof.lap("flip")
+                for slot, ms in self.input.presented(): prof.sample(f"input lag P{slot + 1}", ms)
+                frame_drawn = True
 
             else:
-                res, qui, rtm = self.display_game_over()
-                if pygame.mouse.get_pressed()[0]:
-                    pos = pygame.mouse.get_pos()
-                    if res.collidepoint(pos): self.reset_game(self.game_mode)
-                    if qui.collidepoint(pos): pygame.quit(); quit()
-                    if rtm.collidepoint(pos): self.return_to_menu = True
-
-            self.clock.tick(60) 
-            pygame.display.update()
-            
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit(); quit()
+                # Tam dung / game over: ve lai khi doi hover hoac vua chuyen trang thai
+                idle = True
+                last_time = None    # tiep tuc choi khong chay bu thoi gian dung
+                hovered = None if self.paused else pacer.track_hover(self.game_over_rects()[:2])
+                if pacer.dirty:
+                    self.renderer.invalidate()
+                    self.draw()
+                    if self.paused: self.draw_paused()
+                    else: self.display_game_over(hovered)
+                    self.draw_profiler()
+                    pygame.display.update()
+                    pacer.drawn()
+
+            pacer.tick(RENDER_FPS if frame_drawn else None)
+            prof.lap("wait")
+            if idle:
+                self.handle_events(pacer.events())
+                if self.paused or self.game_over: self.input.settle()
+            prof.lap("events")
+            prof.end_frame({
+                "fruits": len(self.created_fruits),
+                "particles": len(self.particles),
+                "texts": len(self.floating_texts),
+                "frames": len(self.sprite_variants),
+            })
 
 if __name__ == "__main__":
+    n_players = int(sys.argv[sys.argv.index("--players") + 1]) if "--players" in sys.argv else 2
+    n_bots = int(sys.argv[sys.argv.index("--bots") + 1]) if "--bots" in sys.argv else 0
+    if not 1 <= n_players <= MAX_PLAYERS:
+        sys.exit(f"--players must be between 1 and {MAX_PLAYERS}")
+    if not 0 <= n_bots <= n_players:
+        sys.exit("--bots must be between 0 and --players")
     game = Game()
+    game.multi_players = n_players
+    # K nguoi choi cuoi cung do bot dieu khien
+    game.bots = {slot: chase_bot for slot in range(n_players - n_bots, n_players)}
+    if "--record" in sys.argv:
+        game.record_dir = sys.argv[sys.argv.index("--record") + 1]
+    if "--profile" in sys.argv or "--trace" in sys.argv:
+        trace = sys.argv[sys.argv.index("--trace") + 1] if "--trace" in sys.argv else None
+        game.profiler = FrameProfiler(enabled="--profile" in sys.argv, trace_path=trace)
+    if "--startup-report" in sys.argv:
+        game.load_sounds()
+        game.font; game.header_font
+        print(startup_report())
     game.run()
\ No newline at end of file
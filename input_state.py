@@ -0,0 +1,104 @@
+# =========================================================
+# FILE: input_state.py
+# MO TA:
+# Input ban phim theo event (khong doc key.get_pressed moi frame):
+# - Game.run rut event o dau MOI tick -> pump() cap nhat trang
+#   thai tung nguoi choi, kem thoi diem nhan / nha cua tung slot
+#   (lay tu timestamp cua event neu pygame co, khong thi luc rut)
+# - tick_inputs(): bitmask cho 1 tick = phim dang giu + phim vua
+#   nhan roi nha giua 2 tick (nhan nhanh khong bi mat);
+#   edges = (canh nhan, canh nha) cua tick do
+# - Do do tre input -> man hinh theo tung nguoi choi: thoi diem
+#   phim doi trang thai den lan present dau tien sau tick da
+#   dung input do
+# =========================================================
+
+import time
+
+import pygame
+from settings import *
+from players import input_bits
+
+def event_time(event, now, sdl_now):
+    """
+    Thoi diem (perf_counter, s) xay ra event; event khong co timestamp -> now
+    sdl_now: pygame.time.get_ticks() doc cung luc voi now (cung goc voi timestamp)
+    """
+    stamp = getattr(event, "timestamp", None)
+    if not stamp: return now
+    return now - max(0, sdl_now - stamp) / 1000
+
+class InputState:
+    def __init__(self, key_map=PLAYER_KEYS):
+        # phim pygame -> (slot, bit trong bitmask)
+        self.keys = {}
+        for slot, names in enumerate(key_map):
+            for name, bit in zip(names, input_bits(slot)):
+                self.keys[getattr(pygame, name)] = (slot, bit)
+        self.clear()
+
+    def clear(self):
+        """
+        Tha het phim (doi man, mat focus, van moi)
+        """
+        self.held = 0           # bit dang giu
+        self.pressed = 0        # bit vua nhan tu tick truoc (canh len)
+        self.released = 0       # bit vua nha tu tick truoc (canh xuong)
+        self.edges = (0, 0)     # (pressed, released) cua tick gan nhat
+        self.changed_at = {}    # slot -> thoi diem doi trang thai gan nhat (s)
+        self.pending = {}       # slot -> thoi diem doi trang thai som nhat chua vao tick
+        self.applied = []       # (slot, thoi diem) da vao tick, cho present
+
+    def pump(self, events):
+        """
+        Cap nhat tu danh sach event (bo qua event khong phai phim nguoi choi)
+        """
+        now = time.perf_counter()
+        sdl_now = pygame.time.get_ticks()
+        for event in events:
+            if event.type not in (pygame.KEYDOWN, pygame.KEYUP): continue
+            hit = self.keys.get(event.key)
+            if hit is None: continue
+            slot, bit = hit
+            if event.type == pygame.KEYDOWN:
+                if self.held & bit: continue    # phim lap
+                self.held |= bit
+                self.pressed |= bit
+            else:
+                if not self.held & bit: continue
+                self.held &= ~bit
+                self.released |= bit
+            t = event_time(event, now, sdl_now)
+            self.changed_at[slot] = t
+            self.pending.setdefault(slot, t)
+
+    def settle(self):
+        """
+        Bo canh + do tre tich luy luc game dung (tam dung...), giu phim dang giu
+        """
+        self.pressed = self.released = 0
+        self.pending.clear()
+        self.applied.clear()
+
+    def tick_inputs(self):
+        """
+        Bitmask cho tick sap chay; phim nhan + nha truoc tick van tinh 1 tick
+        """
+        inputs = self.held | self.pressed
+        self.edges = (self.pressed, self.released)
+        self.pressed = self.released = 0
+        if self.pending:
+            self.applied += self.pending.items()
+            self.pending.clear()
+        return inputs
+
+    def presented(self):
+        """
+        Goi ngay sau khi day frame len man hinh -> [(slot, do tre ms)] cua cac
+        thay doi input da hien ra trong frame nay
+        """
+        if not self.applied: return []
+        now = time.perf_counter()
+        latencies = [(slot, (now - t) * 1000) for slot, t in self.applied]
+        self.applied.clear()
+        return latencies
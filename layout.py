@@ -0,0 +1,73 @@
+# =========================================================
+# FILE: layout.py
+# MO TA:
+# Bo cuc giao dien tinh theo do phan giai ve noi bo
+# (RENDER_WIDTH x RENDER_HEIGHT), khong dung toa do co dinh:
+# - Vi tri theo ti le man hinh (sy) hoac can giua / can phai
+# - Kich thuoc nut, co chu nhan UI_SCALE (700x500 = 1.0)
+# - San choi (SCREEN_WIDTH x SCREEN_HEIGHT, toa do mo phong)
+#   nhan WORLD_SCALE khi ve (world_px); vi tri chu noi do mo
+#   phong tao tinh theo san choi (wy)
+# Ve len man hinh that (phong to / toan man hinh) xem
+# DISPLAY_MODE trong settings.py va pacing.create_window
+# =========================================================
+
+import pygame
+from settings import *
+
+# Bo cuc goc thiet ke cho 700x500
+UI_SCALE = RENDER_HEIGHT / 500
+CENTER_X = RENDER_WIDTH // 2
+# Toa do san choi -> px ve
+WORLD_SCALE = RENDER_HEIGHT / SCREEN_HEIGHT
+WORLD_CENTER_X = SCREEN_WIDTH // 2
+
+def ui(px):
+    """
+    Kich thuoc thiet ke (px o 700x500) -> px logic
+    """
+    return round(px * UI_SCALE)
+
+def sy(frac):
+    """
+    Toa do y theo ti le chieu cao man hinh
+    """
+    return int(RENDER_HEIGHT * frac)
+
+def wy(frac):
+    """
+    Toa do y theo ti le chieu cao san choi (chu noi do mo phong tao)
+    """
+    return int(SCREEN_HEIGHT * frac)
+
+def world_px(v):
+    """
+    Toa do / do dai san choi -> px ve
+    """
+    return int(v * WORLD_SCALE)
+
+def world_size(w, h):
+    # Kich thuoc sprite gameplay o do phan giai ve
+    return max(1, round(w * WORLD_SCALE)), max(1, round(h * WORLD_SCALE))
+
+def centered_rect(w, h, y):
+    return pygame.Rect(CENTER_X - w // 2, y, w, h)
+
+def corner_rect(right):
+    """
+    O vuong icon goc tren ben phai, mep phai cach le 'right' px
+    """
+    size = ui(30)
+    return pygame.Rect(RENDER_WIDTH - right, ui(10), size, size)
+
+# Cac Rect duoi day dung chung -> chi doc, khong sua tai cho
+# --- Man hinh chinh ---
+MENU_BUTTONS = tuple(centered_rect(ui(200), ui(50), sy(y)) for y in (0.40, 0.54, 0.68))
+VOLUME_RECT = corner_rect(ui(50))
+# Bang xep hang 2 ben nut menu: (x trai, y tren) moi bang
+LEADERBOARD_POS = ((ui(20), sy(0.40)), (RENDER_WIDTH - ui(200), sy(0.40)))
+# --- Trong game / game over ---
+RETURN_RECT = corner_rect(ui(40))
+GAME_OVER_BUTTONS = tuple(centered_rect(ui(100), ui(50), sy(y)) for y in (0.60, 0.74))
+# --- Luat choi ---
+RULES_BACK_RECT = centered_rect(ui(100), ui(50), sy(0.84))
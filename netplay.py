@@ -0,0 +1,609 @@
+# =========================================================
+# FILE: netplay.py
+# MO TA:
+# Choi qua mang (UDP + asyncio), server giu trang thai that:
+# - Server: moi phong (room) 1 Game headless, chay tick co dinh,
+#   gom input cua client -> step -> gui snapshot
+# - Snapshot = trang thai nhi phan gon (vat roi, xo, mang, boss)
+#   XOR voi snapshot client da ack roi nen zlib -> it bang thong
+# - Client gui input bitmask (kem 3 input truoc de chong mat goi)
+#   va tu du doan xo cua minh, sua lai khi co snapshot moi
+#
+# Server:    python netplay.py serve [--port 47800] [--players 2]
+# Client:    python netplay.py join HOST[:PORT] [--room 1]
+# Loopback:  python netplay.py loopback --latency 80 --loss 0.05
+# =========================================================
+
+import argparse
+import asyncio
+import os
+import random
+import struct
+import sys
+import time
+import zlib
+from array import array
+from collections import deque
+
+from settings import *
+from players import MAX_PLAYERS, step_bucket, chase_bot
+
+NET_PORT = 47800
+SNAPSHOT_EVERY = 2          # gui snapshot moi N tick (60 / 2 = 30 Hz)
+SNAPSHOT_HISTORY = 64       # so snapshot giu lai lam moc delta
+INPUT_REDUNDANCY = 4        # so input gan nhat gui kem moi goi (2 bit / input)
+MAX_INPUT_QUEUE = 8         # client gui nhanh hon server -> bo bot input cu
+CLIENT_TIMEOUT = 5.0        # giay khong nhan goi -> giai phong slot
+RESTART_DELAY = 3 * FPS     # tick cho sau game over roi choi van moi
+JOIN_RETRY = 0.5
+MAX_ROOMS = 64              # moi phong giu 1 Game headless -> gioi han bo nho server
+
+# -------- GOI TIN --------
+MSG_JOIN = 1        # client -> server: xin vao phong
+MSG_WELCOME = 2     # server -> client: slot duoc cap
+MSG_INPUT = 3       # client -> server: input + ack snapshot
+MSG_SNAPSHOT = 4    # server -> client: snapshot (delta)
+
+JOIN = struct.Struct("<BH")             # type, room
+WELCOME = struct.Struct("<BBB")         # type, slot (255 = day), so nguoi choi
+INPUT = struct.Struct("<BIBI")          # type, seq moi nhat, 4 input x 2 bit, snapshot da ack
+SNAPSHOT = struct.Struct("<BIII")       # type, snapshot id, moc delta (0 = day du), seq input da xu ly
+ROOM_FULL = 255
+
+# -------- TRANG THAI --------
+# tick, level, co (game_over | boss | freeze), so nguoi choi, boss_x, boss_hp, so vat roi
+STATE_HEAD = struct.Struct("<IHBBhHH")
+# x * 8, velocity * 256, mang, diem, co (dead | shield | magnet | confused)
+PLAYER_REC = struct.Struct("<HhBHB")
+X_SCALE = 8
+VEL_SCALE = 256
+
+# =========================================================
+# MA HOA TRANG THAI
+# =========================================================
+def encode_state(game):
+    """
+    Trang thai can ve 1 frame -> bytes
+    Vat roi luu theo cot (x..., y..., kind..., sprite...) de XOR voi
+    snapshot truoc ra nhieu byte 0 hon
+    """
+    pl = game.players
+    store = game.created_fruits
+    flags = game.game_over | game.boss_active << 1 | game.freeze_active << 2
+    out = bytearray(STATE_HEAD.pack(
+        game.tick_count, game.level, flags, pl.count,
+        int(game.boss_x), max(0, int(game.boss_hp)), len(store)))
+    for i in range(pl.count):
+        pflags = pl.dead[i] | pl.shield[i] << 1 | pl.magnet[i] << 2 | pl.confused[i] << 3
+        out += PLAYER_REC.pack(int(pl.x[i] * X_SCALE), int(pl.velocity[i] * VEL_SCALE),
+                               max(0, pl.lives[i]), pl.score[i], pflags)
+    out += array("h", map(int, store.x)).tobytes()
+    out += array("h", map(int, store.y)).tobytes()
+    out += store.kind.tobytes()
+    out += array("B", store.sprite).tobytes()
+    out += store.phase.tobytes()
+    return bytes(out)
+
+def apply_state(game, data):
+    """
+    Ghi trang thai nhan duoc vao 1 Game (chi de ve, khong step)
+    """
+    tick, level, flags, count, boss_x, boss_hp, n = STATE_HEAD.unpack_from(data, 0)
+    if game.players.count != count or game.game_mode != count:
+        game.reset_game(count)
+    game.tick_count = tick
+    game.ticks = tick * TICK_MS
+    game.level = level
+    game.game_over = bool(flags & 1)
+    game.boss_active = bool(flags & 2)
+    game.freeze_active = bool(flags & 4)
+    game.boss_x = boss_x
+    game.boss_hp = boss_hp
+
+    pl = game.players
+    offset = STATE_HEAD.size
+    for i in range(count):
+        x, vel, lives, score, pflags = PLAYER_REC.unpack_from(data, offset)
+        offset += PLAYER_REC.size
+        pl.x[i] = x / X_SCALE
+        pl.velocity[i] = vel / VEL_SCALE
+        pl.lives[i] = lives
+        pl.score[i] = score
+        pl.dead[i] = pflags & 1
+        pl.shield[i] = pflags >> 1 & 1
+        pl.magnet[i] = pflags >> 2 & 1
+        pl.confused[i] = pflags >> 3 & 1
+
+    store = game.created_fruits
+    store.clear()
+    store.x.fromlist(array("h", data[offset:offset + 2 * n]).tolist())
+    store.y.fromlist(array("h", data[offset + 2 * n:offset + 4 * n]).tolist())
+    store.kind.frombytes(data[offset + 4 * n:offset + 5 * n])
+    store.sprite.extend(data[offset + 5 * n:offset + 6 * n])
+    store.phase.frombytes(data[offset + 6 * n:offset + 7 * n])
+    store.save_positions()
+
+def xor_bytes(data, base):
+    """
+    data XOR base (base cat / them 0 cho bang do dai data)
+    """
+    n = len(data)
+    if not n: return b""
+    x = int.from_bytes(data, "little") ^ int.from_bytes(base[:n], "little")
+    return x.to_bytes(n, "little")
+
+def encode_delta(state, base):
+    return zlib.compress(xor_bytes(state, base), 1)
+
+def decode_delta(payload, base):
+    return xor_bytes(zlib.decompress(payload), base)
+
+# =========================================================
+# GIA LAP DUONG TRUYEN (tre + mat goi) CHO THU NGHIEM
+# =========================================================
+class Link:
+    """
+    Moi goi gui di co the bi bo (loss) hoac gui tre latency +- jitter (giay)
+    Mac dinh khong gia lap gi
+    """
+    def __init__(self, latency=0.0, jitter=0.0, loss=0.0, seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.loss = loss
+        self.rng = random.Random(seed)
+        self.sent = 0
+        self.dropped = 0
+        self.bytes = 0
+
+    def send(self, transport, data, addr=None):
+        self.sent += 1
+        self.bytes += len(data)
+        if self.loss and self.rng.random() < self.loss:
+            self.dropped += 1
+            return
+        delay = self.latency + (self.rng.uniform(-self.jitter, self.jitter) if self.jitter else 0)
+        if delay <= 0:
+            transport.sendto(data, addr)
+        else:
+            asyncio.get_running_loop().call_later(delay, _send_later, transport, data, addr)
+
+def _send_later(transport, data, addr):
+    if not transport.is_closing(): transport.sendto(data, addr)
+
+# =========================================================
+# SERVER
+# =========================================================
+class RemotePlayer:
+    def __init__(self, slot, addr, now):
+        self.slot = slot
+        self.addr = addr
+        self.inputs = deque()   # input chua xu ly (theo thu tu seq)
+        self.last_received = 0  # seq lon nhat da nhan
+        self.last_used = 0      # seq cua input vua dung
+        self.bits = 0           # input hien tai (giu nguyen khi thieu goi)
+        self.acked = 0          # snapshot id client da nhan
+        self.last_seen = now
+
+    def receive(self, seq, history):
+        """
+        Goi INPUT chua input seq, seq-1, ... (2 bit moi input, moi nhat o bit thap)
+        """
+        first = max(self.last_received + 1, seq - INPUT_REDUNDANCY + 1)
+        for s in range(first, seq + 1):
+            self.inputs.append((s, history >> (2 * (seq - s)) & 3))
+        self.last_received = max(self.last_received, seq)
+        while len(self.inputs) > MAX_INPUT_QUEUE: self.inputs.popleft()
+
+    def next_input(self):
+        if self.inputs:
+            self.last_used, self.bits = self.inputs.popleft()
+        return self.bits
+
+class Room:
+    def __init__(self, room_id, players):
+        from game import Game
+        self.room_id = room_id
+        self.players = players
+        self.game = Game(headless=True)
+        self.game.reset_game(players)
+        self.clients = {}       # addr -> RemotePlayer
+        self.snapshots = {}     # snapshot id -> trang thai (bytes)
+        self.snap_id = 0
+        self.restart_in = None
+        self.started = False    # van da bat dau (du nguoi) -> chay tiep du co nguoi roi
+
+    def free_slot(self):
+        taken = {c.slot for c in self.clients.values()}
+        for slot in range(self.players):
+            if slot not in taken: return slot
+        return None
+
+    def tick(self):
+        """
+        1 tick server; van chi bat dau khi du nguoi, sau do slot cua
+        nguoi roi phong (mat ket noi) do bot choi tiep cho toi khi co nguoi vao lai
+        """
+        game = self.game
+        if not self.started:
+            if len(self.clients) < self.players: return
+            self.started = True
+        if game.game_over:
+            if self.restart_in is None: self.restart_in = RESTART_DELAY
+            self.restart_in -= 1
+            if self.restart_in <= 0:
+                self.restart_in = None
+                game.reset_game(self.players)
+                self.started = False
+            return
+        inputs = 0
+        for c in self.clients.values():
+            inputs |= c.next_input() << (2 * c.slot)
+        if len(self.clients) < self.players:
+            taken = {c.slot for c in self.clients.values()}
+            for slot in range(self.players):
+                if slot not in taken: inputs |= chase_bot(game, slot)
+        game.step(inputs)
+
+    def snapshot(self):
+        """
+        Chup trang thai hien tai -> (id, bytes); giu SNAPSHOT_HISTORY ban gan nhat
+        """
+        self.snap_id += 1
+        state = encode_state(self.game)
+        self.snapshots[self.snap_id] = state
+        self.snapshots.pop(self.snap_id - SNAPSHOT_HISTORY, None)
+        return self.snap_id, state
+
+class NetServer(asyncio.DatagramProtocol):
+    """
+    1 server, nhieu phong; tat ca phong dung chung 1 vong tick
+    """
+    def __init__(self, players=2, link=None, max_rooms=MAX_ROOMS):
+        self.players = players
+        self.link = link or Link()
+        self.max_rooms = max_rooms
+        self.rooms = {}         # room id -> Room
+        self.by_addr = {}       # addr -> Room
+        self.transport = None
+        self.stats = {"full": 0, "delta": 0, "bytes": 0}
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def send(self, data, addr):
+        self.link.send(self.transport, data, addr)
+
+    def datagram_received(self, data, addr):
+        if not data: return
+        now = time.monotonic()
+        kind = data[0]
+        try:
+            if kind == MSG_JOIN: self.on_join(JOIN.unpack_from(data)[1], addr, now)
+            elif kind == MSG_INPUT: self.on_input(INPUT.unpack_from(data), addr, now)
+        except struct.error:
+            pass    # goi hong / sai kich thuoc -> bo qua
+
+    def on_join(self, room_id, addr, now):
+        room = self.by_addr.get(addr)
+        if room is None:
+            room = self.rooms.get(room_id)
+            if room is None:
+                # Het cho tao phong moi -> tra loi nhu phong day
+                if len(self.rooms) >= self.max_rooms:
+                    self.send(WELCOME.pack(MSG_WELCOME, ROOM_FULL, self.players), addr)
+                    return
+                room = self.rooms[room_id] = Room(room_id, self.players)
+            slot = room.free_slot()
+            if slot is None:
+                self.send(WELCOME.pack(MSG_WELCOME, ROOM_FULL, room.players), addr)
+                return
+            room.clients[addr] = RemotePlayer(slot, addr, now)
+            self.by_addr[addr] = room
+        # JOIN lap lai (goi WELCOME bi mat) -> gui lai cung slot
+        self.send(WELCOME.pack(MSG_WELCOME, room.clients[addr].slot, room.players), addr)
+
+    def on_input(self, packet, addr, now):
+        _, seq, history, acked = packet
+        room = self.by_addr.get(addr)
+        if room is None: return
+        client = room.clients[addr]
+        client.last_seen = now
+        client.acked = max(client.acked, acked)
+        if seq > client.last_received: client.receive(seq, history)
+
+    def drop_idle(self, now):
+        for addr, room in list(self.by_addr.items()):
+            if now - room.clients[addr].last_seen > CLIENT_TIMEOUT:
+                del room.clients[addr]
+                del self.by_addr[addr]
+                # Nguoi cuoi cung roi phong -> bo ca phong (va Game cua no)
+                if not room.clients: self.rooms.pop(room.room_id, None)
+
+    def broadcast(self, room):
+        snap_id, state = room.snapshot()
+        payloads = {}   # moc delta -> payload (client cung moc dung chung)
+        for client in room.clients.values():
+            base_id = client.acked if client.acked in room.snapshots else 0
+            payload = payloads.get(base_id)
+            if payload is None:
+                payload = payloads[base_id] = encode_delta(state, room.snapshots.get(base_id, b""))
+            self.stats["delta" if base_id else "full"] += 1
+            packet = SNAPSHOT.pack(MSG_SNAPSHOT, snap_id, base_id, client.last_used) + payload
+            self.stats["bytes"] += len(packet)
+            self.send(packet, client.addr)
+
+    async def serve(self):
+        """
+        Vong tick co dinh FPS cho moi phong (khong dung lai)
+        """
+        loop = asyncio.get_running_loop()
+        next_t = loop.time()
+        tick = 0
+        while True:
+            tick += 1
+            for room in list(self.rooms.values()):
+                room.tick()
+                if tick % SNAPSHOT_EVERY == 0 and room.clients: self.broadcast(room)
+            if tick % FPS == 0: self.drop_idle(time.monotonic())
+            next_t += 1 / FPS
+            await asyncio.sleep(max(0.0, next_t - loop.time()))
+
+# =========================================================
+# CLIENT
+# =========================================================
+class NetClient(asyncio.DatagramProtocol):
+    """
+    Giu 1 Game "guong" (game) de ve; xo cua minh duoc du doan ngay
+    khi bam phim, cac phan con lai lay tu snapshot
+    """
+    def __init__(self, game, room=1, link=None):
+        self.game = game
+        self.room = room
+        self.link = link or Link()
+        self.transport = None
+        self.slot = None
+        self.refused = False
+        self.joined = asyncio.Event()
+
+        self.seq = 0
+        self.history = 0
+        self.pending = deque(maxlen=2 * FPS)    # (seq, bits, x du doan sau input)
+        self.snapshots = {}     # snapshot id -> trang thai (moc delta)
+        self.latest = 0
+        self.stats = {"snapshots": 0, "bytes": 0, "corrections": 0, "max_error": 0.0}
+
+    def connection_made(self, transport):
+        self.transport = transport
+        asyncio.get_running_loop().create_task(self.join())
+
+    async def join(self):
+        while not self.joined.is_set() and not self.transport.is_closing():
+            self.link.send(self.transport, JOIN.pack(MSG_JOIN, self.room))
+            try:
+                await asyncio.wait_for(asyncio.shield(self.joined.wait()), JOIN_RETRY)
+            except asyncio.TimeoutError:
+                pass
+
+    def datagram_received(self, data, addr):
+        if not data: return
+        try:
+            if data[0] == MSG_WELCOME: self.on_welcome(WELCOME.unpack_from(data))
+            elif data[0] == MSG_SNAPSHOT: self.on_snapshot(data)
+        except (struct.error, zlib.error):
+            pass
+
+    def on_welcome(self, packet):
+        _, slot, players = packet
+        if slot == ROOM_FULL: self.refused = True
+        elif self.slot is None:
+            self.slot = slot
+            self.game.reset_game(players)
+        self.joined.set()
+
+    def on_snapshot(self, data):
+        snap_id, base_id, last_seq = SNAPSHOT.unpack_from(data)[1:]
+        self.stats["bytes"] += len(data)
+        if snap_id <= self.latest: return          # goi den tre / trung
+        base = self.snapshots.get(base_id, b"") if base_id else b""
+        if base_id and not base: return            # mat moc delta, cho ban sau
+        state = decode_delta(data[SNAPSHOT.size:], base)
+
+        self.stats["snapshots"] += 1
+        self.latest = snap_id
+        self.snapshots[snap_id] = state
+        for old in [k for k in self.snapshots if k <= snap_id - SNAPSHOT_HISTORY]:
+            del self.snapshots[old]
+        apply_state(self.game, state)
+        if self.slot is not None: self.reconcile(last_seq)
+
+    def reconcile(self, last_seq):
+        """
+        Vi tri server (sau input last_seq) + chay lai input chua xu ly
+        """
+        pl = self.game.players
+        slot = self.slot
+        while self.pending and self.pending[0][0] < last_seq: self.pending.popleft()
+        if self.pending and self.pending[0][0] == last_seq:
+            error = abs(self.pending.popleft()[2] - pl.x[slot])
+            if error > 1:
+                self.stats["corrections"] += 1
+                self.stats["max_error"] = max(self.stats["max_error"], error)
+
+        x, vel = pl.x[slot], pl.velocity[slot]
+        winter = self.game.get_season() == 3
+        for seq, bits, _ in self.pending:
+            x, vel = step_bucket(x, vel, bits, pl.confused[slot], winter)
+        pl.x[slot], pl.velocity[slot] = x, vel
+
+    def send_input(self, bits):
+        """
+        Goi moi tick: gui input (bits: 1 = trai, 2 = phai) va du doan ngay
+        """
+        if self.slot is None or self.transport.is_closing(): return
+        self.seq += 1
+        self.history = (self.history << 2 | bits) & 0xFF
+        self.link.send(self.transport, INPUT.pack(MSG_INPUT, self.seq, self.history, self.latest))
+
+        game = self.game
+        pl = game.players
+        slot = self.slot
+        # Chua bat dau (cho du nguoi) / da ket thuc -> server khong di chuyen xo
+        if game.tick_count and not (pl.dead[slot] or game.game_over):
+            pl.x[slot], pl.velocity[slot] = step_bucket(
+                pl.x[slot], pl.velocity[slot], bits, pl.confused[slot], game.get_season() == 3)
+        self.pending.append((self.seq, bits, pl.x[slot]))
+
+async def connect(game, host, port=NET_PORT, room=1, link=None):
+    loop = asyncio.get_running_loop()
+    _, client = await loop.create_datagram_endpoint(
+        lambda: NetClient(game, room, link), remote_addr=(host, port))
+    await client.joined.wait()
+    if client.refused:
+        client.transport.close()
+        raise ConnectionRefusedError(f"room {room} is full")
+    return client
+
+async def start_server(host="0.0.0.0", port=NET_PORT, players=2, link=None, max_rooms=MAX_ROOMS):
+    loop = asyncio.get_running_loop()
+    transport, server = await loop.create_datagram_endpoint(
+        lambda: NetServer(players, link, max_rooms), local_addr=(host, port))
+    return transport, server
+
+# =========================================================
+# CHAY THU
+# =========================================================
+async def bot_client(game, host, port, room, link, seconds):
+    client = await connect(game, host, port, room, link)
+    loop = asyncio.get_running_loop()
+    next_t = loop.time()
+    end = next_t + seconds
+    while loop.time() < end:
+        client.send_input(chase_bot(game, client.slot) >> (2 * client.slot) & 3)
+        next_t += 1 / FPS
+        await asyncio.sleep(max(0.0, next_t - loop.time()))
+    client.transport.close()
+    return client
+
+async def loopback(rooms=1, players=2, seconds=10.0, latency=0.0, jitter=0.0, loss=0.0, seed=0):
+    """
+    Server + rooms * players bot client trong cung 1 process qua 127.0.0.1
+    Duong truyen gia lap ap dung cho ca 2 chieu
+    """
+    from game import Game
+    transport, server = await start_server("127.0.0.1", 0, players,
+                                           Link(latency / 2, jitter, loss, seed), max(rooms, MAX_ROOMS))
+    port = transport.get_extra_info("sockname")[1]
+    serve = asyncio.get_running_loop().create_task(server.serve())
+
+    links = [Link(latency / 2, jitter, loss, seed + 1 + i) for i in range(rooms * players)]
+    t0 = time.process_time()
+    clients = await asyncio.gather(*(
+        bot_client(Game(headless=True), "127.0.0.1", port, 1 + i // players, links[i], seconds)
+        for i in range(rooms * players)))
+    cpu = time.process_time() - t0
+    serve.cancel()
+    transport.close()
+    return server, clients, cpu
+
+def print_loopback(server, clients, cpu, seconds):
+    full, delta = server.stats["full"], server.stats["delta"]
+    kbps = server.stats["bytes"] * 8 / 1000 / seconds / max(1, len(clients))
+    print(f"server: {full + delta} snapshots ({delta} delta, {full} full), "
+          f"{kbps:.1f} kbit/s per client, {server.link.dropped} dropped")
+    for c in clients:
+        g = c.game
+        print(f"  room {c.room} P{c.slot + 1}: {c.stats['snapshots']} snapshots, "
+              f"score {g.players.score[c.slot]}, {c.stats['corrections']} corrections "
+              f"(max {c.stats['max_error']:.1f} px)")
+    print(f"cpu: {cpu:.2f} s for {seconds:.0f} s of play ({cpu / seconds:.0%})")
+
+async def play_window(host, port, room):
+    """
+    Client co cua so: phim cua P1 (mui ten) hoac P2 (A / D) deu dieu khien xo cua minh
+    Input qua InputState nhu Game.run (theo event, nhan nhanh giua 2 frame khong mat)
+    """
+    import pygame
+    from game import Game
+    from input_state import InputState
+    game = Game(dirty_rects=False)
+    client = await connect(game, host, port, room)
+    pygame.display.set_caption(f"Fruit Catcher - room {room} - P{client.slot + 1}")
+    inp = InputState(PLAYER_KEYS[:2])
+    prof = game.profiler
+
+    loop = asyncio.get_running_loop()
+    next_t = loop.time()
+    while True:
+        prof.begin_frame()
+        events = pygame.event.get()
+        inp.pump(events)
+        for event in events:
+            if event.type == pygame.QUIT:
+                client.transport.close()
+                return
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                prof.toggle()
+            if event.type == pygame.WINDOWFOCUSLOST:
+                inp.clear()     # KEYUP luc mat focus se khong toi
+        # Phim P1 (bit 0, 1) va P2 (bit 2, 3) -> trai / phai cua xo minh
+        bits = inp.tick_inputs()
+        client.send_input((bits | bits >> 2) & 3)
+        prof.lap("input")
+
+        game.draw()
+        if game.game_over: game.display_game_over()
+        game.draw_profiler()
+        pygame.display.update()
+        prof.lap("flip")
+        # Input cua client do ca 2 bo phim -> tinh cho slot cua client
+        for _, ms in inp.presented(): prof.sample(f"input lag P{client.slot + 1}", ms)
+        prof.end_frame({"fruits": len(game.created_fruits), "particles": len(game.particles)})
+        next_t += 1 / FPS
+        await asyncio.sleep(max(0.0, next_t - loop.time()))
+
+def parse_address(text):
+    host, _, port = text.partition(":")
+    return host, int(port) if port else NET_PORT
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fruit Catcher netplay")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("serve")
+    p.add_argument("--host", default="0.0.0.0")
+    p.add_argument("--port", type=int, default=NET_PORT)
+    p.add_argument("--players", type=int, default=2)
+    p.add_argument("--max-rooms", type=int, default=MAX_ROOMS)
+    p = sub.add_parser("join")
+    p.add_argument("address", help="HOST[:PORT]")
+    p.add_argument("--room", type=int, default=1)
+    p = sub.add_parser("loopback")
+    p.add_argument("--rooms", type=int, default=1)
+    p.add_argument("--players", type=int, default=2)
+    p.add_argument("--seconds", type=float, default=10.0)
+    p.add_argument("--latency", type=float, default=0.0, help="ms (khu hoi)")
+    p.add_argument("--jitter", type=float, default=0.0, help="ms")
+    p.add_argument("--loss", type=float, default=0.0, help="ti le mat goi moi chieu")
+    p.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    if getattr(args, "players", 1) not in range(1, MAX_PLAYERS + 1):
+        parser.error(f"--players must be between 1 and {MAX_PLAYERS}")
+
+    if args.command == "serve":
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        async def serve():
+            _, server = await start_server(args.host, args.port, args.players, max_rooms=args.max_rooms)
+            print(f"Serving {args.players}-player rooms on {args.host}:{args.port}")
+            await server.serve()
+        asyncio.run(serve())
+    elif args.command == "join":
+        asyncio.run(play_window(*parse_address(args.address), args.room))
+    else:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+        result = asyncio.run(loopback(args.rooms, args.players, args.seconds,
+                                      args.latency / 1000, args.jitter / 1000, args.loss, args.seed))
+        print_loopback(*result, args.seconds)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+# =========================================================
+# FILE: pacing.py
+# MO TA:
+# Dieu phoi frame dung chung cho moi vong lap (game, menu,
+# luat choi, game over):
+# - Gioi han FPS bang clock.tick (khong quay vong an CPU)
+# - Man hinh tinh (menu...) chi ve lai khi co thay doi
+#   (hover, click, bat / tat am thanh) va ngu trong
+#   pygame.event.wait khi khong co gi de lam
+# =========================================================
+
+import os
+
+import pygame
+from settings import *
+
+class FramePacer:
+    """
+    Vong lap man hinh tinh:
+        pacer.invalidate()
+        while ...:
+            if pacer.dirty: ve...; pygame.display.update(); pacer.drawn()
+            for event in pacer.events(): ...
+            pacer.tick()
+    """
+    def __init__(self, fps=FPS, idle_wake_ms=IDLE_WAKE_MS):
+        self.clock = pygame.time.Clock()
+        self.fps = fps
+        self.idle_wake_ms = idle_wake_ms
+        self.dirty = True
+        self.hovered = None
+        self.idle_ms = 0        # tong thoi gian ngu cho event (thong ke)
+
+    def invalidate(self):
+        self.dirty = True
+
+    def drawn(self):
+        self.dirty = False
+
+    def tick(self, fps=None):
+        """
+        Gioi han FPS (mac dinh self.fps, 0 = khong gioi han); tra ve ms tu lan tick truoc
+        """
+        return self.clock.tick(self.fps if fps is None else fps)
+
+    def events(self):
+        """
+        Con thay doi chua ve -> lay event ngay
+        Khong thi ngu den khi co event (toi da idle_wake_ms)
+        """
+        if self.dirty: return pygame.event.get()
+        t0 = pygame.time.get_ticks()
+        first = pygame.event.wait(self.idle_wake_ms)
+        self.idle_ms += pygame.time.get_ticks() - t0
+        events = [] if first.type == pygame.NOEVENT else [first]
+        events += pygame.event.get()
+        for event in events:
+            if event.type in (pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED, pygame.VIDEOEXPOSE):
+                self.dirty = True
+        return events
+
+    def track_hover(self, rects, pos=None):
+        """
+        Chi so nut dang duoc tro chuot (None neu khong co); doi nut -> can ve lai
+        """
+        if pos is None: pos = pygame.mouse.get_pos()
+        hovered = next((i for i, r in enumerate(rects) if r.collidepoint(pos)), None)
+        if hovered != self.hovered:
+            self.hovered = hovered
+            self.dirty = True
+        return hovered
+
+def create_window(size, caption):
+    """
+    Mo cua so kich thuoc logic 'size' theo DISPLAY_MODE:
+    "scaled" / "fullscreen" -> pygame.SCALED: SDL phong surface logic len man hinh
+    bang GPU (chuot tu doi ve toa do logic), game van chi ve o kich thuoc logic
+    USE_VSYNC -> xin vsync (can SCALED); driver khong ho tro thi bo qua tung buoc
+    """
+    flags = 0
+    if DISPLAY_MODE in ("scaled", "fullscreen") or USE_VSYNC:
+        flags |= pygame.SCALED
+        # Hint SDL phai dat truoc khi tao renderer
+        os.environ.setdefault("SDL_RENDER_SCALE_QUALITY", SCALE_FILTER)
+    if DISPLAY_MODE == "fullscreen":
+        flags |= pygame.FULLSCREEN
+
+    attempts = [(flags, 1)] if USE_VSYNC else []
+    attempts.append((flags, 0))
+    for flags, vsync in attempts:
+        try:
+            return pygame.display.set_mode(size, flags, vsync=vsync)
+        except pygame.error:
+            pass
+    return pygame.display.set_mode(size)
@@ -0,0 +1,127 @@
+# =========================================================
+# FILE: particles.py
+# MO TA:
+# He thong hat no dung pool co dinh:
+# - Vi tri, van toc, tuoi tho luu san trong array
+# - Anh hat vuong duoc ve san theo (kich thuoc, mau)
+# - Toa do / kich thuoc theo san choi, nhan 'scale' khi ve
+# - Giu vi tri tick truoc -> ve noi suy nhu xo / vat roi
+# - Ve tat ca bang 1 lan Surface.blits moi frame
+# =========================================================
+
+import random
+from array import array
+
+import pygame
+
+PARTICLE_CAPACITY = 512
+PARTICLE_GRAVITY = 0.2
+
+# =========================================================
+# CLASS PARTICLE POOL
+# =========================================================
+class ParticlePool:
+    """
+    Pool hat no kich thuoc co dinh, khong cap phat them khi chay
+    Hat song nam o [0, count), hat chet bi swap-remove
+    """
+    def __init__(self, capacity=PARTICLE_CAPACITY, scale=1.0):
+        self.capacity = capacity
+        self.scale = scale      # toa do san choi -> px ve
+        self.count = 0
+        self.x = array("d", bytes(8 * capacity))
+        self.y = array("d", bytes(8 * capacity))
+        self.prev_x = array("d", bytes(8 * capacity))
+        self.prev_y = array("d", bytes(8 * capacity))
+        self.vx = array("d", bytes(8 * capacity))
+        self.vy = array("d", bytes(8 * capacity))
+        self.life = array("h", bytes(2 * capacity))
+        self.sprite = array("H", bytes(2 * capacity))
+
+        # (size, color) -> sprite id | sprite id -> Surface
+        self.sprite_ids = {}
+        self.sprites = []
+
+    def __len__(self):
+        return self.count
+
+    def get_sprite(self, size, color):
+        """
+        Lay id anh hat vuong, chi ve lan dau gap (size, color)
+        """
+        key = (size, tuple(color))
+        sid = self.sprite_ids.get(key)
+        if sid is None:
+            px = max(1, round(size * self.scale))
+            surf = pygame.Surface((px, px))
+            surf.fill(color)
+            sid = len(self.sprites)
+            self.sprites.append(surf)
+            self.sprite_ids[key] = sid
+        return sid
+
+    def spawn(self, x, y, color, count=10, rng=random):
+        """
+        Tao toi da count hat tai (x, y); pool day thi bo qua phan du
+        """
+        count = min(count, self.capacity - self.count)
+        for _ in range(count):
+            size = rng.randint(4, 8)
+            i = self.count
+            self.x[i] = self.prev_x[i] = x - size // 2
+            self.y[i] = self.prev_y[i] = y - size // 2
+            self.vx[i] = rng.uniform(-4, 4)
+            self.vy[i] = rng.uniform(-4, 4)
+            self.life[i] = rng.randint(20, 40)
+            self.sprite[i] = self.get_sprite(size, color)
+            self.count += 1
+
+    def update(self):
+        xs, ys, vxs, vys, life = self.x, self.y, self.vx, self.vy, self.life
+        pxs, pys = self.prev_x, self.prev_y
+        i = self.count - 1
+        while i >= 0:
+            life[i] -= 1
+            if life[i] <= 0:
+                self.remove(i)
+            else:
+                pxs[i] = xs[i]
+                pys[i] = ys[i]
+                vys[i] += PARTICLE_GRAVITY
+                xs[i] += vxs[i]
+                ys[i] += vys[i]
+            i -= 1
+
+    def remove(self, i):
+        last = self.count - 1
+        if i != last:
+            self.x[i] = self.x[last]
+            self.y[i] = self.y[last]
+            self.prev_x[i] = self.prev_x[last]
+            self.prev_y[i] = self.prev_y[last]
+            self.vx[i] = self.vx[last]
+            self.vy[i] = self.vy[last]
+            self.life[i] = self.life[last]
+            self.sprite[i] = self.sprite[last]
+        self.count = last
+
+    def clear(self):
+        self.count = 0
+
+    def commands(self, alpha=1.0):
+        """
+        [(sprite, vi tri)] cua cac hat dang song (cho RenderQueue / Surface.blits)
+        alpha: noi suy giua vi tri tick truoc va tick hien tai
+        """
+        sprites, sid, xs, ys, k = self.sprites, self.sprite, self.x, self.y, self.scale
+        pxs, pys = self.prev_x, self.prev_y
+        return [(sprites[sid[i]], (int((pxs[i] + (xs[i] - pxs[i]) * alpha) * k),
+                                   int((pys[i] + (ys[i] - pys[i]) * alpha) * k)))
+                for i in range(self.count)]
+
+    def draw(self, surface, doreturn=False, alpha=1.0):
+        """
+        doreturn=True -> tra ve danh sach rect da ve (cho dirty rect)
+        """
+        if not self.count: return []
+        return surface.blits(self.commands(alpha), doreturn) or []
@@ -0,0 +1,188 @@
+# =========================================================
+# FILE: players.py
+# MO TA:
+# Bang trang thai nguoi choi (toi da MAX_PLAYERS) dang array
+# song song + cac ham xu ly chung cho moi nguoi choi:
+# - Di chuyen 1 xo (dung chung cho game va du doan phia client)
+# - Tim xo bat trung vat roi (quet khoang x da sap xep)
+# - Chon xo nam cham gan nhat
+# - Bot don gian dieu khien 1 slot
+# =========================================================
+
+from array import array
+from bisect import bisect_left, bisect_right
+
+from settings import *
+from entities import HARMLESS_MISS
+
+MAX_PLAYERS = 8
+BUCKET_W = 50
+BUCKET_H = 50
+BUCKET_Y = SCREEN_HEIGHT - BUCKET_H   # hang xo sat day man hinh
+FRUIT_W = 40
+BUCKET_SPEED = 8
+# Mua dong: xo truot co quan tinh
+WINTER_ACCEL = 0.5
+WINTER_FRICTION = 0.9
+WINTER_MAX_SPEED = 10
+
+# Truong trang thai: ten -> kieu array ("B" = co bat/tat -> bytearray)
+PLAYER_FIELDS = {
+    "x": "d",
+    "velocity": "d",
+    "score": "i",
+    "lives": "i",
+    "dead": "B",
+    "shield": "B",
+    "magnet": "B",
+    "confused": "B",
+}
+
+def input_bits(slot):
+    """
+    (bit trai, bit phai) cua nguoi choi slot trong input bitmask
+    """
+    return 1 << (2 * slot), 1 << (2 * slot + 1)
+
+def start_x(slot, count):
+    # Giu nguyen vi tri xuat phat cu cua P1 / P2
+    if slot == 0: return SCREEN_WIDTH // 2
+    if slot == 1: return SCREEN_WIDTH // 2 - 100
+    return int((slot + 0.5) * (SCREEN_WIDTH - BUCKET_W) / count)
+
+def step_bucket(x, velocity, bits, confused, winter):
+    """
+    Di chuyen 1 xo trong 1 tick -> (x, velocity) moi
+    bits: 1 = trai, 2 = phai (bam ca 2 -> trai); confused dao trai / phai
+    """
+    if confused and bits != 3: bits ^= 3
+
+    move_dir = 0
+    if bits & 1: move_dir = -1
+    elif bits: move_dir = 1
+
+    if winter:
+        if move_dir != 0: velocity += move_dir * WINTER_ACCEL
+        else: velocity *= WINTER_FRICTION
+        velocity = max(-WINTER_MAX_SPEED, min(WINTER_MAX_SPEED, velocity))
+        x += velocity
+    elif move_dir:
+        x += move_dir * BUCKET_SPEED
+    else:
+        return x, velocity  # dung yen, x da nam trong man hinh
+
+    return max(0, min(SCREEN_WIDTH - BUCKET_W, x)), velocity
+
+# =========================================================
+# CLASS PLAYER TABLE
+# =========================================================
+class PlayerTable:
+    """
+    Moi truong la 1 array MAX_PLAYERS phan tu, slot [0, count) dang choi
+    Slot khong choi luon co dead = 1
+    Co dang bytearray -> "1 in dead" chay bang memchr, rat nhanh
+    """
+    def __init__(self):
+        self.count = 0
+        for name, code in PLAYER_FIELDS.items():
+            arr = bytearray(MAX_PLAYERS) if code == "B" else array(code, [0] * MAX_PLAYERS)
+            setattr(self, name, arr)
+        self.prev_x = array("d", [0] * MAX_PLAYERS)    # x o tick truoc (ve noi suy)
+
+    def reset(self, count, lives=3):
+        if not 1 <= count <= MAX_PLAYERS:
+            raise ValueError(f"so nguoi choi phai tu 1 den {MAX_PLAYERS}")
+        self.count = count
+        for name in PLAYER_FIELDS:
+            arr = getattr(self, name)
+            for i in range(MAX_PLAYERS): arr[i] = 0
+        for i in range(MAX_PLAYERS):
+            if i < count:
+                self.x[i] = start_x(i, count)
+                self.lives[i] = lives
+            else:
+                self.dead[i] = 1
+        self.prev_x[:] = self.x
+
+    def alive(self):
+        dead = self.dead
+        return [i for i in range(self.count) if not dead[i]]
+
+# =========================================================
+# BAT VAT ROI: QUET KHOANG X
+# Moi xo cung nam o y = BUCKET_Y nen chi can so khoang x
+# Xo [px, px + 50) cham vat [ix, ix + 40) <=> ix - 50 < px < ix + 40
+# =========================================================
+class CatchSweep:
+    """
+    Sap xep xo con song theo x 1 lan moi tick, sau do moi vat roi
+    chi can bisect -> O(log n) thay vi thu tung cap (xo, vat)
+    Nhieu xo cung cham: uu tien slot nho nhat (P1 truoc P2 ...)
+    """
+    def __init__(self, players):
+        x = players.x
+        self.slots = sorted(players.alive(), key=x.__getitem__)
+        self.xs = [int(x[i]) for i in self.slots]
+
+    def catcher(self, ix):
+        xs = self.xs
+        lo = bisect_right(xs, ix - BUCKET_W)
+        hi = bisect_left(xs, ix + FRUIT_W, lo)
+        if lo >= hi: return -1
+        if hi - lo == 1: return self.slots[lo]
+        return min(self.slots[lo:hi])
+
+# =========================================================
+# NAM CHAM: XO GAN NHAT
+# =========================================================
+class MagnetTargets:
+    """
+    Danh sach x (da sap xep) cua cac xo dang co nam cham
+    Bang nhau ve khoang cach -> chon slot nho hon
+    """
+    def __init__(self, players):
+        best = {}
+        for i in players.alive():
+            if players.magnet[i]:
+                x = players.x[i]
+                if x not in best: best[x] = i
+        order = sorted(best.items())
+        self.xs = [x for x, _ in order]
+        self.slots = [i for _, i in order]
+
+    def __bool__(self):
+        return bool(self.xs)
+
+    def nearest_x(self, fx):
+        xs = self.xs
+        k = bisect_left(xs, fx)
+        if k == 0: return xs[0]
+        if k == len(xs): return xs[-1]
+        left, right = xs[k - 1], xs[k]
+        d_left, d_right = fx - left, right - fx
+        if d_left < d_right: return left
+        if d_right < d_left: return right
+        return left if self.slots[k - 1] < self.slots[k] else right
+
+# =========================================================
+# BOT
+# =========================================================
+def chase_bot(game, slot):
+    """
+    Chay toi vat roi thap nhat (khong phai bom / doc); tra ve input bits
+    Chi doc trang thai game -> khong anh huong tinh tat dinh cua replay
+    """
+    store = game.created_fruits
+    kinds, xs, ys = store.kind, store.x, store.y
+    target = None; best_y = -1e9
+    for i in range(len(store)):
+        if kinds[i] in HARMLESS_MISS: continue
+        if ys[i] > best_y:
+            best_y = ys[i]; target = xs[i] + FRUIT_W / 2
+    if target is None: return 0
+
+    center = game.players.x[slot] + BUCKET_W / 2
+    left, right = input_bits(slot)
+    if target < center - 6: return left
+    if target > center + 6: return right
+    return 0
@@ -0,0 +1,164 @@
+# =========================================================
+# FILE: profiler.py
+# MO TA:
+# Do thoi gian tung pha cua vong lap game ngay trong game:
+# - Overlay (bat/tat bang F3): percentile thoi gian frame,
+#   thoi gian trung binh tung pha, so luong vat the
+# - Ghi tung frame ra file Chrome trace / Perfetto (JSON)
+#   mo bang chrome://tracing hoac ui.perfetto.dev
+# =========================================================
+
+import atexit
+import json
+import time
+from collections import deque
+
+import pygame
+
+PROFILE_WINDOW = 240        # so frame de tinh percentile
+OVERLAY_REFRESH = 15        # ve lai overlay moi N frame
+OVERLAY_POS = (10, 80)
+
+# =========================================================
+# CLASS TRACE WRITER
+# Ghi "Trace Event Format" dang stream (moi event 1 dong)
+# =========================================================
+class TraceWriter:
+    def __init__(self, path):
+        self.file = open(path, "w")
+        self.file.write("[\n")
+        self.first = True
+        # Dong mang JSON ca khi thoat game bang quit() o bat ky man nao
+        atexit.register(self.close)
+
+    def write(self, event):
+        if not self.first: self.file.write(",\n")
+        self.file.write(json.dumps(event, separators=(",", ":")))
+        self.first = False
+
+    def close(self):
+        if self.file.closed: return
+        self.file.write("\n]\n")
+        self.file.close()
+
+# =========================================================
+# CLASS FRAME PROFILER
+# =========================================================
+class FrameProfiler:
+    """
+    begin_frame() -> lap("ten pha") sau moi pha -> end_frame(counts)
+    lap() cong don thoi gian tu lan lap truoc vao pha do
+    Tat (enabled=False va khong trace) thi moi ham gan nhu khong ton gi
+    """
+    def __init__(self, enabled=False, trace_path=None):
+        self.enabled = enabled
+        self.trace = TraceWriter(trace_path) if trace_path else None
+        self.active = False
+
+        self.frame_times = deque(maxlen=PROFILE_WINDOW)
+        self.phase_times = {}   # ten pha -> deque ms
+        self.samples = {}       # so do khac (vd. do tre input) -> deque ms
+        self.frame = {}         # ten pha -> ns trong frame hien tai
+        self.spans = []         # (ten, bat dau ns, do dai ns) cho trace
+        self.frame_start = 0
+        self.last = 0
+        self.frame_no = 0
+
+        self.overlay = None
+        self.counts = {}
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.overlay = None
+
+    def begin_frame(self):
+        self.active = self.enabled or self.trace is not None
+        if not self.active: return
+        self.frame_start = self.last = time.perf_counter_ns()
+        self.frame = {}
+        self.spans = []
+
+    def lap(self, name):
+        if not self.active: return
+        now = time.perf_counter_ns()
+        dur = now - self.last
+        self.frame[name] = self.frame.get(name, 0) + dur
+        if self.trace: self.spans.append((name, self.last, dur))
+        self.last = now
+
+    def sample(self, name, ms):
+        """
+        Ghi 1 so do khong phai pha cua frame (vd. input -> present)
+        """
+        if not self.active: return
+        q = self.samples.get(name)
+        if q is None:
+            q = self.samples[name] = deque(maxlen=PROFILE_WINDOW)
+        q.append(ms)
+        if self.trace:
+            self.trace.write({"name": name, "ph": "C", "pid": 1,
+                              "ts": time.perf_counter_ns() / 1000, "args": {"ms": ms}})
+
+    def end_frame(self, counts=None):
+        if not self.active: return
+        self.frame_no += 1
+        total = self.last - self.frame_start
+        self.frame_times.append(total / 1e6)
+        for name, ns in self.frame.items():
+            q = self.phase_times.get(name)
+            if q is None:
+                q = self.phase_times[name] = deque(maxlen=PROFILE_WINDOW)
+            q.append(ns / 1e6)
+        if counts: self.counts = counts
+
+        if self.trace:
+            us = lambda ns: ns / 1000
+            self.trace.write({"name": "frame", "ph": "X", "pid": 1, "tid": 1,
+                              "ts": us(self.frame_start), "dur": us(total),
+                              "args": {"frame": self.frame_no}})
+            for name, start, dur in self.spans:
+                self.trace.write({"name": name, "ph": "X", "pid": 1, "tid": 1,
+                                  "ts": us(start), "dur": us(dur)})
+            if counts:
+                self.trace.write({"name": "entities", "ph": "C", "pid": 1,
+                                  "ts": us(self.frame_start), "args": counts})
+
+    def percentiles(self, values=None):
+        values = sorted(self.frame_times if values is None else values)
+        if not values: return 0.0, 0.0, 0.0
+        pick = lambda q: values[min(len(values) - 1, int(q * len(values)))]
+        return pick(0.50), pick(0.95), pick(0.99)
+
+    def draw_overlay(self, surface, font):
+        """
+        Ve bang thong so, tra ve Rect da ve (None neu dang tat)
+        Chi render lai chu moi OVERLAY_REFRESH frame
+        """
+        if not self.enabled: return None
+        if self.overlay is None or self.frame_no % OVERLAY_REFRESH == 0:
+            self.overlay = self.render_overlay(font)
+        return surface.blit(self.overlay, OVERLAY_POS)
+
+    def render_overlay(self, font):
+        p50, p95, p99 = self.percentiles()
+        lines = [f"frame ms  p50 {p50:5.2f}  p95 {p95:5.2f}  p99 {p99:5.2f}"]
+        for name, q in self.phase_times.items():
+            lines.append(f"{name:<16}{sum(q) / len(q):6.2f} ms")
+        for name, q in self.samples.items():
+            p50, p95, _ = self.percentiles(q)
+            lines.append(f"{name:<16}p50 {p50:5.2f}  p95 {p95:5.2f} ms")
+        lines.append("  ".join(f"{k}: {v}" for k, v in self.counts.items()))
+
+        rendered = [font.render(line, True, (255, 255, 255)) for line in lines]
+        w = max(s.get_width() for s in rendered) + 10
+        h = sum(s.get_height() for s in rendered) + 10
+        panel = pygame.Surface((w, h), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 160))
+        y = 5
+        for s in rendered:
+            panel.blit(s, (5, y))
+            y += s.get_height()
+        return panel
+
+    def close(self):
+        if self.trace: self.trace.close()
@@ -0,0 +1,73 @@
+# =========================================================
+# FILE: render_queue.py
+# MO TA:
+# Hang doi lenh ve theo lop: cac ham draw_* chi them
+# (anh, vi tri) vao lop cua minh, cuoi frame flush() day
+# moi lop bang 1 lan Surface.blits (fblits neu co, pygame-ce)
+# -> bot chi phi goi blit tung vat khi co hang tram vat the
+# Thu tu ve = thu tu lop, trong 1 lop = thu tu them vao
+# =========================================================
+
+import pygame
+
+# Cac lop, ve tu duoi len tren (nen ve rieng truoc khi flush)
+LAYER_BOSS = 0
+LAYER_BUCKETS = 1
+LAYER_FRUITS = 2
+LAYER_PARTICLES = 3
+LAYER_TEXT = 4
+LAYER_HUD = 5
+LAYER_COUNT = 6
+
+HAS_FBLITS = hasattr(pygame.Surface, "fblits")
+
+_ring_cache = {}
+
+def ring_image(color, radius, width):
+    """
+    Vong tron rong (khien, nam cham) ve san 1 lan -> blit nhu sprite
+    """
+    key = (color, radius, width)
+    img = _ring_cache.get(key)
+    if img is None:
+        img = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+        pygame.draw.circle(img, color, (radius, radius), radius, width)
+        _ring_cache[key] = img
+    return img
+
+class RenderQueue:
+    def __init__(self):
+        self.layers = [[] for _ in range(LAYER_COUNT)]
+        self.submitted = 0      # so lenh da ve o lan flush gan nhat
+
+    def add(self, layer, image, pos):
+        self.layers[layer].append((image, pos))
+
+    def layer(self, layer):
+        """
+        List lenh cua lop (extend truc tiep khi ve nhieu vat 1 luc)
+        """
+        return self.layers[layer]
+
+    def clear(self):
+        for cmds in self.layers: cmds.clear()
+
+    def flush(self, surface, doreturn=False):
+        """
+        Ve tat ca cac lop len surface roi xoa hang doi
+        doreturn=True -> tra ve danh sach rect da ve (cho dirty rect)
+        """
+        rects = []
+        submitted = 0
+        for cmds in self.layers:
+            if not cmds: continue
+            submitted += len(cmds)
+            if doreturn:
+                rects += surface.blits(cmds, True)
+            elif HAS_FBLITS:
+                surface.fblits(cmds)
+            else:
+                surface.blits(cmds, False)
+            cmds.clear()
+        self.submitted = submitted
+        return rects
@@ -0,0 +1,151 @@
+# =========================================================
+# FILE: replay.py
+# MO TA:
+# Ghi lai va phat lai 1 van choi:
+# - File replay = seed RNG gameplay + input bitmask moi tick
+#   (nen RLE) + ket qua cuoi van de kiem tra
+# - Phat lai chay headless, khong gioi han FPS
+#
+# Ghi:  python game.py --record replays/
+# Phat: python replay.py replays/*.fcr
+# =========================================================
+
+import os
+import struct
+from array import array
+import sys
+import time
+
+REPLAY_MAGIC = b"FCRP"
+REPLAY_VERSION = 3    # 3: bang sinh alias (spawns.py) -> replay cu khong chay lai dung
+
+# magic, version, mode (= so nguoi choi), seed, so tick
+HEADER = struct.Struct("<4sBBQI")
+# (input bitmask 2 bit / nguoi choi, so tick lap lai)
+RUN = struct.Struct("<HH")
+MAX_RUN = 0xFFFF
+
+def result_fields(mode):
+    """
+    Ket qua luu cuoi file: level + diem / mang cua tung nguoi choi
+    """
+    fields = ["level"]
+    for i in range(mode):
+        fields += [f"p{i + 1}_score", f"p{i + 1}_lives"]
+    return tuple(fields)
+
+def result_struct(mode):
+    return struct.Struct(f"<{len(result_fields(mode))}i")
+
+def game_result(game):
+    pl = game.players
+    result = {"level": game.level}
+    for i in range(pl.count):
+        result[f"p{i + 1}_score"] = pl.score[i]
+        result[f"p{i + 1}_lives"] = pl.lives[i]
+    return result
+
+# =========================================================
+# CLASS RECORDER
+# =========================================================
+class Recorder:
+    """
+    Ghi input cua 1 van, bat dau ngay sau reset_game(mode, seed)
+    """
+    def __init__(self, mode, seed):
+        self.mode = mode
+        self.seed = seed
+        self.inputs = array("H")
+
+    def record(self, inputs):
+        self.inputs.append(inputs)
+
+    def save(self, path, game):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, self.mode,
+                                self.seed, len(self.inputs)))
+            result = game_result(game)
+            fields = result_fields(self.mode)
+            f.write(result_struct(self.mode).pack(*(result[k] for k in fields)))
+            f.write(encode_runs(self.inputs))
+
+def encode_runs(inputs):
+    out = bytearray()
+    i, n = 0, len(inputs)
+    while i < n:
+        value = inputs[i]
+        j = i + 1
+        while j < n and inputs[j] == value and j - i < MAX_RUN: j += 1
+        out += RUN.pack(value, j - i)
+        i = j
+    return bytes(out)
+
+def decode_runs(data):
+    inputs = array("H")
+    for value, run in RUN.iter_unpack(data):
+        inputs += array("H", (value,)) * run
+    return inputs
+
+# =========================================================
+# CLASS REPLAY
+# =========================================================
+class Replay:
+    def __init__(self, mode, seed, inputs, expected):
+        self.mode = mode
+        self.seed = seed
+        self.inputs = inputs
+        self.expected = expected
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, version, mode, seed, n_ticks = HEADER.unpack_from(data, 0)
+        if magic != REPLAY_MAGIC or version != REPLAY_VERSION:
+            raise ValueError(f"{path}: khong phai file replay hop le")
+        result = result_struct(mode)
+        values = result.unpack_from(data, HEADER.size)
+        inputs = decode_runs(data[HEADER.size + result.size:])
+        if len(inputs) != n_ticks:
+            raise ValueError(f"{path}: thieu du lieu input")
+        return cls(mode, seed, inputs, dict(zip(result_fields(mode), values)))
+
+    def play(self, game=None):
+        """
+        Chay lai toan bo input tren Game headless
+        Tra ve Game sau tick cuoi
+        """
+        if game is None:
+            from game import Game
+            game = Game(headless=True)
+        game.reset_game(self.mode, seed=self.seed)
+        step = game.step
+        for inputs in self.inputs:
+            step(inputs)
+        return game
+
+    def verify(self, game=None):
+        """
+        Tra ve danh sach (ten, mong doi, thuc te) bi lech; rong = OK
+        """
+        result = game_result(self.play(game))
+        return [(k, self.expected[k], result[k])
+                for k in result_fields(self.mode) if result[k] != self.expected[k]]
+
+if __name__ == "__main__":
+    from game import Game
+    game = Game(headless=True)
+    failed = 0
+    for path in sys.argv[1:]:
+        replay = Replay.load(path)
+        t0 = time.perf_counter()
+        diffs = replay.verify(game)
+        sec = time.perf_counter() - t0
+        rate = len(replay.inputs) / sec if sec else 0
+        status = "OK" if not diffs else "MISMATCH"
+        print(f"{status:<9}{path}  {len(replay.inputs)} ticks, {rate:,.0f} ticks/s")
+        for name, want, got in diffs:
+            print(f"    {name}: expected {want}, got {got}")
+        failed += bool(diffs)
+    sys.exit(1 if failed else 0)
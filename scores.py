@@ -0,0 +1,165 @@
+# =========================================================
+# FILE: scores.py
+# MO TA:
+# Bang xep hang luu bang SQLite (DATA_DIR/SCORES_FILE):
+# - Moi van ket thuc = 1 dong / nguoi choi (che do, ngay, diem...)
+# - Ghi qua hang doi + 1 luong ghi rieng, gom nhieu ban ghi
+#   vao 1 transaction -> vong lap ve KHONG BAO GIO cho dia
+# - Doc top N theo che do (ca ngay hoac tat ca) nho index
+#   (mode, diem) va (mode, ngay, diem); WAL -> doc khong bi
+#   chan boi luong ghi
+#
+# python scores.py --mode 1 --day today --top 10
+# =========================================================
+
+import argparse
+import atexit
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+
+from settings import *
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    id INTEGER PRIMARY KEY,
+    played_at REAL NOT NULL,    -- unix time
+    day TEXT NOT NULL,          -- YYYY-MM-DD (gio may)
+    mode INTEGER NOT NULL,      -- so nguoi choi
+    slot INTEGER NOT NULL,
+    bot INTEGER NOT NULL,
+    score INTEGER NOT NULL,
+    level INTEGER NOT NULL,
+    seconds REAL NOT NULL,
+    seed INTEGER
+);
+CREATE INDEX IF NOT EXISTS scores_mode_score ON scores (mode, score DESC);
+CREATE INDEX IF NOT EXISTS scores_mode_day_score ON scores (mode, day, score DESC);
+CREATE INDEX IF NOT EXISTS scores_played_at ON scores (played_at);
+"""
+INSERT = ("INSERT INTO scores (played_at, day, mode, slot, bot, score, level, seconds, seed) "
+          "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)")
+
+def today():
+    return time.strftime("%Y-%m-%d")
+
+def game_records(game):
+    """
+    Van vua ket thuc -> danh sach dong cho INSERT (1 dong / nguoi choi)
+    """
+    now = time.time()
+    day = time.strftime("%Y-%m-%d", time.localtime(now))
+    pl = game.players
+    seconds = game.tick_count / FPS
+    return [(now, day, pl.count, slot, int(slot in game.bots), pl.score[slot],
+             game.level, seconds, game.seed) for slot in range(pl.count)]
+
+class ScoreStore:
+    def __init__(self, path):
+        self.path = path
+        # Ket noi doc: chi dung o luong goi (luong game)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+
+        self.queue = queue.Queue()
+        self.written = 0
+        self.errors = 0
+        self.writer = threading.Thread(target=self._write_loop, name="score-writer", daemon=True)
+        self.writer.start()
+        atexit.register(self.close)
+
+    # --------- ghi (khong chan) ---------
+    def submit(self, rows):
+        for row in rows: self.queue.put(row)
+
+    def _write_loop(self):
+        conn = sqlite3.connect(self.path)
+        get = self.queue.get
+        while True:
+            batch = [get()]
+            while len(batch) < SCORE_BATCH:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            rows = [r for r in batch if r is not None]
+            if rows:
+                try:
+                    with conn:
+                        conn.executemany(INSERT, rows)
+                    self.written += len(rows)
+                except sqlite3.Error:
+                    self.errors += len(rows)    # bo lo nay, game van chay
+            for _ in batch: self.queue.task_done()
+            if len(rows) < len(batch): break    # gap None = dung
+        conn.close()
+
+    def flush(self):
+        """
+        Cho luong ghi ghi het hang doi (chi dung khi thoat / test)
+        """
+        self.queue.join()
+
+    def close(self):
+        if not self.writer.is_alive(): return
+        self.queue.put(None)
+        self.writer.join(timeout=5)
+        self.conn.close()
+
+    # --------- doc ---------
+    def top(self, mode, n=LEADERBOARD_SIZE, day=None, bots=False):
+        """
+        [(diem, slot, level, ngay)] cao nhat cua che do; day = "YYYY-MM-DD" hoac None
+        """
+        sql = "SELECT score, slot, level, day FROM scores WHERE mode = ?"
+        args = [mode]
+        if day is not None:
+            sql += " AND day = ?"; args.append(day)
+        if not bots:
+            sql += " AND bot = 0"
+        sql += " ORDER BY score DESC LIMIT ?"
+        args.append(n)
+        return self.conn.execute(sql, args).fetchall()
+
+    def best(self, mode):
+        rows = self.top(mode, 1)
+        return rows[0][0] if rows else 0
+
+def open_scores(path=None):
+    """
+    ScoreStore hoac None neu khong mo duoc (vd. thu muc chi doc)
+    """
+    if path is None: path = os.path.join(DATA_DIR, SCORES_FILE)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        return ScoreStore(path)
+    except (OSError, sqlite3.Error):
+        return None
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fruit Catcher leaderboard")
+    parser.add_argument("--mode", type=int, default=1, help="so nguoi choi")
+    parser.add_argument("--day", help="YYYY-MM-DD hoac 'today' (mac dinh: tat ca)")
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--bots", action="store_true", help="tinh ca diem cua bot")
+    parser.add_argument("--db", help="file SQLite (mac dinh DATA_DIR/SCORES_FILE)")
+    args = parser.parse_args(argv)
+
+    store = open_scores(args.db)
+    if store is None:
+        print("Cannot open score database", file=sys.stderr)
+        return 1
+    day = today() if args.day == "today" else args.day
+    rows = store.top(args.mode, args.top, day, args.bots)
+    print(f"Top {args.top} - {args.mode}P - {day or 'all time'}")
+    for rank, (score, slot, level, played) in enumerate(rows, 1):
+        print(f"{rank:>3}. {score:>6}  P{slot + 1}  level {level:<3} {played}")
+    store.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
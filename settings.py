@@ -3,8 +3,20 @@ import os
 import sys
 
 # --- CẤU HÌNH MÀN HÌNH ---
+# Kich thuoc san choi: toa do mo phong (vi tri, va cham, toc do)
 SCREEN_WIDTH = 700
 SCREEN_HEIGHT = 500
+# Do phan giai ve noi bo = san choi x RENDER_SCALE (vd. 0.5 -> 350x250 cho may yeu);
+# giao dien tinh theo kich thuoc nay (xem layout.py), mo phong khong doi
+RENDER_SCALE = 1.0
+RENDER_WIDTH = round(SCREEN_WIDTH * RENDER_SCALE)
+RENDER_HEIGHT = round(SCREEN_HEIGHT * RENDER_SCALE)
+# Cach dua surface logic len man hinh that (GPU phong to, khong ve lai):
+# "window": cua so dung do phan giai ve noi bo
+# "scaled": cua so phong to so nguyen lan vua man hinh
+# "fullscreen": toan man hinh, giu ti le (vien den 2 ben)
+DISPLAY_MODE = "window"
+SCALE_FILTER = "linear"     # "nearest": giu net pixel khi phong to
 GAME_CAPTION = "Fruit Catcher - 2 Player Chaos"
 
 # --- MÀU SẮC CƠ BẢN ---
@@ -20,21 +32,112 @@ ORANGE = (255, 165, 0)
 GRAY = (128, 128, 128)
 DARK_GRAY = (64, 64, 64)    
 
+# --- TOC DO KHUNG HINH / MO PHONG ---
+FPS = 60
+TICK_MS = 1000 / FPS    # Moi tick logic tuong ung 1 frame o 60 FPS
+USE_DIRTY_RECTS = False # True: chi ve lai / update vung thay doi (may yeu)
+USE_VSYNC = False       # True: dong bo voi tan so man hinh (neu driver ho tro)
+# Logic luon chay FPS tick / giay; ve thi toi da RENDER_FPS (0 = khong gioi han,
+# dung cung vsync) va noi suy vi tri giua 2 tick
+RENDER_FPS = 144
+MAX_STEPS_PER_FRAME = 5 # may qua cham: bo bot thoi gian thay vi chay bu mai
+IDLE_WAKE_MS = 1000     # man hinh tinh: ngu cho event toi da bao lau
+
+# --- AM THANH (xem audio.py) ---
+AUDIO_FREQUENCY = 44100
+AUDIO_BUFFER = 512      # mau / lan tron; nho -> it tre, qua nho -> re re tren may yeu
+MUSIC_FILE = "game_song.mp3"
+# ten -> (file, nhom kenh)
+SOUND_FILES = {
+    "score": ("coin.mp3", "pickup"),
+    "bomb": ("bomb.mp3", "hit"),
+    "lost_life": ("lost_life.mp3", "alert"),
+}
+# nhom -> so kenh danh rieng; het kenh -> cuop kenh phat lau nhat
+SOUND_CHANNELS = {"pickup": 4, "hit": 3, "alert": 1}
+SOUND_MIN_GAP_MS = 40   # cung 1 am thanh khong phat lai trong khoang nay
+
+# --- BANG XEP HANG (xem scores.py) ---
+SCORES_FILE = "scores.db"   # trong DATA_DIR
+LEADERBOARD_SIZE = 5        # so dong moi bang o man hinh chinh
+SCORE_BATCH = 64            # so ban ghi toi da moi transaction cua luong ghi
+
+# --- TUA LAI / DIEM LUU (xem snapshot.py) ---
+REWIND_SECONDS = 5          # giu snapshot cua N giay cuoi (0 = tat)
+REWIND_SNAPSHOT_BYTES = 8192  # kich thuoc du tinh 1 snapshot -> kich thuoc ring buffer
+
+# --- CHE DO TACH PROCESS MO PHONG / VE (xem split_mode.py) ---
+SPLIT_STATE_BYTES = 65536   # cho toi da cua 1 snapshot trong moi buffer chia se
+SPLIT_FX_SLOTS = 256        # so su kien hinh / tieng ben ve co the cham lai
+
+# --- CAN BANG GAME (balance.py co the ghi de bang --set TEN=GIA_TRI) ---
+START_LIVES = 3
+MAX_LIVES = 5
+BASE_FRUIT_SPEED = 3.0
+MAX_FRUIT_SPEED = 20
+SPEED_GROWTH = 1.10         # toc do roi x1.10 moi level
+BASE_FRUIT_INTERVAL = 1000  # ms giua 2 lan sinh vat roi
+MIN_FRUIT_INTERVAL = 250
+INTERVAL_DECAY = 0.95       # khoang cach sinh x0.95 moi level
+# Ti le sinh vat dac biet (ngoai boss), phan con lai chia deu cho trai cay
+# (ghi de theo mua: SEASON_SPAWN_ODDS)
+SPAWN_ODDS = [
+    ("magnet", 0.02),
+    ("freeze", 0.02),
+    ("tnt", 0.02),
+    ("poison", 0.02),
+    ("bomb", 0.17),
+]
+# Thoi gian hieu ung (ms mo phong), xem effects.py
+EFFECT_DURATIONS = {
+    "shield": 4000,
+    "magnet": 5000,
+    "freeze": 5000,
+    "confused": 3000,
+}
+BOSS_SPAWN_INTERVAL = 400
+BOSS_BOMB_BASE = 0.55       # ti le bom cua boss, +BOSS_BOMB_STEP moi 4 level
+BOSS_BOMB_STEP = 0.05
+BOSS_BOMB_MAX = 0.90
+BOSS_RELIEF = "banana.png"  # vat cuu tro boss tha (phan khong phai bom)
+
 # PLAYERS' COLORS
 COLOR_P1 = RED    
 COLOR_P2 = CYAN   
+# Mau xo cua tung slot (che do nhieu nguoi / bot)
+PLAYER_COLORS = [COLOR_P1, COLOR_P2, GREEN, YELLOW, ORANGE, MAGENTA, WHITE, GRAY]
 
 # -----------------------------------------------------------------
 # --- DUONG DAN ---
 if getattr(sys, 'frozen', False):
     BASE_DIR = sys._MEIPASS
+    # _MEIPASS la thu muc tam -> cache dat canh file .exe
+    CACHE_DIR = os.path.join(os.path.dirname(sys.executable), "cache")
+    DATA_DIR = os.path.join(os.path.dirname(sys.executable), "data")
 else:
     BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+    CACHE_DIR = os.path.join(BASE_DIR, "cache")
+    DATA_DIR = os.path.join(BASE_DIR, "data")   # du lieu nguoi choi (khong xoa duoc nhu cache)
 
 def get_path(folder, filename):
     return os.path.join(BASE_DIR, folder, filename)
 # -----------------------------------------------------------------
 
+# --- INPUT BITMASK (dung cho Game.step) ---
+INPUT_P1_LEFT = 1
+INPUT_P1_RIGHT = 2
+INPUT_P2_LEFT = 4
+INPUT_P2_RIGHT = 8
+# Slot i dung bit 2i (trai) va 2i+1 (phai), xem players.input_bits
+
+# Phim (ten hang so pygame) cua nguoi choi tren cung ban phim
+PLAYER_KEYS = [
+    ("K_LEFT", "K_RIGHT"),  # P1
+    ("K_a", "K_d"),         # P2
+    ("K_j", "K_l"),         # P3
+    ("K_KP4", "K_KP6"),     # P4
+]
+
 # --- TÊN FILE ẢNH CƠ BẢN ---
 IMG_FILES = {
     "bucket": "bucket.png",
@@ -47,6 +150,24 @@ IMG_FILES = {
 }
 
 FRUIT_FILES = ["apple.png", "banana.png", "watermelon.png", "strawberry.png"]
+# Loai cua tung trai cay (khong co = "normal")
+FRUIT_TYPES = {"banana.png": "heal", "apple.png": "shield"}
+
+# --- BANG SINH THEO MUA (xem spawns.py) ---
+# {ten: ti le} ghi de SPAWN_ODDS rieng cho xuan, ha, thu, dong;
+# ten = loai vat (bomb, magnet...) hoac file trong FRUIT_FILES
+# vd. [{}, {}, {"tnt": 0.05}, {"freeze": 0.0}]
+SEASON_SPAWN_ODDS = [{}, {}, {}, {}]
+
+# --- HOAT HINH VAT ROI (xem sprite_cache.py) ---
+SPIN_ANGLES = 32            # so goc xoay luong tu hoa (khung tinh san / sprite)
+SPIN_TICKS = 3              # trai cay quay 1 buoc goc moi N tick
+SPIN_TYPES = ("normal", "heal", "shield")
+PULSE_TICKS = 40            # chu ky phong / thu cua bom (tick)
+PULSE_SCALE = 0.12          # bom phong / thu +-12%
+PULSE_TYPES = ("bomb", "boss_bomb", "tnt")
+SQUASH_TICKS = 10           # hieu ung bep khi bat duoc vat roi
+SPRITE_VARIANT_LIMIT = 512  # so khung xoay / phong to toi da giu trong cache
 
 # --- BG ---
 BG_CONFIG = [
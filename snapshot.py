@@ -0,0 +1,205 @@
+# =========================================================
+# FILE: snapshot.py
+# MO TA:
+# Chup / khoi phuc TOAN BO trang thai gameplay cua Game
+# (khong pickle): nguoi choi, vat roi, hieu ung, boss, RNG...
+# - save_state(game) -> bytes (vai chuc us, chay duoc moi tick)
+# - load_state(game, data): game tiep tuc y het tu thoi diem chup
+#   (cung input -> cung ket qua)
+# - SnapshotRing: N giay snapshot gan nhat trong 1 bytearray
+#   cap phat san -> tua lai tuc thi, diem luu, re nhanh mo phong
+# Hieu ung hinh anh (hat no, chu noi, rung...) KHONG nam trong snapshot
+# =========================================================
+
+import random
+import struct
+from array import array
+from collections import deque
+
+from settings import *
+from players import MAX_PLAYERS, PLAYER_FIELDS
+
+SNAPSHOT_VERSION = 2
+
+# version, mode, co (game_over | paused << 1 | freeze << 2 | boss << 3), boss_dir,
+# seed, tick_count, ticks, last_fruit_time, level, base_speed, base_interval,
+# fruit_speed, fruit_interval, max_lives, boss_hp, boss_x, prev_boss_x, screen_shake,
+# caught[4], missed[4], so vat roi, so hieu ung, so ban ghi heap, effects.seq, co gauss, gauss
+HEAD = struct.Struct("<BBBbQIddIddddiddd i4I4I IHHIBd")
+# Hieu ung dang chay: ten, slot (255 = toan cuc), het han, so lan cong don
+EFFECT = struct.Struct("<BBdH")
+# Ban ghi heap: het han, so thu tu, ten, slot
+HEAP_ENTRY = struct.Struct("<dIBB")
+
+# Ten hieu ung <-> id (slot None = hieu ung toan cuc)
+EFFECT_NAMES = tuple(EFFECT_DURATIONS)
+EFFECT_ID = {name: i for i, name in enumerate(EFFECT_NAMES)}
+NO_SLOT = 255
+
+MT_STATE_LEN = 625      # random.Random.getstate()[1]
+FRUIT_ARRAYS = ("x", "y", "prev_x", "prev_y", "kind", "sprite", "phase")
+
+def _from_bytes(code, view):
+    arr = array(code)
+    arr.frombytes(view)
+    return arr
+
+def _effect_key(name_id, slot):
+    return EFFECT_NAMES[name_id], (None if slot == NO_SLOT else slot)
+
+def save_state(game):
+    pl = game.players
+    store = game.created_fruits
+    effects = game.effects
+    _, mt, gauss = game.rng.getstate()
+    flags = game.game_over | game.paused << 1 | game.freeze_active << 2 | game.boss_active << 3
+
+    parts = [HEAD.pack(
+        SNAPSHOT_VERSION, game.game_mode, flags, game.boss_dir,
+        game.seed, game.tick_count, game.ticks, game.last_fruit_time, game.level,
+        game.base_speed, game.base_interval, game.fruit_speed, game.fruit_interval,
+        game.max_lives, game.boss_hp, game.boss_x, game.prev_boss_x, game.screen_shake,
+        *game.caught, *game.missed,
+        len(store), len(effects.ends), len(effects.heap), effects.seq,
+        gauss is not None, gauss or 0.0)]
+
+    for name in PLAYER_FIELDS:
+        parts.append(bytes(getattr(pl, name)))
+    parts.append(pl.prev_x.tobytes())
+    parts.append(array("I", mt).tobytes())
+    for name in FRUIT_ARRAYS:
+        parts.append(getattr(store, name).tobytes())
+
+    stacks = effects.stacks
+    for (name, slot), end in effects.ends.items():
+        parts.append(EFFECT.pack(EFFECT_ID[name], NO_SLOT if slot is None else slot,
+                                 end, stacks[(name, slot)]))
+    for end, seq, (name, slot) in effects.heap:
+        parts.append(HEAP_ENTRY.pack(end, seq, EFFECT_ID[name], NO_SLOT if slot is None else slot))
+    return b"".join(parts)
+
+def load_state(game, data):
+    """
+    Ghi de trang thai gameplay cua game bang snapshot (cung settings, cung phien ban)
+    """
+    (version, mode, flags, game.boss_dir,
+     game.seed, game.tick_count, game.ticks, game.last_fruit_time, game.level,
+     game.base_speed, game.base_interval, game.fruit_speed, game.fruit_interval,
+     game.max_lives, game.boss_hp, game.boss_x, game.prev_boss_x, game.screen_shake,
+     *seasons, n_fruits, n_effects, n_heap, seq, has_gauss, gauss) = HEAD.unpack_from(data, 0)
+    if version != SNAPSHOT_VERSION:
+        raise ValueError(f"snapshot version {version} != {SNAPSHOT_VERSION}")
+    game.game_mode = mode
+    game.game_over = bool(flags & 1)
+    game.paused = bool(flags & 2)
+    game.freeze_active = bool(flags & 4)
+    game.boss_active = bool(flags & 8)
+    game.caught = list(seasons[:4])
+    game.missed = list(seasons[4:])
+
+    view = memoryview(data)
+    offset = HEAD.size
+    pl = game.players
+    pl.count = mode
+    for name, code in PLAYER_FIELDS.items():
+        size = MAX_PLAYERS * (1 if code == "B" else array(code).itemsize)
+        arr = getattr(pl, name)
+        if code == "B": arr[:] = view[offset:offset + size]
+        else: arr[:] = _from_bytes(code, view[offset:offset + size])
+        offset += size
+    pl.prev_x[:] = _from_bytes("d", view[offset:offset + 8 * MAX_PLAYERS])
+    offset += 8 * MAX_PLAYERS
+
+    mt = _from_bytes("I", view[offset:offset + 4 * MT_STATE_LEN])
+    offset += 4 * MT_STATE_LEN
+    game.rng.setstate((random.Random.VERSION, tuple(mt), gauss if has_gauss else None))
+
+    store = game.created_fruits
+    for name in FRUIT_ARRAYS:
+        arr = getattr(store, name)
+        size = n_fruits * arr.itemsize
+        del arr[:]
+        arr.frombytes(view[offset:offset + size])
+        offset += size
+
+    effects = game.effects
+    effects.clear()
+    for _ in range(n_effects):
+        name_id, slot, end, stacks = EFFECT.unpack_from(data, offset)
+        offset += EFFECT.size
+        key = _effect_key(name_id, slot)
+        effects.ends[key] = end
+        effects.stacks[key] = stacks
+    # Heap chup nguyen thu tu -> van dung bat bien heap
+    for _ in range(n_heap):
+        end, entry_seq, name_id, slot = HEAP_ENTRY.unpack_from(data, offset)
+        offset += HEAP_ENTRY.size
+        effects.heap.append((end, entry_seq, _effect_key(name_id, slot)))
+    effects.seq = seq
+
+# =========================================================
+# RING BUFFER SNAPSHOT
+# =========================================================
+class SnapshotRing:
+    """
+    Snapshot do dai thay doi ghi noi tiep vao 1 bytearray co dinh;
+    het cho o cuoi thi quay ve dau, de len cac snapshot cu nhat
+    index: (tick_count, offset, do dai), cu -> moi
+    """
+    def __init__(self, max_snapshots, capacity_bytes):
+        self.max_snapshots = max_snapshots
+        self.buf = bytearray(capacity_bytes)
+        self.index = deque()
+        self.head = 0
+
+    def __len__(self):
+        return len(self.index)
+
+    def clear(self):
+        self.index.clear()
+        self.head = 0
+
+    def push(self, tick, data):
+        """
+        Tra ve False neu snapshot lon hon ca buffer (khong luu)
+        """
+        n = len(data)
+        buf, index = self.buf, self.index
+        if n > len(buf): return False
+        start = self.head
+        if start + n > len(buf):
+            # Khong du cho o cuoi -> bo cac snapshot nam o doan cuoi, quay ve 0
+            while index and index[0][1] >= start: index.popleft()
+            start = 0
+        end = start + n
+        while index and index[0][1] < end and index[0][1] + index[0][2] > start:
+            index.popleft()
+        if len(index) >= self.max_snapshots: index.popleft()
+        buf[start:end] = data
+        index.append((tick, start, n))
+        self.head = end
+        return True
+
+    def get(self, i):
+        """
+        Snapshot thu i (0 = cu nhat, -1 = moi nhat) -> (tick, bytes)
+        """
+        tick, start, n = self.index[i]
+        return tick, bytes(self.buf[start:start + n])
+
+    def find(self, tick):
+        """
+        Vi tri snapshot moi nhat co tick_count <= tick (cu nhat neu khong co)
+        """
+        index = self.index
+        for i in range(len(index) - 1, -1, -1):
+            if index[i][0] <= tick: return i
+        return 0
+
+    def truncate(self, tick):
+        """
+        Bo cac snapshot sau tick (sau khi tua lai, tuong lai cu khong con dung)
+        """
+        index = self.index
+        while index and index[-1][0] > tick: index.pop()
+        self.head = index[-1][1] + index[-1][2] if index else 0
@@ -0,0 +1,197 @@
+# =========================================================
+# FILE: spawns.py
+# MO TA:
+# Bang sinh vat roi + duong cong do kho, khai bao bang du lieu
+# trong settings.py (SPAWN_ODDS, SEASON_SPAWN_ODDS, BOSS_*...)
+# va bien dich 1 lan khi tao Game:
+# - Moi mua / moi giai doan boss = 1 bang alias (Vose):
+#   chon 1 vat = 1 so ngau nhien + 1 phep so sanh, O(1)
+#   du bang co bao nhieu loai vat
+# - Toc do roi / khoang cach sinh tinh san theo level
+#
+# Doc settings qua module (settings.TEN) -> gia tri ghi de cua
+# balance.py --set van co hieu luc
+#
+# python spawns.py              # in bang da bien dich
+# python spawns.py --samples 1000000
+# =========================================================
+
+import argparse
+import random
+import time
+from array import array
+
+import settings
+from entities import TYPE_ID, ITEM_TYPES, ITEM_SPRITES, SPRITE_FRUIT_BASE
+
+SEASON_NAMES = ("spring", "summer", "autumn", "winter")
+CURVE_LEVELS = 64       # so level tinh san (cao hon thi tinh them khi can)
+BOSS_EVERY = 4          # boss xuat hien moi 4 level (level_up)
+
+class AliasTable:
+    """
+    Chon chi so 0..n-1 theo trong so (phuong phap alias cua Vose)
+    """
+    def __init__(self, weights):
+        n = len(weights)
+        total = sum(weights)
+        if n == 0 or total <= 0:
+            raise ValueError("spawn table has no positive weight")
+        scaled = [w * n / total for w in weights]
+        self.n = n
+        self.prob = [1.0] * n
+        self.alias = list(range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+        # Con du do sai so lam tron -> prob = 1 (mac dinh)
+
+    def sample(self, rng):
+        u = rng.random() * self.n
+        i = int(u)
+        return i if u - i < self.prob[i] else self.alias[i]
+
+    def sample_many(self, rng, count):
+        """
+        count lan chon -> array("H") chi so (nhanh hon goi sample tung lan)
+        """
+        n, prob, alias, rand = self.n, self.prob, self.alias, rng.random
+        out = array("H", bytes(2 * count))
+        for k in range(count):
+            u = rand() * n
+            i = int(u)
+            out[k] = i if u - i < prob[i] else alias[i]
+        return out
+
+def resolve(name):
+    """
+    Ten trong bang sinh -> (type id, sprite id)
+    Ten = loai trong ITEM_SPRITES (bomb, magnet...) hoac file trong FRUIT_FILES
+    """
+    if name in ITEM_SPRITES:
+        return TYPE_ID[name], ITEM_SPRITES[name]
+    if name in settings.FRUIT_FILES:
+        f_type = settings.FRUIT_TYPES.get(name, "normal")
+        return TYPE_ID[f_type], SPRITE_FRUIT_BASE + settings.FRUIT_FILES.index(name)
+    raise ValueError(f"unknown spawn item: {name}")
+
+class SpawnTable:
+    def __init__(self, odds):
+        """
+        odds: [(ten, trong so)]; ten "fruit" = chia deu cho moi file trong FRUIT_FILES
+        """
+        entries = []
+        for name, weight in odds:
+            if name == "fruit":
+                fruits = settings.FRUIT_FILES
+                entries += [(f, weight / len(fruits)) for f in fruits]
+            else:
+                entries.append((name, weight))
+        self.names = [name for name, _ in entries]
+        outcomes = [resolve(name) for name in self.names]
+        self.kinds = array("B", [k for k, _ in outcomes])
+        self.sprites = array("H", [s for _, s in outcomes])
+        weights = [w for _, w in entries]
+        total = sum(weights)
+        self.odds = [w / total for w in weights] if total > 0 else weights
+        self.alias = AliasTable(weights)
+
+    def pick(self, rng):
+        """
+        -> (type id, sprite id)
+        """
+        i = self.alias.sample(rng)
+        return self.kinds[i], self.sprites[i]
+
+def season_odds(base, override):
+    """
+    SPAWN_ODDS ghi de bang ti le cua mua; phan con lai la trai cay
+    """
+    odds = dict(base)
+    odds.update(override)
+    rest = 1.0 - sum(odds.values())
+    if rest < -1e-9:
+        raise ValueError(f"spawn odds add up to more than 1: {odds}")
+    return list(odds.items()) + [("fruit", max(0.0, rest))]
+
+class SpawnEngine:
+    def __init__(self):
+        s = settings
+        overrides = list(s.SEASON_SPAWN_ODDS) + [{}] * (len(SEASON_NAMES) - len(s.SEASON_SPAWN_ODDS))
+        self.seasons = [SpawnTable(season_odds(s.SPAWN_ODDS, o)) for o in overrides]
+        self.boss_tables = {}   # giai doan boss (level // BOSS_EVERY) -> SpawnTable
+        # index = level (phan tu 0 khong dung)
+        self.speeds = [0.0]
+        self.intervals = [0.0]
+        self.extend_curves(CURVE_LEVELS)
+
+    # --------- bang sinh ---------
+    def pick(self, rng, season):
+        return self.seasons[season].pick(rng)
+
+    def boss_table(self, level):
+        phase = level // BOSS_EVERY
+        table = self.boss_tables.get(phase)
+        if table is None:
+            s = settings
+            # Ti le bom tang BOSS_BOMB_STEP moi lan gap boss, toi da BOSS_BOMB_MAX
+            # (de con co hoi roi vat cuu tro BOSS_RELIEF)
+            bomb = min(s.BOSS_BOMB_MAX, s.BOSS_BOMB_BASE + phase * s.BOSS_BOMB_STEP)
+            table = SpawnTable([("boss_bomb", bomb), (s.BOSS_RELIEF, 1.0 - bomb)])
+            self.boss_tables[phase] = table
+        return table
+
+    def pick_boss(self, rng, level):
+        return self.boss_table(level).pick(rng)
+
+    # --------- duong cong do kho ---------
+    def extend_curves(self, max_level):
+        s = settings
+        for level in range(len(self.speeds), max_level + 1):
+            speed = s.BASE_FRUIT_SPEED * (s.SPEED_GROWTH ** (level - 1))
+            if speed > s.MAX_FRUIT_SPEED: speed = s.MAX_FRUIT_SPEED
+            self.speeds.append(speed)
+            self.intervals.append(max(s.BASE_FRUIT_INTERVAL * (s.INTERVAL_DECAY ** (level - 1)),
+                                      s.MIN_FRUIT_INTERVAL))
+
+    def speed(self, level):
+        if level >= len(self.speeds): self.extend_curves(level)
+        return self.speeds[level]
+
+    def interval(self, level):
+        if level >= len(self.intervals): self.extend_curves(level)
+        return self.intervals[level]
+
+def print_table(title, table):
+    print(title)
+    for name, p in zip(table.names, table.odds):
+        print(f"  {name:<16} {ITEM_TYPES[resolve(name)[0]]:<10} {p:7.2%}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compiled spawn tables")
+    parser.add_argument("--samples", type=int, default=0,
+                        help="kiem tra: lay mau N lan moi mua, so voi ti le khai bao")
+    args = parser.parse_args()
+    engine = SpawnEngine()
+    for season, table in zip(SEASON_NAMES, engine.seasons):
+        print_table(season, table)
+    print_table("boss (level 4)", engine.boss_table(4))
+    print("level  speed  interval")
+    for level in (1, 2, 4, 8, 16, 32):
+        print(f"{level:>5}  {engine.speed(level):5.2f}  {engine.interval(level):8.1f}")
+
+    if args.samples:
+        rng = random.Random(0)
+        for season, table in zip(SEASON_NAMES, engine.seasons):
+            t0 = time.perf_counter()
+            picks = table.alias.sample_many(rng, args.samples)
+            sec = time.perf_counter() - t0
+            counts = [0] * len(table.names)
+            for i in picks: counts[i] += 1
+            worst = max(abs(c / args.samples - p) for c, p in zip(counts, table.odds))
+            print(f"{season}: {args.samples / sec:,.0f} samples/s, max deviation {worst:.4%}")
@@ -0,0 +1,374 @@
+# =========================================================
+# FILE: split_mode.py
+# MO TA:
+# Che do tach tien trinh: mo phong va ve chay o 2 process
+# (2 nhan CPU, khong chung GIL):
+# - Process mo phong: Game headless, tick co dinh FPS, sau moi
+#   tick ghi snapshot (snapshot.py) vao buffer sau cua vung
+#   multiprocessing.shared_memory 2 buffer, roi doi buffer
+# - Process ve (process chinh): chep buffer moi nhat ra ban nhap,
+#   kiem tra seq roi moi load_state (khong pickle / pipe), noi suy
+#   va ve; present cham khong lam cham mo phong
+# - Hat no, chu noi, am thanh: process mo phong ghi vao 1 ring
+#   buffer su kien trong cung vung nho, process ve phat lai
+# - Input / tam dung / choi lai / thoat: ghi nguoc vao vung dieu khien
+#
+# python split_mode.py --players 2 [--bots 1] [--seed 42]
+# =========================================================
+
+import argparse
+import multiprocessing as mp
+import random
+import struct
+import sys
+import time
+from multiprocessing import shared_memory
+
+from settings import *
+
+# -------- VUNG DIEU KHIEN (offset, moi truong 1 ben ghi) --------
+OFF_LATEST = 0      # i32: buffer moi nhat (-1 = chua co)      [mo phong ghi]
+OFF_FX = 8          # u64: tong so su kien da ghi vao ring     [mo phong ghi]
+OFF_INPUTS = 16     # u32: bitmask input                       [ve ghi]
+OFF_PAUSED = 20     # u8
+OFF_QUIT = 21       # u8
+OFF_RESTART = 24    # u32: tang 1 = choi lai voi seed o OFF_SEED
+OFF_SEED = 32       # u64
+CONTROL_SIZE = 64
+I32 = struct.Struct("<i")
+U32 = struct.Struct("<I")
+U64 = struct.Struct("<Q")
+
+# -------- BUFFER TRANG THAI --------
+# seq (le = dang ghi), do dai snapshot, thoi diem ghi (perf_counter, chung may)
+BUF_HEAD = struct.Struct("<QId")
+BUF_META = struct.Struct("<Id")    # phan sau seq cua BUF_HEAD
+BUF_HEAD_SIZE = 32
+SEED_OFFSET = 4     # vi tri seed trong snapshot.HEAD
+
+# -------- RING SU KIEN HINH / TIENG --------
+# loai, big, x, y, mau rgb, so hat (sprite voi FX_SQUASH), chu (ten am thanh / chu noi)
+FX = struct.Struct("<BBffBBBH24s")
+FX_PARTICLES, FX_TEXT, FX_SOUND, FX_SQUASH = 0, 1, 2, 3
+
+POLL_SLEEP = 0.002  # process mo phong ranh (tam dung / game over) -> ngu
+READ_ATTEMPTS = 100 # doc trung buffer dang ghi qua so lan nay -> giu frame cu
+
+def buffer_offset(i):
+    return CONTROL_SIZE + i * (BUF_HEAD_SIZE + SPLIT_STATE_BYTES)
+
+FX_OFFSET = buffer_offset(2)
+SHM_SIZE = FX_OFFSET + SPLIT_FX_SLOTS * FX.size
+
+# =========================================================
+# PROCESS MO PHONG
+# =========================================================
+def make_sim_game(mode, seed, n_bots):
+    from game import Game
+    from players import chase_bot
+
+    class SimGame(Game):
+        """
+        Game headless ghi lai hieu ung hinh / tieng (thay vi bo qua) cho process ve
+        """
+        def __init__(self):
+            self.fx = []
+            super().__init__(headless=True)
+
+        def spawn_particles(self, x, y, color, count=10):
+            self.fx.append((FX_PARTICLES, 0, x, y, color, count, b""))
+
+        def add_text(self, text, x, y, color, big=False):
+            self.fx.append((FX_TEXT, big, x, y, color, 0, text.encode()))
+
+        def play_sound(self, name):
+            self.fx.append((FX_SOUND, 0, 0.0, 0.0, BLACK, 0, name.encode()))
+
+        def add_squash(self, sprite, x, y):
+            self.fx.append((FX_SQUASH, 0, x, y, BLACK, sprite, b""))
+
+    game = SimGame()
+    game.bots = {slot: chase_bot for slot in range(mode - n_bots, mode)}
+    game.reset_game(mode, seed)
+    return game
+
+class StateWriter:
+    """
+    Ben mo phong: ghi snapshot vao buffer khong phai buffer moi nhat,
+    xong moi cong bo (OFF_LATEST); su kien ghi noi tiep vao ring
+    """
+    def __init__(self, buf):
+        self.buf = buf
+        self.latest = -1
+        self.seqs = [0, 0]
+        self.fx_count = 0
+        self.dropped = 0    # so tick snapshot lon hon SPLIT_STATE_BYTES (khong ghi)
+
+    def publish(self, data):
+        n = len(data)
+        if n > SPLIT_STATE_BYTES:
+            self.dropped += 1
+            return
+        i = 1 - self.latest if self.latest >= 0 else 0
+        off = buffer_offset(i)
+        buf = self.buf
+        # seqlock: le trong luc ghi -> ben doc biet buffer dang do dang;
+        # seq chan ghi CUOI CUNG, rieng 1 lan ghi, sau do dai + thoi diem
+        self.seqs[i] += 1
+        U64.pack_into(buf, off, self.seqs[i])
+        start = off + BUF_HEAD_SIZE
+        buf[start:start + n] = data
+        BUF_META.pack_into(buf, off + 8, n, time.perf_counter())
+        self.seqs[i] += 1
+        U64.pack_into(buf, off, self.seqs[i])
+        I32.pack_into(buf, OFF_LATEST, i)
+        self.latest = i
+
+    def push_fx(self, events):
+        buf = self.buf
+        for kind, big, x, y, color, count, text in events:
+            slot = self.fx_count % SPLIT_FX_SLOTS
+            FX.pack_into(buf, FX_OFFSET + slot * FX.size,
+                         kind, big, x, y, *color[:3], count, text[:24])
+            self.fx_count += 1
+        U64.pack_into(buf, OFF_FX, self.fx_count)
+
+def sim_main(shm_name, mode, seed, n_bots):
+    """
+    Diem vao process mo phong (multiprocessing "spawn")
+    """
+    from snapshot import save_state
+    shm = shared_memory.SharedMemory(name=shm_name)
+    buf = shm.buf
+    try:
+        game = make_sim_game(mode, seed, n_bots)
+        writer = StateWriter(buf)
+        writer.publish(save_state(game))
+        restart = U32.unpack_from(buf, OFF_RESTART)[0]
+        next_t = time.perf_counter()
+        while not buf[OFF_QUIT]:
+            r = U32.unpack_from(buf, OFF_RESTART)[0]
+            if r != restart:
+                restart = r
+                game.reset_game(mode, U64.unpack_from(buf, OFF_SEED)[0])
+                writer.publish(save_state(game))
+            game.paused = bool(buf[OFF_PAUSED])
+            if game.paused or game.game_over:
+                time.sleep(POLL_SLEEP)
+                next_t = time.perf_counter()
+                continue
+
+            now = time.perf_counter()
+            if now < next_t:
+                time.sleep(next_t - now)
+                continue
+            # Cham qua nhieu tick -> bo bot (nhu MAX_STEPS_PER_FRAME o Game.run)
+            next_t = max(next_t + TICK_MS / 1000, now - TICK_MS * MAX_STEPS_PER_FRAME / 1000)
+
+            inputs = U32.unpack_from(buf, OFF_INPUTS)[0] | game.bot_inputs()
+            game.step(inputs)
+            if game.fx:
+                writer.push_fx(game.fx)
+                game.fx.clear()
+            writer.publish(save_state(game))
+    finally:
+        del buf
+        shm.close()
+
+# =========================================================
+# PROCESS VE
+# =========================================================
+class StateReader:
+    """
+    Ben ve: chep buffer moi nhat ra ban nhap, kiem tra seq roi moi nap vao Game
+    (chep vi shared memory co the bi ghi de giua chung luc load_state dang doc)
+    """
+    def __init__(self, buf):
+        self.buf = buf
+        self.loaded = (-1, 0)   # (buffer, seq) da xu ly -> khong doc lai
+        self.written_at = 0.0
+        self.fx_read = 0
+        self.retries = 0        # so lan doc trung luc dang ghi (thong ke)
+        self.rejected = 0       # so snapshot hong bi bo qua (thong ke)
+
+    def load_latest(self, game, seed):
+        """
+        True neu vua nap trang thai moi (bo qua trang thai cua van co seed khac)
+        """
+        from snapshot import load_state, HEAD
+        buf = self.buf
+        for _ in range(READ_ATTEMPTS):
+            i = I32.unpack_from(buf, OFF_LATEST)[0]
+            if i < 0: return False
+            off = buffer_offset(i)
+            seq = U64.unpack_from(buf, off)[0]
+            if seq & 1:
+                self.retries += 1
+                continue
+            if (i, seq) == self.loaded: return False
+            n, written_at = BUF_META.unpack_from(buf, off + 8)
+            start = off + BUF_HEAD_SIZE
+            data = bytes(buf[start:start + min(n, SPLIT_STATE_BYTES)])
+            # Ben ghi da quay vong ghi de buffer trong luc doc -> doc lai
+            # (Game chua bi dong toi, het luot thi giu nguyen trang thai cu)
+            if U64.unpack_from(buf, off)[0] != seq:
+                self.retries += 1
+                continue
+            if not HEAD.size <= n <= SPLIT_STATE_BYTES:
+                self.loaded = (i, seq)
+                self.rejected += 1
+                return False
+            if U64.unpack_from(data, SEED_OFFSET)[0] != seed: return False
+            try:
+                load_state(game, data)
+            except (struct.error, ValueError, IndexError):
+                # snapshot hong (khong phai do doc trung luc ghi) -> bo qua,
+                # snapshot hop le ke tiep ghi de lai toan bo trang thai
+                self.loaded = (i, seq)
+                self.rejected += 1
+                return False
+            self.loaded = (i, seq)
+            self.written_at = written_at
+            return True
+        return False
+
+    def replay_fx(self, game):
+        buf = self.buf
+        written = U64.unpack_from(buf, OFF_FX)[0]
+        # Ve cham qua ca ring -> bo cac su kien cu da bi ghi de
+        start = max(self.fx_read, written - SPLIT_FX_SLOTS)
+        for k in range(start, written):
+            kind, big, x, y, r, g, b, count, text = FX.unpack_from(
+                buf, FX_OFFSET + (k % SPLIT_FX_SLOTS) * FX.size)
+            text = text.rstrip(b"\0").decode()
+            if kind == FX_PARTICLES: game.spawn_particles(x, y, (r, g, b), count)
+            elif kind == FX_TEXT: game.add_text(text, x, y, (r, g, b), bool(big))
+            elif kind == FX_SOUND: game.play_sound(text)
+            elif kind == FX_SQUASH: game.add_squash(count, x, y)
+        self.fx_read = written
+
+def run_split(mode, seed=None, n_bots=0):
+    import pygame
+    from game import Game
+    from players import chase_bot
+
+    seed = seed if seed is not None else random.randrange(1 << 32)
+    shm = shared_memory.SharedMemory(create=True, size=SHM_SIZE)
+    buf = shm.buf
+    buf[:CONTROL_SIZE] = bytes(CONTROL_SIZE)
+    I32.pack_into(buf, OFF_LATEST, -1)
+    U64.pack_into(buf, OFF_SEED, seed)
+    ctx = mp.get_context("spawn")   # khong fork process da khoi tao pygame
+    sim = ctx.Process(target=sim_main, args=(shm.name, mode, seed, n_bots),
+                      name="fruit-sim", daemon=True)
+    sim.start()
+
+    # Trang thai den tu process mo phong -> ben ve khong can ring tua lai
+    game = Game(dirty_rects=False, rewind_seconds=0)
+    game.load_sounds()
+    if not game.is_mute: game.audio.play_music()
+    # bot chay o process mo phong; ben ve chi can biet slot nao la bot (bang diem)
+    game.bots = {slot: chase_bot for slot in range(mode - n_bots, mode)}
+    game.reset_game(mode, seed)
+    reader = StateReader(buf)
+    pacer = game.pacer
+    prof = game.profiler
+    inp = game.input
+    last_tick = 0
+    tap, tap_tick = 0, 0    # phim nhan + nha giua 2 tick: giu den khi mo phong qua tick do
+
+    def restart():
+        nonlocal seed, last_tick
+        seed = random.randrange(1 << 32)
+        game.reset_game(mode, seed)
+        inp.clear()
+        last_tick = 0
+        U64.pack_into(buf, OFF_SEED, seed)
+        U32.pack_into(buf, OFF_RESTART, U32.unpack_from(buf, OFF_RESTART)[0] + 1)
+
+    try:
+        while sim.is_alive():
+            prof.begin_frame()
+            events = pygame.event.get()
+            inp.pump(events)
+            for event in events:
+                if event.type == pygame.QUIT: return
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                    prof.toggle()
+                if event.type == pygame.KEYDOWN and event.key in (pygame.K_p, pygame.K_ESCAPE):
+                    if not game.game_over: game.paused = not game.paused
+                if event.type == pygame.WINDOWFOCUSLOST and not game.game_over:
+                    inp.clear()
+                    game.paused = True
+                if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 and game.game_over:
+                    res, qui, rtm = game.game_over_rects()
+                    if res.collidepoint(event.pos): restart()
+                    if qui.collidepoint(event.pos) or rtm.collidepoint(event.pos): return
+            paused = game.paused
+            buf[OFF_PAUSED] = paused
+
+            bits = inp.tick_inputs()
+            if bits & ~inp.held:
+                tap, tap_tick = bits & ~inp.held, last_tick
+            if last_tick > tap_tick: tap = 0
+            U32.pack_into(buf, OFF_INPUTS, inp.held | tap)
+
+            if reader.load_latest(game, seed):
+                # Hat no / chu noi chay theo tick mo phong
+                for _ in range(min(game.tick_count - last_tick, MAX_STEPS_PER_FRAME)):
+                    game.particles.update()
+                    game.floating_texts.update()
+                game.update_squashes()
+                last_tick = game.tick_count
+            reader.replay_fx(game)
+            game.paused = paused    # tam dung la trang thai cua ben ve
+            prof.lap("sim:load")
+
+            if game.game_over:
+                game.save_scores()
+                game.draw()
+                game.display_game_over(pacer.track_hover(game.game_over_rects()[:2]))
+            else:
+                alpha = 1.0 if paused else min(1.0, (time.perf_counter() - reader.written_at) * 1000 / TICK_MS)
+                game.draw(alpha)
+                if paused: game.draw_paused()
+            game.draw_profiler()
+            pygame.display.update()
+            prof.lap("flip")
+            # Nhu Game.run: do tre input -> present; tam dung / game over bo qua
+            for slot, ms in inp.presented(): prof.sample(f"input lag P{slot + 1}", ms)
+            if paused or game.game_over: inp.settle()
+            pacer.tick(FPS if game.game_over or paused else RENDER_FPS)
+            prof.lap("wait")
+            prof.end_frame({
+                "fruits": len(game.created_fruits),
+                "particles": len(game.particles),
+                "texts": len(game.floating_texts),
+                "retries": reader.retries,
+            })
+    finally:
+        buf[OFF_QUIT] = 1
+        sim.join(timeout=2)
+        if sim.is_alive(): sim.terminate()
+        del buf
+        reader.buf = None
+        shm.close()
+        shm.unlink()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fruit Catcher with simulation and rendering in separate processes")
+    parser.add_argument("--players", type=int, default=1)
+    parser.add_argument("--bots", type=int, default=0, help="K nguoi choi cuoi do bot dieu khien")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args(argv)
+    from players import MAX_PLAYERS
+    if not 1 <= args.players <= MAX_PLAYERS:
+        parser.error(f"--players must be between 1 and {MAX_PLAYERS}")
+    if not 0 <= args.bots <= args.players:
+        parser.error("--bots must be between 0 and --players")
+    run_split(args.players, args.seed, args.bots)
+    return 0
+
+if __name__ == "__main__":
+    mp.freeze_support()
+    sys.exit(main())
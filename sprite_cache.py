@@ -0,0 +1,94 @@
+# =========================================================
+# FILE: sprite_cache.py
+# MO TA:
+# Khung hoat hinh cua vat roi (trai cay quay, bom phong / thu,
+# bep khi bat duoc) KHONG goi rotozoom moi frame:
+# - Goc xoay luong tu hoa thanh SPIN_ANGLES buoc, ti le thanh
+#   buoc 1/SCALE_STEPS -> moi sprite chi co vai chuc khung
+# - Khung tinh lazy lan dau can, giu toi da SPRITE_VARIANT_LIMIT
+#   khung (LRU), day thi bo khung dung lau nhat
+# - Vat roi chi mang 1 byte pha goc (FruitStore.phase)
+# =========================================================
+
+import math
+from array import array
+from collections import OrderedDict
+
+import pygame
+from settings import *
+from entities import TYPE_ID, ITEM_TYPES
+
+SCALE_STEPS = 32    # ti le 1.0 = 32 buoc
+
+# Kieu hoat hinh theo type id
+ANIM_STATIC, ANIM_SPIN, ANIM_PULSE = 0, 1, 2
+ANIM = array("B", [ANIM_STATIC] * len(ITEM_TYPES))
+for _name in SPIN_TYPES: ANIM[TYPE_ID[_name]] = ANIM_SPIN
+for _name in PULSE_TYPES: ANIM[TYPE_ID[_name]] = ANIM_PULSE
+
+# Buoc ti le cua bom theo (tick % PULSE_TICKS)
+PULSE_STEPS = tuple(round(SCALE_STEPS * (1 + PULSE_SCALE * math.sin(2 * math.pi * k / PULSE_TICKS)))
+                    for k in range(PULSE_TICKS))
+
+def spin_angle(phase, tick):
+    """
+    Buoc goc cua trai cay: pha le quay nguoc chieu kim dong ho, pha chan quay xuoi
+    """
+    step = tick // SPIN_TICKS
+    return (phase + step if phase & 1 else phase - step) % SPIN_ANGLES
+
+def squash_scale(age):
+    """
+    age tick sau khi bat -> (buoc ti le ngang, buoc ti le doc): bet dan roi bien mat
+    """
+    k = min(1.0, age / SQUASH_TICKS)
+    return round(SCALE_STEPS * (1 + 0.5 * k)), max(1, round(SCALE_STEPS * (1 - 0.8 * k)))
+
+class SpriteVariantCache:
+    def __init__(self, sprites, angles=SPIN_ANGLES, limit=SPRITE_VARIANT_LIMIT):
+        self.sprites = sprites
+        self.angles = angles
+        self.limit = limit
+        self.frames = OrderedDict()     # (sprite, goc, sx, sy) -> (surface, dx, dy)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.frames)
+
+    def get(self, sprite_id, angle=0, sx=SCALE_STEPS, sy=None):
+        """
+        -> (surface, dx, dy): ve o (x + dx, y + dy) thi khung nam giua cho sprite goc
+        angle: buoc goc 0..angles-1; sx, sy: ti le tinh bang buoc (sy None = sx)
+        """
+        key = (sprite_id, angle, sx, sx if sy is None else sy)
+        frames = self.frames
+        frame = frames.get(key)
+        if frame is not None:
+            frames.move_to_end(key)
+            self.hits += 1
+            return frame
+        self.misses += 1
+        frame = frames[key] = self.render(*key)
+        if len(frames) > self.limit:
+            frames.popitem(last=False)
+            self.evictions += 1
+        return frame
+
+    def render(self, sprite_id, angle, sx, sy):
+        img = self.sprites[sprite_id]
+        w, h = img.get_size()
+        scale = 1.0
+        if sx == sy:
+            scale = sx / SCALE_STEPS
+        else:
+            img = pygame.transform.smoothscale(
+                img, (max(1, round(w * sx / SCALE_STEPS)), max(1, round(h * sy / SCALE_STEPS))))
+        if angle or scale != 1.0:
+            img = pygame.transform.rotozoom(img, angle * 360 / self.angles, scale)
+        fw, fh = img.get_size()
+        return img, (w - fw) // 2, (h - fh) // 2
+
+    def clear(self):
+        self.frames.clear()
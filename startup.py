@@ -0,0 +1,65 @@
+# =========================================================
+# FILE: startup.py
+# MO TA:
+# Khoi tao lazy cac he thong con cua pygame (display, mixer,
+# font) + do thoi gian tung buoc khoi dong
+# Import module nay (hay game.py) KHONG khoi tao gi ca
+# =========================================================
+
+import time
+from contextlib import contextmanager
+
+import pygame
+
+# ten buoc -> thoi gian (giay), theo thu tu chay
+startup_times = {}
+_fonts = {}
+
+@contextmanager
+def timed(name):
+    """
+    Cong don thoi gian cua khoi lenh vao startup_times[name]
+    """
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        startup_times[name] = startup_times.get(name, 0.0) + time.perf_counter() - t0
+
+def init_display():
+    if not pygame.display.get_init():
+        with timed("display init"):
+            pygame.display.init()
+
+def init_mixer(frequency=0, buffer=0):
+    """
+    Tra ve False neu may khong co thiet bi am thanh
+    (0 = mac dinh cua pygame)
+    """
+    if pygame.mixer.get_init(): return True
+    with timed("mixer init"):
+        try:
+            pygame.mixer.init(frequency=frequency, buffer=buffer)
+        except pygame.error:
+            return False
+    return True
+
+def get_font(size):
+    """
+    SysFont(None, size) dung chung, chi tim font lan dau
+    """
+    font = _fonts.get(size)
+    if font is None:
+        with timed("fonts"):
+            if not pygame.font.get_init(): pygame.font.init()
+            font = pygame.font.SysFont(None, size)
+        _fonts[size] = font
+    return font
+
+def startup_report():
+    total = sum(startup_times.values())
+    lines = ["Startup timing:"]
+    for name, sec in startup_times.items():
+        lines.append(f"  {name:<16}{sec * 1000:8.1f} ms")
+    lines.append(f"  {'total':<16}{total * 1000:8.1f} ms")
+    return "\n".join(lines)
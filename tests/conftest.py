@@ -0,0 +1,13 @@
+# =========================================================
+# FILE: tests/conftest.py
+# MO TA:
+# Cau hinh chung cho pytest: pygame khong mo cua so / am thanh,
+# import duoc cac module o thu muc goc (python -m pytest -q)
+# =========================================================
+
+import os
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,76 @@
+# =========================================================
+# FILE: tests/test_dirty_rects.py
+# MO TA:
+# DirtyRectRenderer: gop rect chong nhau, chi update vung ban,
+# vung ban qua lon / doi nen / tat -> ve va update ca man hinh
+# =========================================================
+
+import pygame
+import pytest
+import dirty_rects
+from dirty_rects import DirtyRectRenderer, merge_rects
+
+@pytest.fixture
+def updates(monkeypatch):
+    """
+    Ghi lai cac lan pygame.display.update (khong can cua so that)
+    """
+    calls = []
+    monkeypatch.setattr(dirty_rects.pygame.display, "update",
+                        lambda rects=None: calls.append(rects))
+    return calls
+
+def test_merge_chains_overlaps():
+    # c cham ca a va b (a, b roi nhau) -> gop thanh 1
+    merged = merge_rects([(0, 0, 10, 10), (20, 0, 10, 10), (5, 5, 20, 2), (100, 100, 5, 5)])
+    assert sorted(map(tuple, merged)) == [(0, 0, 30, 10), (100, 100, 5, 5)]
+
+def test_merge_keeps_disjoint():
+    rects = [(0, 0, 5, 5), (10, 10, 5, 5)]
+    assert sorted(map(tuple, merge_rects(rects))) == rects
+
+def make_renderer(enabled=True):
+    return DirtyRectRenderer(pygame.Surface((100, 100)), enabled)
+
+def test_full_redraw_on_first_frame_and_new_background(updates):
+    r = make_renderer()
+    bg, bg2 = pygame.Surface((100, 100)), pygame.Surface((100, 100))
+    assert r.begin_frame(bg)
+    r.present()
+    assert updates == [None]
+    assert not r.begin_frame(bg)
+    r.present()
+    assert r.begin_frame(bg2)      # doi nen (doi mua) -> ve lai toan bo
+    r.present()
+    assert not r.begin_frame(bg2)
+    r.present()
+    r.invalidate()                  # doi man / menu -> frame sau ve lai toan bo
+    assert r.begin_frame(bg2)
+
+def test_disabled_always_full(updates):
+    r = make_renderer(enabled=False)
+    bg = pygame.Surface((100, 100))
+    for _ in range(3):
+        assert r.begin_frame(bg)
+        r.mark(pygame.Rect(0, 0, 5, 5))
+        r.present()
+    assert updates == [None, None, None]
+
+def test_small_change_updates_union_of_old_and_new(updates):
+    r = make_renderer()
+    bg = pygame.Surface((100, 100))
+    r.begin_frame(bg); r.mark(pygame.Rect(10, 10, 10, 10)); r.present()
+    assert not r.begin_frame(bg)
+    r.mark(pygame.Rect(15, 15, 10, 10))      # vat di chuyen: vung cu + moi
+    r.mark(pygame.Rect(90, 90, 20, 20))      # tran ra ngoai -> bi cat
+    r.present()
+    assert sorted(map(tuple, updates[-1])) == [(10, 10, 15, 15), (90, 90, 10, 10)]
+
+def test_large_change_falls_back_to_full_update(updates):
+    r = make_renderer()
+    bg = pygame.Surface((100, 100))
+    r.begin_frame(bg); r.present()
+    r.begin_frame(bg)
+    r.mark(pygame.Rect(0, 0, 100, 70))       # 70% > FULL_UPDATE_RATIO
+    r.present()
+    assert updates[-1] is None
@@ -0,0 +1,56 @@
+# =========================================================
+# FILE: tests/test_effects.py
+# MO TA:
+# EffectScheduler: het han theo dong ho mo phong, lam moi /
+# cong don, ban ghi cu trong heap khong lam het han som
+# =========================================================
+
+from effects import EffectScheduler
+
+def test_expires_in_end_order():
+    fx = EffectScheduler()
+    fx.start(("freeze", None), 0, 300)
+    fx.start(("shield", 0), 0, 100)
+    fx.start(("magnet", 1), 0, 200)
+    assert fx.expire(100) == []              # het han khi now > end
+    assert fx.expire(101) == [("shield", 0)]
+    assert fx.expire(1000) == [("magnet", 1), ("freeze", None)]
+    assert fx.heap == [] and fx.ends == {}
+
+def test_refresh_ignores_stale_heap_entry():
+    fx = EffectScheduler()
+    key = ("shield", 0)
+    fx.start(key, 0, 100)
+    assert fx.start(key, 80, 100) == 180     # lam moi
+    assert fx.expire(150) == []              # ban ghi het han 100 bi bo qua
+    assert fx.active(key) and fx.remaining(key, 150) == 30
+    assert fx.expire(181) == [key]
+    assert not fx.active(key) and fx.remaining(key, 181) == 0
+
+def test_stack_extends_remaining_time():
+    fx = EffectScheduler()
+    key = ("confused", 1)
+    fx.start(key, 0, 100)
+    assert fx.start(key, 50, 100, stack=True) == 200
+    assert fx.stacks[key] == 2
+    # cong don sau khi da het han (chua expire) -> tinh tu now
+    assert fx.start(key, 500, 100, stack=True) == 600
+    assert fx.expire(601) == [key]
+
+def test_cancel_and_clear():
+    fx = EffectScheduler()
+    fx.start(("magnet", 0), 0, 100)
+    assert fx.cancel(("magnet", 0))
+    assert not fx.cancel(("magnet", 0))
+    assert fx.expire(1000) == []
+    fx.start(("freeze", None), 0, 100)
+    fx.clear()
+    assert fx.expire(1000) == [] and not fx.active(("freeze", None))
+
+def test_many_effects_expire_once_each():
+    fx = EffectScheduler()
+    for i in range(200):
+        fx.start(("shield", i % 8), i, 50 + i % 7)
+    seen = []
+    for now in range(0, 400, 3): seen += fx.expire(now)
+    assert sorted(seen) == [("shield", s) for s in range(8)]
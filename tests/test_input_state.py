@@ -0,0 +1,52 @@
+# =========================================================
+# FILE: tests/test_input_state.py
+# MO TA:
+# InputState: canh nhan / nha moi tick, nhan nhanh giua 2 tick,
+# thoi diem doi trang thai va do tre theo tung nguoi choi
+# =========================================================
+
+import pygame
+from input_state import InputState, event_time
+from players import input_bits
+
+def key(kind, name, **extra):
+    return pygame.event.Event(kind, key=getattr(pygame, name), **extra)
+
+def test_tap_between_ticks_counts_once():
+    inp = InputState([("K_LEFT", "K_RIGHT")])
+    left, right = input_bits(0)
+    inp.pump([key(pygame.KEYDOWN, "K_RIGHT"), key(pygame.KEYUP, "K_RIGHT")])
+    assert inp.tick_inputs() == right
+    assert inp.edges == (right, right)
+    assert inp.tick_inputs() == 0
+    assert inp.edges == (0, 0)
+
+def test_edges_and_latency_per_slot():
+    inp = InputState([("K_LEFT", "K_RIGHT"), ("K_a", "K_d")])
+    p1_left, _ = input_bits(0)
+    p2_left, p2_right = input_bits(1)
+    inp.pump([key(pygame.KEYDOWN, "K_a"), key(pygame.KEYDOWN, "K_a")])    # lap phim
+    assert inp.tick_inputs() == p2_left
+    assert inp.edges == (p2_left, 0)
+    assert list(inp.changed_at) == [1]
+
+    inp.pump([key(pygame.KEYDOWN, "K_LEFT"), key(pygame.KEYUP, "K_a"),
+              key(pygame.KEYDOWN, "K_d")])
+    assert inp.tick_inputs() == p1_left | p2_right
+    assert inp.edges == (p1_left | p2_right, p2_left)
+    lags = inp.presented()
+    assert sorted(slot for slot, _ in lags) == [0, 1, 1]
+    assert all(ms >= 0 for _, ms in lags)
+    assert inp.presented() == []
+
+def test_settle_drops_pending_latency():
+    inp = InputState([("K_LEFT", "K_RIGHT")])
+    inp.pump([key(pygame.KEYDOWN, "K_LEFT")])
+    inp.settle()
+    inp.tick_inputs()
+    assert inp.presented() == []
+    assert inp.held == input_bits(0)[0]
+
+def test_event_time_uses_timestamp():
+    assert event_time(key(pygame.KEYDOWN, "K_a"), 10.0, 5000) == 10.0
+    assert event_time(key(pygame.KEYDOWN, "K_a", timestamp=4750), 10.0, 5000) == 9.75
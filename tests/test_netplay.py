@@ -0,0 +1,76 @@
+# =========================================================
+# FILE: tests/test_netplay.py
+# MO TA:
+# Snapshot mang: encode_state -> XOR + zlib voi moc -> giai ma
+# ra dung byte, apply_state dung lai duoc trang thai
+# Phong server: cho du nguoi moi bat dau, nguoi roi giua van
+# thi bot choi thay, van khong dung lai
+# =========================================================
+
+import random
+
+from game import Game
+from netplay import encode_state, apply_state, encode_delta, decode_delta, xor_bytes, Room, RemotePlayer
+
+def states(mode=2, seed=3, ticks=600, every=50):
+    game = Game(headless=True)
+    game.reset_game(mode, seed=seed)
+    rng = random.Random(seed)
+    out = []
+    for t in range(ticks):
+        game.step(rng.randrange(16))
+        if t % every == 0: out.append(encode_state(game))
+    return game, out
+
+def test_delta_round_trip_against_every_base():
+    _, snaps = states()
+    assert len({len(s) for s in snaps}) > 1     # so vat roi doi -> do dai doi
+    for state in snaps:
+        for base in [b""] + snaps:
+            assert decode_delta(encode_delta(state, base), base) == state
+
+def test_delta_against_close_base_is_small():
+    _, snaps = states(every=2)
+    full = sum(len(encode_delta(s, b"")) for s in snaps[1:])
+    delta = sum(len(encode_delta(s, b)) for b, s in zip(snaps, snaps[1:]))
+    assert delta < full
+
+def test_xor_pads_and_truncates_base():
+    assert xor_bytes(b"\x01\x02\x03", b"\x01") == b"\x00\x02\x03"
+    assert xor_bytes(b"\x01", b"\x01\xff\xff") == b"\x00"
+    assert xor_bytes(b"", b"abc") == b""
+
+def test_apply_state_round_trip():
+    game, _ = states(mode=4, seed=8)
+    state = encode_state(game)
+    client = Game(headless=True)
+    apply_state(client, state)
+    assert encode_state(client) == state
+    assert client.tick_count == game.tick_count
+    assert list(client.players.score[:4]) == list(game.players.score[:4])
+
+def full_room(players=2):
+    room = Room(1, players)
+    for slot in range(players):
+        room.clients[("127.0.0.1", 5000 + slot)] = RemotePlayer(slot, ("127.0.0.1", 5000 + slot), 0.0)
+    return room
+
+def test_room_waits_until_full():
+    room = full_room()
+    addr = next(iter(room.clients))
+    del room.clients[addr]
+    for _ in range(10): room.tick()
+    assert room.game.tick_count == 0
+    assert room.free_slot() == 0
+
+def test_room_keeps_ticking_after_drop():
+    room = full_room()
+    for _ in range(10): room.tick()
+    assert room.game.tick_count == 10
+    del room.clients[("127.0.0.1", 5000)]
+    x = room.game.players.x[0]
+    for _ in range(120): room.tick()
+    assert room.game.tick_count == 130 or room.game.game_over
+    assert room.free_slot() == 0
+    # slot 0 do bot dieu khien -> xo khong dung yen ca 2 giay
+    assert room.game.players.x[0] != x
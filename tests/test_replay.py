@@ -0,0 +1,48 @@
+# =========================================================
+# FILE: tests/test_replay.py
+# MO TA:
+# Ghi 1 van ra file .fcr, chay lai headless phai ra dung
+# diem, mang va level cuoi
+# =========================================================
+
+import random
+
+import pytest
+from game import Game
+from replay import Recorder, Replay, game_result, decode_runs, encode_runs
+
+def held_inputs(seed):
+    """
+    Input kieu nguoi choi: giu 1 huong vai chuc tick roi doi
+    """
+    rng = random.Random(seed)
+    while True:
+        bits = rng.randrange(16)
+        for _ in range(rng.randrange(5, 60)): yield bits
+
+@pytest.mark.parametrize("mode, seed", [(1, 11), (2, 5), (2, 9)])
+def test_replay_reproduces_result(tmp_path, mode, seed):
+    game = Game(headless=True)
+    game.reset_game(mode, seed=seed)
+    rec = Recorder(mode, seed)
+    inputs = held_inputs(seed)
+    while not game.game_over and game.tick_count < 5000:
+        bits = next(inputs)
+        rec.record(bits)
+        game.step(bits)
+    path = tmp_path / f"p{mode}.fcr"
+    rec.save(str(path), game)
+
+    replay = Replay.load(str(path))
+    assert replay.expected == game_result(game)
+    assert replay.verify() == []
+    assert game_result(replay.play()) == game_result(game)
+
+def test_run_length_round_trip():
+    inputs = [0] * 70000 + [3, 3, 12] + [0] * 5
+    assert list(decode_runs(encode_runs(inputs))) == inputs
+
+def test_load_rejects_bad_file(tmp_path):
+    path = tmp_path / "bad.fcr"
+    path.write_bytes(b"NOPE" + bytes(32))
+    with pytest.raises(ValueError): Replay.load(str(path))
@@ -0,0 +1,48 @@
+# =========================================================
+# FILE: tests/test_scores.py
+# MO TA:
+# ScoreStore: submit khong chan, luong ghi ghi het khi flush,
+# top / best doc dung sau khi ghi, close dung luong ghi
+# =========================================================
+
+from scores import ScoreStore
+
+def row(mode, slot, score, day="2026-01-01", bot=0):
+    return (0.0, day, mode, slot, bot, score, 3, 12.5, 42)
+
+def test_flush_writes_everything(tmp_path):
+    store = ScoreStore(str(tmp_path / "scores.db"))
+    try:
+        for batch in range(10):
+            store.submit([row(1, 0, batch * 100 + i) for i in range(25)])
+        store.flush()
+        assert store.written == 250 and store.errors == 0
+        assert store.best(1) == 924
+        assert [r[0] for r in store.top(1, 3)] == [924, 923, 922]
+    finally:
+        store.close()
+
+def test_filters_by_mode_day_and_bots(tmp_path):
+    store = ScoreStore(str(tmp_path / "scores.db"))
+    try:
+        store.submit([row(2, 0, 50), row(2, 1, 70, bot=1), row(2, 1, 60, day="2026-01-02"),
+                      row(1, 0, 999)])
+        store.flush()
+        assert [r[0] for r in store.top(2)] == [60, 50]
+        assert [r[0] for r in store.top(2, bots=True)] == [70, 60, 50]
+        assert store.top(2, day="2026-01-02") == [(60, 1, 3, "2026-01-02")]
+        assert store.best(4) == 0
+    finally:
+        store.close()
+
+def test_close_stops_writer_and_keeps_rows(tmp_path):
+    path = str(tmp_path / "scores.db")
+    store = ScoreStore(path)
+    store.submit([row(1, 0, s) for s in range(5)])
+    store.close()
+    assert not store.writer.is_alive()
+    again = ScoreStore(path)
+    try:
+        assert again.best(1) == 4
+    finally:
+        again.close()
@@ -0,0 +1,91 @@
+# =========================================================
+# FILE: tests/test_snapshot.py
+# MO TA:
+# save_state / load_state: nap snapshot roi choi tiep phai ra
+# dung trang thai nhu van khong bi ngat
+# SnapshotRing: push / find / truncate quanh cho quay vong
+# =========================================================
+
+import random
+
+import pytest
+from game import Game
+from snapshot import save_state, load_state, SnapshotRing
+
+def random_inputs(seed, n):
+    rng = random.Random(seed)
+    return [rng.randrange(1 << 16) for _ in range(n)]
+
+@pytest.mark.parametrize("mode, seed", [(1, 3), (2, 7), (4, 11), (8, 19)])
+def test_round_trip_then_continue(mode, seed):
+    inputs = random_inputs(seed, 2000)
+    cut = 300
+    a = Game(headless=True)
+    a.reset_game(mode, seed=seed)
+    snap = None
+    for t, x in enumerate(inputs):
+        if t == cut: snap = save_state(a)
+        if a.step(x): break
+    assert snap is not None
+
+    # Game khac dang choi do dang van khac -> load_state phai ghi de het
+    b = Game(headless=True)
+    b.reset_game(1, seed=seed + 1)
+    for _ in range(50): b.step(5)
+    load_state(b, snap)
+    assert save_state(b) == snap
+    for x in inputs[cut:]:
+        if b.step(x): break
+    assert save_state(b) == save_state(a)
+
+def filled_ring(ticks, size=30):
+    # 100 byte, 30 byte / snapshot -> cai thu 4 phai quay ve dau buffer
+    ring = SnapshotRing(10, 100)
+    for t in ticks: assert ring.push(t, bytes([t]) * size)
+    return ring
+
+def ticks_of(ring):
+    return [ring.get(i)[0] for i in range(len(ring))]
+
+def test_ring_push_wraps_over_oldest():
+    ring = filled_ring([1, 2, 3])
+    assert ring.head == 90
+    ring.push(4, bytes([4]) * 30)
+    assert ticks_of(ring) == [2, 3, 4]
+    assert ring.index[-1][1] == 0
+    for i in range(len(ring)):
+        tick, data = ring.get(i)
+        assert data == bytes([tick]) * 30
+
+def test_ring_drops_tail_entries_on_wrap():
+    # snapshot 40 byte khong vua doan 90..100 -> quay ve 0, de len 1 va 2
+    ring = filled_ring([1, 2, 3])
+    ring.push(4, bytes([4]) * 40)
+    assert ticks_of(ring) == [3, 4]
+    assert ring.get(-1) == (4, bytes([4]) * 40)
+
+def test_ring_find_across_wrap():
+    ring = filled_ring([1, 2, 3, 4, 5])
+    assert ticks_of(ring) == [3, 4, 5]
+    assert ring.find(5) == 2
+    assert ring.find(4) == 1
+    assert ring.find(100) == 2
+    assert ring.find(0) == 0     # cu hon ca snapshot cu nhat -> cu nhat
+
+def test_ring_truncate_at_wrap_boundary():
+    ring = filled_ring([1, 2, 3, 4])
+    ring.truncate(3)
+    assert ticks_of(ring) == [2, 3]
+    assert ring.head == 90      # ghi tiep sau snapshot 3, khong sau snapshot 4 da bo
+    ring.push(5, bytes([5]) * 30)
+    assert ticks_of(ring) == [2, 3, 5]
+    assert [ring.get(i)[1][0] for i in range(3)] == [2, 3, 5]
+    ring.truncate(0)
+    assert len(ring) == 0 and ring.head == 0
+
+def test_ring_max_snapshots_and_oversize():
+    ring = SnapshotRing(2, 1000)
+    for t in (1, 2, 3): ring.push(t, b"x")
+    assert ticks_of(ring) == [2, 3]
+    assert not ring.push(4, bytes(1001))
+    assert ticks_of(ring) == [2, 3]
@@ -0,0 +1,74 @@
+# =========================================================
+# FILE: tests/test_spawns.py
+# MO TA:
+# Bang alias (spawns.py) phai chon dung ti le trong SPAWN_ODDS
+# =========================================================
+
+import random
+from collections import Counter
+
+import pytest
+import settings
+from spawns import AliasTable, SpawnTable, SpawnEngine, season_odds
+
+def alias_odds(table):
+    """
+    Xac suat chinh xac cua tung chi so suy ra tu prob / alias
+    """
+    odds = [p / table.n for p in table.prob]
+    for p, a in zip(table.prob, table.alias):
+        if p < 1.0: odds[a] += (1.0 - p) / table.n
+    return odds
+
+def group(name):
+    # gop cac file trai cay thanh "fruit" nhu trong SPAWN_ODDS
+    return "fruit" if name in settings.FRUIT_FILES else name
+
+def grouped(names, odds):
+    out = Counter()
+    for name, p in zip(names, odds): out[group(name)] += p
+    return out
+
+def test_alias_table_exact_odds():
+    weights = [0.5, 3, 0, 1.25, 7, 0.01]
+    total = sum(weights)
+    for got, w in zip(alias_odds(AliasTable(weights)), weights):
+        assert got == pytest.approx(w / total, abs=1e-12)
+
+def test_alias_table_rejects_empty():
+    with pytest.raises(ValueError): AliasTable([])
+    with pytest.raises(ValueError): AliasTable([0, 0])
+
+def test_spawn_table_matches_spawn_odds():
+    table = SpawnTable(season_odds(settings.SPAWN_ODDS, {}))
+    expected = dict(season_odds(settings.SPAWN_ODDS, {}))
+    exact = grouped(table.names, alias_odds(table.alias))
+    for name, p in expected.items():
+        assert exact[name] == pytest.approx(p, abs=1e-9)
+
+    n = 200_000
+    picks = table.alias.sample_many(random.Random(1), n)
+    counts = Counter(group(table.names[i]) for i in picks)
+    for name, p in expected.items():
+        # sai so lay mau ~ 4 do lech chuan
+        assert counts[name] / n == pytest.approx(p, abs=4 * (p * (1 - p) / n) ** 0.5 + 1e-9)
+
+def test_sample_matches_sample_many():
+    table = AliasTable([1, 2, 3, 4])
+    a, b = random.Random(5), random.Random(5)
+    assert [table.sample(a) for _ in range(1000)] == list(table.sample_many(b, 1000))
+
+def test_season_overrides():
+    override = {"tnt": 0.05, "freeze": 0.0}
+    odds = dict(season_odds(settings.SPAWN_ODDS, override))
+    assert odds["tnt"] == 0.05 and odds["freeze"] == 0.0
+    assert sum(odds.values()) == pytest.approx(1.0)
+    with pytest.raises(ValueError): season_odds(settings.SPAWN_ODDS, {"bomb": 0.99})
+
+def test_engine_seasons_follow_settings():
+    engine = SpawnEngine()
+    for table, override in zip(engine.seasons, settings.SEASON_SPAWN_ODDS):
+        expected = dict(season_odds(settings.SPAWN_ODDS, override))
+        exact = grouped(table.names, alias_odds(table.alias))
+        for name, p in expected.items():
+            assert exact[name] == pytest.approx(p, abs=1e-9)
@@ -0,0 +1,83 @@
+# =========================================================
+# FILE: tests/test_split_mode.py
+# MO TA:
+# Seqlock giua StateWriter (process mo phong) va StateReader
+# (process ve), chay tren bytearray thay cho shared memory
+# =========================================================
+
+from game import Game
+from snapshot import save_state, HEAD
+from split_mode import (StateWriter, StateReader, SHM_SIZE, OFF_LATEST, I32, U64,
+                        BUF_HEAD, BUF_META, buffer_offset)
+from settings import SPLIT_STATE_BYTES
+
+def make_buffer():
+    buf = bytearray(SHM_SIZE)
+    I32.pack_into(buf, OFF_LATEST, -1)
+    return buf
+
+def played(seed, ticks, mode=2):
+    game = Game(headless=True)
+    game.reset_game(mode, seed=seed)
+    for t in range(ticks): game.step(t % 16)
+    return game
+
+def test_reader_loads_latest_published():
+    buf = make_buffer()
+    writer, reader = StateWriter(buf), StateReader(buf)
+    target = Game(headless=True)
+    assert not reader.load_latest(target, 7)     # chua co gi
+    for ticks in (10, 200):
+        src = played(7, ticks)
+        writer.publish(save_state(src))
+        assert reader.load_latest(target, 7)
+        assert save_state(target) == save_state(src)
+        assert not reader.load_latest(target, 7)  # khong nap lai cung seq
+
+def test_header_is_complete_once_seq_is_even():
+    buf = make_buffer()
+    writer = StateWriter(buf)
+    for ticks in (5, 300, 6):
+        data = save_state(played(3, ticks))
+        writer.publish(data)
+        seq, n, _ = BUF_HEAD.unpack_from(buf, buffer_offset(writer.latest))
+        assert seq % 2 == 0 and n == len(data)
+
+def test_reader_skips_buffer_being_written():
+    buf = make_buffer()
+    writer, reader = StateWriter(buf), StateReader(buf)
+    writer.publish(save_state(played(1, 20)))
+    off = buffer_offset(writer.latest)
+    U64.pack_into(buf, off, U64.unpack_from(buf, off)[0] + 1)    # seq le
+    target = Game(headless=True)
+    before = save_state(target)
+    assert not reader.load_latest(target, 1)
+    assert reader.retries > 0
+    assert save_state(target) == before
+
+def test_reader_ignores_other_seed():
+    buf = make_buffer()
+    StateWriter(buf).publish(save_state(played(1, 20)))
+    assert not StateReader(buf).load_latest(Game(headless=True), 2)
+
+def test_reader_rejects_bad_length_without_touching_game():
+    buf = make_buffer()
+    writer, reader = StateWriter(buf), StateReader(buf)
+    target = Game(headless=True)
+    before = save_state(target)
+    for n in (HEAD.size - 1, SPLIT_STATE_BYTES + 1, 0):
+        writer.publish(save_state(played(4, 30)))
+        off = buffer_offset(writer.latest)
+        BUF_META.pack_into(buf, off + 8, n, 0.0)
+        assert not reader.load_latest(target, 4)
+        assert save_state(target) == before
+    assert reader.rejected == 3
+
+def test_reader_survives_corrupt_snapshot():
+    buf = make_buffer()
+    writer, reader = StateWriter(buf), StateReader(buf)
+    data = bytearray(save_state(played(4, 30)))
+    data[0] ^= 0xFF     # sai phien ban snapshot
+    writer.publish(bytes(data))
+    assert not reader.load_latest(Game(headless=True), 4)
+    assert reader.rejected == 1
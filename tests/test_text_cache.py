@@ -0,0 +1,54 @@
+# =========================================================
+# FILE: tests/test_text_cache.py
+# MO TA:
+# TextCache: trung key tra ve cung surface, day thi bo key
+# dung lau nhat (LRU)
+# =========================================================
+
+from text_cache import TextCache
+
+class CountingFont:
+    """
+    Font gia: dem so lan render, tra ve object moi moi lan
+    """
+    def __init__(self):
+        self.calls = 0
+
+    def render(self, text, antialias, color):
+        self.calls += 1
+        return (text, antialias, tuple(color), self.calls)
+
+def test_hit_returns_same_surface():
+    cache, font = TextCache(4), CountingFont()
+    a = cache.render(font, "Score: 1", (255, 255, 255))
+    b = cache.render(font, "Score: 1", [255, 255, 255])    # list mau = cung key
+    assert a is b
+    assert font.calls == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test_key_includes_font_color_and_antialias():
+    cache, font, other = TextCache(8), CountingFont(), CountingFont()
+    cache.render(font, "x", (0, 0, 0))
+    cache.render(font, "x", (0, 0, 1))
+    cache.render(font, "x", (0, 0, 0), antialias=False)
+    cache.render(other, "x", (0, 0, 0))
+    assert len(cache) == 4 and cache.misses == 4
+
+def test_evicts_least_recently_used():
+    cache, font = TextCache(3), CountingFont()
+    for text in "abc": cache.render(font, text, (0, 0, 0))
+    cache.render(font, "a", (0, 0, 0))      # a moi dung -> b cu nhat
+    cache.render(font, "d", (0, 0, 0))
+    assert len(cache) == 3
+    calls = font.calls
+    cache.render(font, "a", (0, 0, 0))
+    cache.render(font, "c", (0, 0, 0))
+    assert font.calls == calls              # a, c con trong cache
+    cache.render(font, "b", (0, 0, 0))
+    assert font.calls == calls + 1          # b da bi bo
+
+def test_clear_resets_counters():
+    cache, font = TextCache(), CountingFont()
+    cache.render(font, "a", (0, 0, 0)); cache.render(font, "a", (0, 0, 0))
+    cache.clear()
+    assert len(cache) == 0 and cache.hits == cache.misses == 0
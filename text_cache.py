@@ -0,0 +1,53 @@
+# =========================================================
+# FILE: text_cache.py
+# MO TA:
+# Cache LRU cho surface chu da render (HUD, menu, FloatingText)
+# Chu giong nhau chi font.render 1 lan
+# =========================================================
+
+from collections import OrderedDict
+
+TEXT_CACHE_SIZE = 256
+
+# =========================================================
+# CLASS TEXT CACHE
+# =========================================================
+class TextCache:
+    """
+    Key = (font, text, color, antialias), gioi han max_size phan tu
+    Surface tra ve dung chung -> KHONG duoc ve de len no
+    """
+    def __init__(self, max_size=TEXT_CACHE_SIZE):
+        self.max_size = max_size
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.surfaces)
+
+    def render(self, font, text, color, antialias=True):
+        key = (font, text, tuple(color), antialias)
+        surf = self.surfaces.get(key)
+        if surf is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surf
+
+        self.misses += 1
+        surf = font.render(text, antialias, color)
+        self.surfaces[key] = surf
+        if len(self.surfaces) > self.max_size:
+            self.surfaces.popitem(last=False)
+        return surf
+
+    def clear(self):
+        self.surfaces.clear()
+        self.hits = 0
+        self.misses = 0
+
+# Cache dung chung cho toan game
+text_cache = TextCache()
+
+def render_text(font, text, color, antialias=True):
+    return text_cache.render(font, text, color, antialias)